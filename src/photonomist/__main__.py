@@ -4,9 +4,30 @@
         python -m photonomist
     |
 """
-import os, shutil, subprocess
-import collections
+import os, shutil, subprocess, time
+import collections, contextlib, itertools
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from photo import Photo
+from metadata_cache import MetadataCache, default_cache_path, CACHE_FILE_NAME
+from export_index import ExportIndex
+from transfer_plan import TransferPlan
+from unplaced_report import UnplacedReport, default_report_path, NO_EXIF, UNREADABLE, DUPLICATE, MISSING
+from traversal import iter_photos, stream_photos, TraversalCache
+from name_registry import NameRegistry
+from file_transfer import device, Transfer, RENAME, COPY
+from transfer_report import TransferReport, default_transfer_report_path
+from transfer_scheduler import TransferScheduler
+from dedup import DuplicateFinder, DUPLICATE_ACTIONS, SKIP, LINK
+from library_index import LibraryIndex, default_library_index_path, LIBRARY_INDEX_FILE_NAME
+from journal import TransferJournal, default_journal_path, JOURNAL_FILE_NAME
+from manifest import MoveManifest, new_manifest_path
+from snapshot import TreeSnapshot, default_snapshot_path, SNAPSHOT_FILE_NAME
+from watcher import FolderWatcher
+from run_metrics import RunMetrics
+from progress import ProgressTracker
+from job_runner import JobControl
+from core.logger import logger
 
 
 def path_string(path:str)->str:
@@ -60,12 +81,15 @@ def path_items(path:str):
     if not os.listdir(path):
         raise Exception("The provided path does not contain any files!")#TODO Log it
 
-def traverse_photos_path(photos_path:str)->list:
+def traverse_photos_path(photos_path:str, snapshot:TreeSnapshot=None)->list:
     """Recursively traverses all the directories under the provided path.
     Identified .jpg, .jpeg .nef and .cr2 files are appended to the photos_roots dictionary.
+    The photos are PhotoEntry paths which carry the stat data of the traversal, so they don't need to be stat'ed again.
    
     :param photos_path: path to photos
     :type photos_path: str
+    :param snapshot: the directories of the last run, only the changed directories are listed (see traversal.iter_photos)
+    :type snapshot: TreeSnapshot
 
     :return: A dictionary with key a path with photos and value a list of .jpg, .jpeg, .nef or .cr2 photos
     :rtype: dict
@@ -73,11 +97,8 @@ def traverse_photos_path(photos_path:str)->list:
     """
     photos_roots = collections.defaultdict(list)
 
-    # traverse root directory, and list directories as dirs and files as files. List comp was less readable
-    for root, _ , files in os.walk(photos_path):
-        for _file in files:
-            if _file.lower().endswith('jpg') or _file.lower().endswith('nef') or _file.lower().endswith('jpeg') or _file.lower().endswith('cr2'):
-                photos_roots[root].append(root + '\\' + _file)
+    for photo in iter_photos(photos_path, snapshot):
+        photos_roots[os.path.dirname(photo)].append(photo)
     
     return photos_roots
 
@@ -96,6 +117,7 @@ def path_photos(photos_roots:dict):
 
 def photos_size(photos_roots:dict)->int:
     """Calculates the size (in bytes) of all photos found in the provided path.
+    The sizes which were recorded by the traversal are used, so only plain paths are stat'ed.
 
     :param photos_roots: a dict with all the paths that contain photos
     :type photos_roots: dict
@@ -104,16 +126,17 @@ def photos_size(photos_roots:dict)->int:
     :rtype: int
     |
     """
-    # It is an extra loop. I could have generated the total size in traverse_photo_path function
-    # With the extra function is more readdable and testable
     total_size = 0
     for photo_list in photos_roots.values():
          for photo in photo_list:
-             total_size += os.stat(photo).st_size
+             stat = getattr(photo, "stat", None) or os.stat(photo)
+             total_size += stat.st_size
     return total_size
 
 def paths_same_disk(photos_path:str, export_path:str)->bool:
-    """Checks if the provided input path and the export path are "located" on the same disk.
+    """Checks if the provided input path and the export path are "located" on the same disk (file system).
+    The file systems are compared by their device id (st_dev). If one of the paths can't be stat'ed,
+    their drive letters are compared.
 
     :param photos_path: path to photos
     :type photos_path: str
@@ -121,7 +144,10 @@ def paths_same_disk(photos_path:str, export_path:str)->bool:
     :type export_path: str
     |
     """
-    return True if photos_path[0].lower() == export_path[0].lower() else False
+    try:
+        return device(photos_path) == device(export_path)
+    except OSError:
+        return True if photos_path[0].lower() == export_path[0].lower() else False
 
 def disk_space(export_path:str, photos_total_size:int):
     """Obtains the total, used and free space of the exported path disk.
@@ -192,45 +218,81 @@ def split_date(date:str, month:bool):
 
 
 
-def dir_name_exists(dir_name:str, export_path:str)->bool:
-    """Checks if a folder's name already contains the date of a photo
+def dir_name_exists(dir_name:str, export_path:str, export_index:ExportIndex=None)->bool:
+    """Checks if a folder's name already contains the date of a photo.
+    If an export index is provided, it is consulted instead of walking the export path.
 
     :param dir_name: the folder's name to check if exists
     :type dir_name: str
     :param export_path: path to the directory where the photo folder will be created
     :type export_path: str
+    :param export_index: index of the folders of the export path
+    :type export_index: ExportIndex
     |
     """
+    if export_index is not None:
+        return dir_name in export_index
     for folder_name in os.walk(export_path):
         if os.path.join(export_path, dir_name) == folder_name[0]: 
             return True
     return False
 
-def create_photo_dir(dir_name:str, export_path:str):
+def create_photo_dir(dir_name:str, export_path:str, export_index:ExportIndex=None):
     """Creates a folder with the specified name
 
     :param dir_name: name of the folder to be created
     :type dir_name: str
     :param export_path: path to the directory where the photo folder will be created
     :type export_path: str
+    :param export_index: index of the folders of the export path, which is updated with the new folder
+    :type export_index: ExportIndex
     |
     """
     os.makedirs(os.path.join(export_path, dir_name))
+    if export_index is not None:
+        export_index.add(dir_name)
 
-def write_not_transferred_photos(photo_path:str, export_path:str):
-    """Writes the paths of the photos that was not possible to be transferred. 
+def photo_dir(date:str, export_path:str, year:bool=False, month:bool=False, name_pattern:str="_place_reason_people", export_index:ExportIndex=None, plan:TransferPlan=None)->str:
+    """Returns the name of the folder where a photo of the specified date will be moved.
+    If it doesn't exist, the folder is created (or, if a plan is provided, it is only registered in the plan
+    and in the export index). With an export index, a folder of the same date 
+    that was created with another name pattern is reused.
 
-    :param photo_path: path to photo
-    :type photo_path: str
+    :param date: the date of the photo
+    :type date: str
     :param export_path: path to the directory where the photo folder will be created
     :type export_path: str
+    :param year: indicates if the photos will be grouped by year
+    :type year: boolean
+    :param month: indicates if the photos will be grouped by month
+    :type month: boolean
+    :param name_pattern: A string name pattern after which the photo folders will be named 
+    :type name_pattern: str
+    :param export_index: index of the folders of the export path
+    :type export_index: ExportIndex
+    :param plan: a transfer plan in which the new folders are registered instead of being created
+    :type plan: TransferPlan
+
+    :return: the name of the (existing or planned) photo folder
+    :rtype: str
     |
     """
-    with open(os.path.join(export_path, "not_transferred.txt"), "a") as myfile:
-        myfile.write(photo_path + "\n")
-
-def transfer_photo(photo_path:str, export_path:str, year:bool=False, month:bool=False, name_pattern:str="_place_reason_people"):
+    photo_folder_name = photo_dir_name(date, year=year, month=month, name_pattern=name_pattern)
+    if export_index is not None:
+        photo_folder_name = export_index.folder_for(photo_folder_name) or photo_folder_name
+    if not dir_name_exists(photo_folder_name, export_path, export_index):
+        # I dont simply use a set because the photo_dir might exist from the past
+        if plan is None:
+            create_photo_dir(photo_folder_name, export_path, export_index)
+        else:
+            plan.add_folder(photo_folder_name)
+            if export_index is not None:
+                export_index.add(photo_folder_name)
+    return photo_folder_name
+
+def transfer_photo(photo_path:str, export_path:str, year:bool=False, month:bool=False, name_pattern:str="_place_reason_people", cache:MetadataCache=None, export_index:ExportIndex=None, report:UnplacedReport=None, registry:NameRegistry=None, scheduler:TransferScheduler=None):
     """Moves a photo to a "date" folder, if a date was extracted.
+    If a transfer scheduler is provided, the move is queued in the scheduler and its future is returned.
 
     :param photo_path: path to photo
     :type photo_path: str
@@ -242,21 +304,39 @@ def transfer_photo(photo_path:str, export_path:str, year:bool=False, month:bool=
     :type month: boolean
     :param name_pattern: A string name pattern after which the photo folders will be named 
     :type name_pattern: str
+    :param cache: persistent metadata cache which is consulted before opening the photo
+    :type cache: MetadataCache
+    :param export_index: index of the folders of the export path
+    :type export_index: ExportIndex
+    :param report: report of the photos that were not transferred (a one-off report under the export path by default)
+    :type report: UnplacedReport
+    :param registry: the taken names of the photo folders, so that collisions are resolved without probing the disk
+    :type registry: NameRegistry
+    :param scheduler: a transfer scheduler for concurrent moves (a registry is needed too, so that the names don't collide)
+    :type scheduler: TransferScheduler
+
+    :return: the future of the queued move (if a scheduler is provided) or else the transfer (None if the photo wasn't moved)
+    :rtype: concurrent.futures.Future
     |
     """
-    photo = Photo(photo_path)
+    photo = Photo(photo_path, cache=cache)
     date = photo.get_date(year=year, month=month)
     
     if date:
-        photo_folder_name = photo_dir_name(date, year=year, month=month, name_pattern=name_pattern)
-        if not dir_name_exists(photo_folder_name, export_path):
-            # I dont simply use a set because the photo_dir might exist from the past
-            create_photo_dir(photo_folder_name, export_path)
-        photo.move_to_folder(os.path.join(export_path, photo_folder_name))
+        photo_folder_name = photo_dir(date, export_path, year=year, month=month, name_pattern=name_pattern, export_index=export_index)
+        photo_folder_path = os.path.join(export_path, photo_folder_name)
+        if scheduler is not None:
+            # The name is reserved now, so that the queued moves don't collide
+            file_name = os.path.basename(photo.check_same_name(os.path.join(photo_folder_path, str(photo)), registry))
+            return submit_move(scheduler, photo_path, photo_folder_path, file_name, registry=registry)
+        return photo.move_to_folder(photo_folder_path, registry=registry)
+    elif report is not None:
+        report.add(photo_path, photo.read_error or NO_EXIF)
     else:
-        write_not_transferred_photos(photo_path, export_path)
+        with UnplacedReport(default_report_path(export_path)) as report:
+            report.add(photo_path, photo.read_error or NO_EXIF)
 
-def input_path_validation(photos_path:str)->list:
+def input_path_validation(photos_path:str, metrics:RunMetrics=None, traversal_cache:TraversalCache=None)->list:
     """Validates if the provided input path:
     | 1) exists 
     | 2) contains files 
@@ -264,20 +344,33 @@ def input_path_validation(photos_path:str)->list:
 
     :param photos_path: path to photos
     :type photos_path: str
+    :param metrics: the instrumentation of the run (stages: input_path, traversal)
+    :type metrics: RunMetrics
+    :param traversal_cache: the traversals of the session, only the directories which changed since the last traversal are listed
+    :type traversal_cache: TraversalCache
 
     :return: A dictionary with key a path with photos and value a list of .jpg, .jpeg, .nef or .cr2 photos
     :rtype: dict
     |
     """
-    path_exists(photos_path)
-    path_items(photos_path)
+    if metrics is None:
+        metrics = RunMetrics()
+    with metrics.stage("input_path"):
+        path_exists(photos_path)
+        path_items(photos_path)
 
     # Extract photos' paths
-    photos_roots = traverse_photos_path(photos_path)
+    with metrics.stage("traversal"):
+        if traversal_cache is not None:
+            photos_roots = traversal_cache.photos_roots(photos_path)
+        else:
+            photos_roots = traverse_photos_path(photos_path)
+    metrics.count("traversed_photos", sum(len(photo_list) for photo_list in photos_roots.values()))
+    metrics.count("traversed_directories", len(photos_roots))
     path_photos(photos_roots)
     return photos_roots
 
-def export_path_validation(export_path:str, photos_path:str, photos_roots:dict):
+def export_path_validation(export_path:str, photos_path:str, photos_roots:dict, metrics:RunMetrics=None):
     """Validates if the export path:
     | 1) exists 
     | 2) there is enough disk space
@@ -288,21 +381,494 @@ def export_path_validation(export_path:str, photos_path:str, photos_roots:dict):
     :type photos_path: str
     :param photos_roots: a dict with all the paths that contain photos
     :type photos_roots: dict
+    :param metrics: the instrumentation of the run (stages: export_path, disk_space)
+    :type metrics: RunMetrics
     |
     """
-    path_exists(export_path)
+    if metrics is None:
+        metrics = RunMetrics()
+    with metrics.stage("export_path"):
+        path_exists(export_path)
 
     # Disk space validation
     if not paths_same_disk(photos_path, export_path):
-        photos_total_size = photos_size(photos_roots)
-        disk_space(export_path, photos_total_size)
+        with metrics.stage("disk_space"):
+            photos_total_size = photos_size(photos_roots)
+            disk_space(export_path, photos_total_size)
+        metrics.count("photo_bytes", photos_total_size)
+        # The photos of the traversal carry their stat data
+        metrics.count("avoided_stat", sum(1 for photo_list in photos_roots.values() for photo in photo_list if getattr(photo, "stat", None) is not None))
+
+def already_organized(photo_path:str, cache:MetadataCache, year:bool=False, month:bool=False, name_pattern:str="_place_reason_people", export_index:ExportIndex=None)->bool:
+    """Checks if a photo already sits in the folder of its date, without opening it:
+    its date is taken from the metadata cache and its folder's name is compared with photo_dir_name
+    (or, with an export index, with the existing folder of the same date).
+
+    :param photo_path: path to photo
+    :type photo_path: str
+    :param cache: persistent metadata cache
+    :type cache: MetadataCache
+    :param year: indicates if the photos will be grouped by year
+    :type year: boolean
+    :param month: indicates if the photos will be grouped by month
+    :type month: boolean
+    :param name_pattern: A string name pattern after which the photo folders will be named 
+    :type name_pattern: str
+    :param export_index: index of the folders of the export path
+    :type export_index: ExportIndex
+
+    :return: False if the photo isn't cached (it has to be opened) or if it's in another folder
+    :rtype: bool
+    |
+    """
+    metadata = cache.get(photo_path)
+    if metadata is None:
+        return False
+    date = Photo(photo_path, metadata=metadata).get_date(year=year, month=month)
+    if not date:
+        return False
+    photo_folder_name = photo_dir_name(date, year=year, month=month, name_pattern=name_pattern)
+    folder_name = os.path.basename(os.path.dirname(os.path.abspath(photo_path)))
+    return folder_name == photo_folder_name or (export_index is not None and folder_name == export_index.folder_for(photo_folder_name))
+
+def photo_metadata(photo_path:str)->tuple:
+    """Extracts the metadata of a photo. It is executed by the worker processes of tidy_photos, 
+    so it only returns the projected (picklable) part of photo's metadata.
+
+    :param photo_path: path to photo
+    :type photo_path: str
+
+    :return: the projected metadata of the photo and the reason code of a failed read (or None)
+    :rtype: tuple
+    |
+    """
+    photo = Photo(photo_path)
+    return photo.projection(), photo.read_error
+
+def extract_photos(photo_paths:list, jobs:int=1, cache:MetadataCache=None, pool:ProcessPoolExecutor=None, metrics:RunMetrics=None)->list:
+    """Creates a Photo object for each one of the provided paths. If jobs is greater than one,
+    the EXIF extraction is spread over a pool of processes.
+    If a cache is provided, only the photos which are not cached are sent to the workers.
+
+    :param photo_paths: paths to photos
+    :type photo_paths: list
+    :param jobs: number of worker processes
+    :type jobs: int
+    :param cache: persistent metadata cache
+    :type cache: MetadataCache
+    :param pool: an already started process pool (a new one is started if jobs > 1 and no pool is provided)
+    :type pool: ProcessPoolExecutor
+    :param metrics: the instrumentation of the run. The latency of each photo (exif) is only observed when it's extracted by this process.
+    :type metrics: RunMetrics
+
+    :return: Photo objects in the same order as the provided paths
+    :rtype: list
+    |
+    """
+    if jobs <= 1 or len(photo_paths) < 2:
+        if metrics is None:
+            return [Photo(photo_path, cache=cache) for photo_path in photo_paths]
+        photos = []
+        for photo_path in photo_paths:
+            start = time.perf_counter()
+            photos.append(Photo(photo_path, cache=cache))
+            metrics.observe("exif", time.perf_counter() - start)
+        return photos
+
+    # The cache is only accessed by this process
+    extracted = {}
+    if cache is not None:
+        for photo_path in photo_paths:
+            projection = cache.get(photo_path)
+            if projection is not None:
+                extracted[photo_path] = projection, None
+    misses = [photo_path for photo_path in photo_paths if photo_path not in extracted]
+
+    if misses:
+        # Big chunks keep the inter-process traffic low, small ones keep the workers busy till the end
+        chunksize = max(1, min(256, len(misses) // (jobs * 4)))
+        with contextlib.ExitStack() as stack:
+            if pool is None:
+                pool = stack.enter_context(ProcessPoolExecutor(max_workers=jobs))
+            for photo_path, (projection, read_error) in zip(misses, pool.map(photo_metadata, misses, chunksize=chunksize)):
+                extracted[photo_path] = projection, read_error
+                # Failed reads are not cached, so that they are retried in the next run
+                if cache is not None and read_error is None:
+                    cache.put(photo_path, projection)
+
+    return [Photo(photo_path, metadata=extracted[photo_path][0], read_error=extracted[photo_path][1]) for photo_path in photo_paths]
+
+def plan_photos(photos:list, export_path:str, year:bool=False, month:bool=False, name_pattern:str="_place_reason_people", export_index:ExportIndex=None, plan:TransferPlan=None, metrics:RunMetrics=None)->TransferPlan:
+    """Decides the "date" folder and the final file name of each photo, without touching the disk.
+    Photos without a date are registered as unplaced.
+    It runs serially, in the order of the photos, so that the result is the same as photo by photo transfer.
+
+    :param photos: Photo objects
+    :type photos: list
+    :param export_path: path to the directory where the photo folders will be created
+    :type export_path: str
+    :param year: indicates if the photos will be grouped by year
+    :type year: boolean
+    :param month: indicates if the photos will be grouped by month
+    :type month: boolean
+    :param name_pattern: A string name pattern after which the photo folders will be named 
+    :type name_pattern: str
+    :param export_index: index of the folders of the export path (it is built here if not provided)
+    :type export_index: ExportIndex
+    :param plan: a plan to extend (e.g. with the next batch of photos). A new one is created if not provided.
+    :type plan: TransferPlan
+    :param metrics: the instrumentation of the run (latency: planning, the folder lookup and the naming of each photo)
+    :type metrics: RunMetrics
+
+    :return: the transfer plan
+    :rtype: TransferPlan
+    |
+    """
+    if export_index is None:
+        export_index = ExportIndex(export_path)
+    if plan is None:
+        plan = TransferPlan(export_path)
+    for photo in photos:
+        start = time.perf_counter()
+        date = photo.get_date(year=year, month=month)
+        if date:
+            photo_folder_name = photo_dir(date, export_path, year=year, month=month, name_pattern=name_pattern, export_index=export_index, plan=plan)
+            move = plan.add_move(photo.path, photo_folder_name)
+            if metrics is not None and move is not None:
+                # The folder is looked up in the export index and the name in the name registry, instead of the file system
+                metrics.count("avoided_walk")
+                metrics.count("avoided_exists")
+                if move.file_name != os.path.basename(photo.path):
+                    metrics.count("name_collisions")
+        else:
+            plan.add_unplaced(photo.path, photo.read_error or NO_EXIF)
+        if metrics is not None:
+            metrics.observe("planning", time.perf_counter() - start)
+    return plan
+
+def move_photos(plan:TransferPlan, moves:list, progress:ProgressTracker=None, control:JobControl=None)->list:
+    """Applies the planned moves of a destination folder, one after the other.
+    The moves are sorted by their source path, so that each source directory is read in one go.
+    The file system of the destination folder is looked up once, for all the moves.
+
+    :param plan: the transfer plan
+    :type plan: TransferPlan
+    :param moves: planned moves which share the same destination folder
+    :type moves: list
+    :param progress: the progress of the run, which counts each move as it is done
+    :type progress: ProgressTracker
+    :param control: the pause and cancel requests of the run, which are checked before each move
+    :type control: JobControl
+
+    :return: (source, destination, transfer) of each move (the moves which were cancelled are left out)
+    :rtype: list
+    |
+    """
+    transfers = []
+    if not moves:
+        return transfers
+    folder_path = os.path.join(plan.export_path, moves[0].folder)
+    folder_device = device(folder_path)
+    for move in sorted(moves):
+        moved = move_photo(move.source, folder_path, move.file_name, same_device=device(move.source) == folder_device, control=control, registry=plan.names)
+        if moved is None:
+            break
+        transfers.append(moved)
+        if progress is not None:
+            progress.add_transfer(move.source, transfers[-1][2])
+    return transfers
+
+def move_photo(source:str, folder_path:str, file_name:str, same_device:bool=None, control:JobControl=None, registry:NameRegistry=None)->tuple:
+    """Moves a photo to its planned destination. It is the unit of work of the transfer scheduler.
+
+    :param source: path to photo
+    :type source: str
+    :param folder_path: path to the destination folder
+    :type folder_path: str
+    :param file_name: the (planned) name of the photo in the destination folder
+    :type file_name: str
+    :param same_device: whether the photo and the destination folder are on the same file system (detected by st_dev if None)
+    :type same_device: bool
+    :param control: the pause and cancel requests of the run (it waits while the run is paused)
+    :type control: JobControl
+    :param registry: the registry in which file_name was reserved, from which the next free name is reserved
+        if file_name was taken after it was planned
+    :type registry: NameRegistry
+
+    :return: (source, destination, transfer) of the move or None if the run was cancelled before the move
+    :rtype: tuple
+    |
+    """
+    if control is not None and not control.proceed():
+        return None
+    # The metadata are not needed for moving
+    photo = Photo(source, metadata={})
+    transfer = photo.move_to_folder(folder_path, file_name, registry=registry, same_device=same_device)
+    return source, photo.path, transfer
+
+def submit_move(scheduler:TransferScheduler, source:str, folder_path:str, file_name:str, folder_device:int=None, control:JobControl=None, registry:NameRegistry=None):
+    """Queues the move of a photo in a transfer scheduler. Renames are only limited by the number of workers,
+    copies also by the bytes in flight and the busy devices.
+
+    :param scheduler: the transfer scheduler
+    :type scheduler: TransferScheduler
+    :param source: path to photo
+    :type source: str
+    :param folder_path: path to the destination folder
+    :type folder_path: str
+    :param file_name: the (planned) name of the photo in the destination folder
+    :type file_name: str
+    :param folder_device: id of the destination folder's device (it is looked up if None)
+    :type folder_device: int
+    :param control: the pause and cancel requests of the run, which are checked when the move starts
+    :type control: JobControl
+    :param registry: the registry in which file_name was reserved (see move_photo)
+    :type registry: NameRegistry
+
+    :return: the future (source, destination, transfer) of the move
+    :rtype: concurrent.futures.Future
+    |
+    """
+    if folder_device is None:
+        folder_device = device(folder_path)
+    source_device = device(source)
+    same_device = source_device == folder_device
+    size = 0 if same_device else (getattr(source, "stat", None) or os.stat(source)).st_size
+    return scheduler.submit(move_photo, source, folder_path, file_name, same_device, control, registry,
+                            size=size, source_device=source_device, destination_device=folder_device)
+
+def schedule_plan(plan:TransferPlan, scheduler:TransferScheduler, progress:ProgressTracker=None, control:JobControl=None)->list:
+    """Applies the planned moves through a transfer scheduler.
+
+    :param plan: the transfer plan
+    :type plan: TransferPlan
+    :param scheduler: the transfer scheduler
+    :type scheduler: TransferScheduler
+    :param progress: the progress of the run, which counts each move as its result is collected
+    :type progress: ProgressTracker
+    :param control: the pause and cancel requests of the run, which are checked when each move starts
+    :type control: JobControl
+
+    :return: (source, destination, transfer) of each move, in the order of the plan (the moves which were cancelled are left out)
+    :rtype: list
+    |
+    """
+    folder_devices = {}
+    futures = []
+    for move in plan.moves:
+        folder_path = os.path.join(plan.export_path, move.folder)
+        if folder_path not in folder_devices:
+            folder_devices[folder_path] = device(folder_path)
+        futures.append(submit_move(scheduler, move.source, folder_path, move.file_name, folder_devices[folder_path], control, plan.names))
+    # result() re-raises the exception of a failed move (if any)
+    transfers = []
+    for future in futures:
+        moved = future.result()
+        if moved is None:
+            continue
+        transfers.append(moved)
+        if progress is not None:
+            progress.add_transfer(transfers[-1][0], transfers[-1][2])
+    return transfers
+
+def execute_plan(plan:TransferPlan, jobs:int=1, report_path:str=None, report:UnplacedReport=None, pool:ThreadPoolExecutor=None, transfer_report:TransferReport=None, scheduler:TransferScheduler=None, library:LibraryIndex=None, journal:TransferJournal=None, manifest:MoveManifest=None, metrics:RunMetrics=None, progress:ProgressTracker=None, control:JobControl=None):
+    """Applies a transfer plan.
+    | 1) All the new folders are created in one batch
+    | 2) The unplaced photos are written in the (buffered) unplaced report
+    | 3) The moves are applied through the transfer scheduler, if one is provided, or else grouped by destination folder (over a bounded thread pool if jobs > 1)
+    | 4) The strategy of each move (rename or copy) and the speed of each copy are written in the transfer report
+    | 5) The duplicates are linked to their originals (if their action is link), only counted (skip) or written in the unplaced report (report)
+    | 6) The placed photos are added to the library index and to the manifest of the run (if they are provided)
+
+    If a journal is provided, the moves and links are written in it before they start. When they are done,
+    the reports are flushed and the placed and reported photos are written in the journal.
+
+    :param plan: the transfer plan
+    :type plan: TransferPlan
+    :param jobs: number of parallel workers
+    :type jobs: int
+    :param report_path: path to the .csv or .jsonl report of the unplaced photos (not_transferred.csv under the export path by default)
+    :type report_path: str
+    :param report: an already open report of the unplaced photos (report_path is ignored)
+    :type report: UnplacedReport
+    :param pool: an already started thread pool for the moves
+    :type pool: ThreadPoolExecutor
+    :param transfer_report: an already open report of the moved photos (transferred.csv under the export path by default)
+    :type transfer_report: TransferReport
+    :param scheduler: a transfer scheduler with per device limits for the copies
+    :type scheduler: TransferScheduler
+    :param library: the content index of the photos under the export path
+    :type library: LibraryIndex
+    :param journal: the write-ahead journal of the run
+    :type journal: TransferJournal
+    :param manifest: the manifest of the run, from which it can be undone
+    :type manifest: MoveManifest
+    :param metrics: the instrumentation of the run (latency: rename, copy, the duration of each move)
+    :type metrics: RunMetrics
+    :param progress: the progress of the run: the moves, the duplicates and the unplaced photos (as failures) are counted
+    :type progress: ProgressTracker
+    :param control: the pause and cancel requests of the run, which are checked before each move. The moves which are done
+        when the run is cancelled are recorded like the others, the rest of the photos (and the duplicates) are left in place.
+    :type control: JobControl
+    |
+    """
+    for folder in plan.folders:
+        os.makedirs(os.path.join(plan.export_path, folder), exist_ok=True)
+    if journal is not None:
+        journal.plan(plan)
+
+    # The reports are flushed even if the moves are interrupted
+    with contextlib.ExitStack() as stack:
+        if report is None:
+            report = stack.enter_context(UnplacedReport(report_path or default_report_path(plan.export_path)))
+        if transfer_report is None:
+            transfer_report = stack.enter_context(TransferReport(default_transfer_report_path(plan.export_path)))
+        for unplaced in plan.unplaced:
+            report.add(unplaced.source, unplaced.reason)
+            if progress is not None:
+                progress.fail(unplaced.source, unplaced.reason)
+        transfers = schedule_plan(plan, scheduler, progress, control) if scheduler is not None else move_plan(plan, jobs=jobs, pool=pool, progress=progress, control=control)
+        for source, destination, transfer in transfers:
+            transfer_report.add(source, destination, transfer)
+            plan.counts[transfer.strategy] += 1
+            plan.counts["copied_bytes"] += transfer.size
+            plan.counts["copy_seconds"] += transfer.seconds if transfer.strategy == COPY else 0
+            if metrics is not None:
+                metrics.observe(transfer.strategy, transfer.seconds)
+            if library is not None:
+                library.add(destination)
+            if manifest is not None:
+                manifest.add(source, destination)
+        duplicates = plan.duplicates
+        if control is not None and control.cancelled:
+            duplicates = []
+            if len(plan.moves) > len(transfers):
+                plan.counts["cancelled"] += len(plan.moves) - len(transfers)
+        linked = set()
+        for duplicate in duplicates:
+            if duplicate.action == LINK and link_duplicate(plan, duplicate):
+                transfer_report.add(duplicate.source, plan.destination(duplicate), Transfer(LINK, 0, 0))
+                plan.counts[LINK] += 1
+                linked.add(duplicate.source)
+                if library is not None:
+                    library.add(plan.destination(duplicate))
+                if manifest is not None:
+                    manifest.add(duplicate.source, plan.destination(duplicate))
+            elif duplicate.action == SKIP:
+                plan.counts[SKIP] += 1
+            else:
+                # A reported duplicate or one which couldn't be linked
+                report.add(duplicate.source, DUPLICATE, duplicate.original)
+        if progress is not None and duplicates:
+            progress.advance(len(duplicates))
+
+        if journal is not None:
+            # The reports come first, so that a photo is never done in the journal but missing from the reports
+            report.flush()
+            transfer_report.flush()
+            if manifest is not None:
+                manifest.flush()
+            for source, _, _ in transfers:
+                journal.done(source)
+            for duplicate in duplicates:
+                if duplicate.source in linked:
+                    journal.done(duplicate.source)
+                else:
+                    journal.skip(duplicate.source)
+            for unplaced in plan.unplaced:
+                journal.skip(unplaced.source)
+            journal.sync()
+
+def link_duplicate(plan:TransferPlan, duplicate)->bool:
+    """Replaces a duplicate photo with a hard link to its original, at the duplicate's destination.
+
+    :param plan: the transfer plan
+    :type plan: TransferPlan
+    :param duplicate: the duplicate
+    :type duplicate: Duplicate
+
+    :return: False if the link can't be created (e.g. the original is on another disk), so that the duplicate is skipped
+    :rtype: bool
+    |
+    """
+    try:
+        os.link(duplicate.original, plan.destination(duplicate))
+    except OSError:
+        return False
+    os.remove(duplicate.source)
+    return True
+
+def move_plan(plan:TransferPlan, jobs:int=1, pool:ThreadPoolExecutor=None, progress:ProgressTracker=None, control:JobControl=None)->list:
+    """Applies the planned moves, grouped by destination folder (over a bounded thread pool if jobs > 1)
+
+    :param plan: the transfer plan
+    :type plan: TransferPlan
+    :param jobs: number of parallel workers
+    :type jobs: int
+    :param pool: an already started thread pool (a new one is started if jobs > 1 and no pool is provided)
+    :type pool: ThreadPoolExecutor
+    :param progress: the progress of the run, which counts each move as it is done (by any worker)
+    :type progress: ProgressTracker
+    :param control: the pause and cancel requests of the run, which are checked before each move
+    :type control: JobControl
+
+    :return: (source, destination, transfer) of each move
+    :rtype: list
+    |
+    """
+    folders_moves = collections.OrderedDict()
+    for move in plan.moves:
+        folders_moves.setdefault(move.folder, []).append(move)
+
+    if jobs <= 1:
+        folders_transfers = [move_photos(plan, moves, progress, control) for moves in folders_moves.values()]
+    else:
+        with contextlib.ExitStack() as stack:
+            if pool is None:
+                pool = stack.enter_context(ThreadPoolExecutor(max_workers=jobs))
+            # list() re-raises the first exception of the workers (if any)
+            folders_transfers = list(pool.map(move_photos, itertools.repeat(plan), folders_moves.values(), itertools.repeat(progress), itertools.repeat(control)))
+    return [transfer for transfers in folders_transfers for transfer in transfers]
 
-def tidy_photos(export_path:str, photos_roots:dict, year:bool=False, month:bool=False, name_pattern:str="_place_reason_people"):
-    """Initiates the transfer process for each photo
+def photo_batches(photos_roots, batch_size:int=1000):
+    """Splits the photos into batches.
+
+    :param photos_roots: a dict with all the paths that contain photos or an iterable of photos (e.g. stream_photos)
+    :type photos_roots: dict
+    :param batch_size: number of photos in a batch
+    :type batch_size: int
+
+    :return: lists of photo paths
+    :rtype: generator
+    |
+    """
+    if isinstance(photos_roots, dict):
+        photos = (photo for photo_list in photos_roots.values() for photo in photo_list)
+    else:
+        photos = iter(photos_roots)
+    while True:
+        batch = list(itertools.islice(photos, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def tidy_photos(export_path:str, photos_roots:dict, year:bool=False, month:bool=False, name_pattern:str="_place_reason_people", jobs:int=1, cache_path:str=None, export_index:ExportIndex=None, dry_run:bool=False, plan_path:str=None, report_path:str=None, batch_size:int=1000, scheduler:TransferScheduler=None, duplicates:str=None, library_path:str=None, journal:TransferJournal=None, manifest_path:str=None, incremental:bool=False, metrics:RunMetrics=None, progress=None, control:JobControl=None)->TransferPlan:
+    """Initiates the transfer process for each photo. The photos are processed in batches:
+    | 1) EXIF extraction (over a process pool if jobs > 1)
+    | 2) Planning: destination folder and final name of each photo, serially and in the order of the photos
+    | 3) Duplicate detection (if duplicates is provided): photos which are byte-identical to a file of their destination folder
+    | 4) Execution of the batch's plan, unless it's a dry run, through a transfer scheduler if jobs > 1. The strategy of each move (rename or copy) is written in transferred.csv under the export path.
+
+    photos_roots can also be a stream of photos (see traversal.stream_photos), in which case
+    the first batches are moved while the input path is still being scanned.
+
+    If a journal is provided, the run can be resumed after an interruption: the moves which were in progress
+    are finished first (see TransferJournal.recover) and the photos which were already placed or reported are skipped.
+    The journal is marked as complete at the end of the run.
 
     :param export_path: path to the directory where the photo folder structure will be created
     :type export_path: str
-    :param photos_roots: a dict with all the paths that contain photos
+    :param photos_roots: a dict with all the paths that contain photos or an iterable of photos
     :type photos_roots: dict
     :param year: indicates if the photos will be grouped by year
     :type year: boolean
@@ -310,13 +876,256 @@ def tidy_photos(export_path:str, photos_roots:dict, year:bool=False, month:bool=
     :type month: boolean
     :param name_pattern: A string name pattern after which the photo folders will be named 
     :type name_pattern: str
+    :param jobs: number of parallel workers
+    :type jobs: int
+    :param cache_path: path to the persistent metadata cache (no cache if None)
+    :type cache_path: str
+    :param export_index: index of the folders of the export path (the export path is scanned once, if not provided)
+    :type export_index: ExportIndex
+    :param dry_run: if True, the plan is only created (and written), nothing is moved
+    :type dry_run: boolean
+    :param plan_path: path to a .json or .csv file where the plan will be written
+    :type plan_path: str
+    :param report_path: path to the .csv or .jsonl report of the unplaced photos (not_transferred.csv under the export path by default)
+    :type report_path: str
+    :param batch_size: number of photos which are extracted, planned and moved together
+    :type batch_size: int
+    :param scheduler: the transfer scheduler of the moves (one with jobs workers is started, if jobs > 1 and no scheduler is provided)
+    :type scheduler: TransferScheduler
+    :param duplicates: what to do with duplicate photos (skip, link or report). No duplicate detection if None.
+    :type duplicates: str
+    :param library_path: path to the content index of the library, which is used for the duplicates and kept up to date
+        with the placed photos (no index if None). A new index is built from the photos under the export path.
+    :type library_path: str
+    :param journal: the write-ahead journal of the run (it is ignored for a dry run)
+    :type journal: TransferJournal
+    :param manifest_path: path to the manifest of the run, from which it can be undone (a new one under the export path if None)
+    :type manifest_path: str
+    :param incremental: if True, the photos which already sit in the folder of their (cached) date are skipped without being opened (see already_organized)
+    :type incremental: boolean
+    :param metrics: the instrumentation of the run: the time of each stage (export_index, recovery, organized, exif, planning, dedup, execution),
+        the latency of each photo (see extract_photos, plan_photos and execute_plan) and the counts of the plan and of the metadata cache
+    :type metrics: RunMetrics
+    :param progress: where the progress of the run is sent: a callable or a queue of ProgressEvents, or a ProgressTracker
+        (e.g. with another interval). The events are throttled (see ProgressTracker), the last one is sent at the end of the run.
+    :type progress: callable
+    :param control: the pause and cancel requests of the run (e.g. from the GUI, see JobRunner). They are checked before each batch
+        and each move, so a cancelled run has recorded all its moves (in the reports, the manifest and the journal) and left the other
+        photos in place. The journal of a cancelled run is kept, so the run can be resumed.
+    :type control: JobControl
+
+    :return: the transfer plan. Its moves are kept only for a dry run or if it is written, its counts always.
+    :rtype: TransferPlan
     |
     """
-
-    # Iterate over list of photos
-    for photo_list in photos_roots.values():
-        for photo in photo_list:
-            transfer_photo(photo, export_path, year=year, month=month, name_pattern=name_pattern)
+    if metrics is None:
+        metrics = RunMetrics()
+    if export_index is None:
+        with metrics.stage("export_index"):
+            export_index = ExportIndex(export_path)
+    plan = TransferPlan(export_path)
+    keep_plan = dry_run or bool(plan_path)
+    if duplicates is not None and duplicates not in DUPLICATE_ACTIONS:
+        raise ValueError(f"Unknown action for duplicates: {duplicates}")
+    # A sink (callable or queue) is wrapped, a tracker is used as it is
+    if callable(progress) or hasattr(progress, "put_nowait"):
+        progress = ProgressTracker(progress)
+    if progress is not None and progress.total is None and isinstance(photos_roots, dict):
+        progress.total = sum(len(photo_list) for photo_list in photos_roots.values())
+
+    with contextlib.ExitStack() as stack:
+        cache = stack.enter_context(MetadataCache(cache_path)) if cache_path else None
+        library = None
+        if library_path:
+            library = stack.enter_context(LibraryIndex(library_path))
+            if not len(library):
+                library.rebuild(export_path)
+        finder = DuplicateFinder(jobs=max(jobs, 4), library=library) if duplicates else None
+        report = None if dry_run else stack.enter_context(UnplacedReport(report_path or default_report_path(export_path)))
+        transfer_report = None if dry_run else stack.enter_context(TransferReport(default_transfer_report_path(export_path)))
+        manifest = None if dry_run else stack.enter_context(MoveManifest(manifest_path or new_manifest_path(export_path)))
+        process_pool = stack.enter_context(ProcessPoolExecutor(max_workers=jobs)) if jobs > 1 else None
+        if scheduler is None and jobs > 1 and not dry_run:
+            scheduler = stack.enter_context(TransferScheduler(max_transfers=jobs))
+        if dry_run:
+            journal = None
+        if journal is not None:
+            with metrics.stage("recovery"):
+                recover_journal(journal, report, transfer_report, library, plan, manifest)
+
+        for batch in photo_batches(photos_roots, batch_size):
+            if control is not None and not control.proceed():
+                break
+            metrics.count("photos", len(batch))
+            photos_count = len(batch)
+            if journal is not None and journal.finished:
+                batch = [photo for photo in batch if photo not in journal.finished]
+            if incremental and cache is not None:
+                with metrics.stage("organized"):
+                    remaining = [photo for photo in batch if not already_organized(photo, cache, year, month, name_pattern, export_index)]
+                plan.counts["organized"] += len(batch) - len(remaining)
+                batch = remaining
+            # The photos which are skipped are done
+            if progress is not None and photos_count > len(batch):
+                progress.advance(photos_count - len(batch))
+            with metrics.stage("exif"):
+                photos = extract_photos(batch, jobs=jobs, cache=cache, pool=process_pool, metrics=metrics)
+            organized = plan.counts["organized"]
+            with metrics.stage("planning"):
+                plan_photos(photos, export_path, year=year, month=month, name_pattern=name_pattern, export_index=export_index, plan=plan, metrics=metrics)
+            if finder is not None:
+                with metrics.stage("dedup"):
+                    plan.add_duplicates(finder.find(export_path, plan.pending_moves()), duplicates)
+            batch_plan = plan.drain(keep=keep_plan)
+            if not dry_run:
+                with metrics.stage("execution"):
+                    execute_plan(batch_plan, jobs=jobs, report=report, transfer_report=transfer_report, scheduler=scheduler, library=library, journal=journal, manifest=manifest, metrics=metrics, progress=progress, control=control)
+                # The photos which are already in their folder are done too
+                if progress is not None and plan.counts["organized"] > organized:
+                    progress.advance(plan.counts["organized"] - organized)
+            elif progress is not None:
+                progress.advance(len(batch))
+            plan.counts.update({key: batch_plan.counts[key] for key in (RENAME, COPY, SKIP, LINK, "copied_bytes", "copy_seconds")})
+            if batch_plan.counts["cancelled"]:
+                plan.counts["cancelled"] += batch_plan.counts["cancelled"]
+        if journal is not None and not (control is not None and control.cancelled):
+            journal.complete()
+        if cache is not None:
+            metrics.count("cache_hits", cache.hits)
+            metrics.count("cache_misses", cache.misses)
+            # A cached photo is not opened
+            metrics.count("avoided_open", cache.hits)
+        if finder is not None:
+            metrics.count("hashed_partial", finder.hashed["partial"])
+            metrics.count("hashed_full", finder.hashed["full"])
+        for key in ("moves", "folders", "unplaced", "duplicates", "organized", "recovered", "cancelled", RENAME, COPY, SKIP, LINK, "copied_bytes"):
+            metrics.count(key, plan.counts[key])
+        if progress is not None:
+            progress.finish()
+
+    if plan_path:
+        plan.write(plan_path)
+    return plan
+
+def watch_photos(photos_path:str, export_path:str, year:bool=False, month:bool=False, name_pattern:str="_place_reason_people", cache_path:str=None, report_path:str=None, settle:float=5.0, interval:float=2.0, batch_size:int=1000, scheduler:TransferScheduler=None, polls:int=None, use_inotify:bool=True)->collections.Counter:
+    """Watches a hot folder and moves each photo, once it has stopped changing (see FolderWatcher), with transfer_photo.
+    The metadata cache, the export index, the taken names of the folders and the report stay open (and warm)
+    between the batches, for the whole life of the watch. A file which is added to a photo folder from outside
+    after it was listed is never overwritten: the photo takes the next free name (see Photo.move_to_folder).
+
+    :param photos_path: path to the watched folder
+    :type photos_path: str
+    :param export_path: path to the directory where the photo folder structure will be created
+    :type export_path: str
+    :param year: indicates if the photos will be grouped by year
+    :type year: boolean
+    :param month: indicates if the photos will be grouped by month
+    :type month: boolean
+    :param name_pattern: A string name pattern after which the photo folders will be named 
+    :type name_pattern: str
+    :param cache_path: path to the persistent metadata cache (no cache if None)
+    :type cache_path: str
+    :param report_path: path to the .csv or .jsonl report of the unplaced photos (not_transferred.csv under the export path by default)
+    :type report_path: str
+    :param settle: seconds for which a photo must not change, before it is moved
+    :type settle: float
+    :param interval: maximum number of seconds between two polls
+    :type interval: float
+    :param batch_size: maximum number of photos which are moved after a poll (the rest wait for the next poll)
+    :type batch_size: int
+    :param scheduler: a transfer scheduler for concurrent moves
+    :type scheduler: TransferScheduler
+    :param polls: number of polls after which the watch ends (it runs until it's interrupted if None)
+    :type polls: int
+    :param use_inotify: whether inotify is used (when it's available) to wake up as soon as a photo arrives
+    :type use_inotify: bool
+
+    :return: the number of moved photos (by strategy), of unplaced photos and of polls
+    :rtype: collections.Counter
+    |
+    """
+    counts = collections.Counter()
+    export_index = ExportIndex(export_path)
+    registry = NameRegistry()
+    with contextlib.ExitStack() as stack:
+        cache = stack.enter_context(MetadataCache(cache_path)) if cache_path else None
+        report = stack.enter_context(UnplacedReport(report_path or default_report_path(export_path)))
+        watcher = stack.enter_context(FolderWatcher(photos_path, settle=settle, interval=interval, use_inotify=use_inotify))
+        while polls is None or watcher.polls < polls:
+            if watcher.polls:
+                watcher.wait()
+            for batch in photo_batches(watcher.poll(), batch_size):
+                unplaced = report.count
+                results = []
+                for photo in batch:
+                    try:
+                        results.append((photo, transfer_photo(photo, export_path, year=year, month=month, name_pattern=name_pattern, cache=cache,
+                                                              export_index=export_index, report=report, registry=registry, scheduler=scheduler)))
+                    except OSError as e:
+                        # e.g. the photo was removed from the hot folder before it was moved
+                        report.add(photo, MISSING if isinstance(e, FileNotFoundError) else UNREADABLE, str(e))
+                for photo, result in results:
+                    try:
+                        transfer = result.result()[2] if scheduler is not None and result is not None else result
+                    except OSError as e:
+                        report.add(photo, MISSING if isinstance(e, FileNotFoundError) else UNREADABLE, str(e))
+                        continue
+                    if transfer is not None:
+                        counts[transfer.strategy] += 1
+                counts["unplaced"] += report.count - unplaced
+                report.flush()
+        counts["polls"] = watcher.polls
+    return counts
+
+def recover_journal(journal:TransferJournal, report:UnplacedReport, transfer_report:TransferReport, library:LibraryIndex=None, plan:TransferPlan=None, manifest:MoveManifest=None):
+    """Finishes the moves which an interrupted run left in progress (see TransferJournal.recover).
+    The recovered moves are written in the transfer report and the photos which are gone in the unplaced report.
+
+    :param journal: the journal of the interrupted run
+    :type journal: TransferJournal
+    :param report: the report of the unplaced photos
+    :type report: UnplacedReport
+    :param transfer_report: the report of the moved photos
+    :type transfer_report: TransferReport
+    :param library: the content index of the photos under the export path
+    :type library: LibraryIndex
+    :param plan: the plan of the run, whose counts are updated
+    :type plan: TransferPlan
+    :param manifest: the manifest of the run
+    :type manifest: MoveManifest
+    |
+    """
+    transfers, missing = journal.recover()
+    for source, destination, transfer in transfers:
+        transfer_report.add(source, destination, transfer)
+        if library is not None:
+            library.add(destination)
+        if manifest is not None:
+            manifest.add(source, destination)
+        if plan is not None:
+            plan.counts["recovered"] += 1
+            if transfer is not None:
+                plan.counts[transfer.strategy] += 1
+                plan.counts["copied_bytes"] += transfer.size
+                plan.counts["copy_seconds"] += transfer.seconds if transfer.strategy == COPY else 0
+    for source in missing:
+        report.add(source, MISSING)
+    report.flush()
+    transfer_report.flush()
+    if manifest is not None:
+        manifest.flush()
+    for source in missing:
+        journal.skip(source)
+    journal.sync()
+
+def print_progress(event):
+    """Prints the progress of a run on a single line, which is rewritten by every event (a sink of tidy_photos).
+
+    :param event: the progress of the run
+    :type event: ProgressEvent
+    |
+    """
+    print("\r" + event.describe().ljust(100), end="\n" if event.done else "", flush=True)
 
 def replace_backslashes(path:str):
     """Replaces the backslashes of string-paths with double forward slashes
@@ -406,31 +1215,184 @@ def name_convention():
     
     return name_pattern
 
+def main_args(argv=None):
+    """Parses the (optional) command line arguments of the application.
 
+    :param argv: argument list to parse (sys.argv by default)
+    :type argv: list
 
-def main():
+    :return: the parsed arguments
+    :rtype: argparse.Namespace
+    |
+    """
+    parser = ArgumentParser(prog="photonomist")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+            help="number of parallel workers for metadata extraction and moves [1]")
+    parser.add_argument("--cache",
+            help="path to the metadata cache [<export path>/{:s}]".format(CACHE_FILE_NAME))
+    parser.add_argument("--no-cache", action="store_true",
+            help="don't use the metadata cache")
+    parser.add_argument("--dry-run", action="store_true",
+            help="only plan the transfer, don't touch the photos")
+    parser.add_argument("--plan",
+            help="write the transfer plan to a .json or .csv file")
+    parser.add_argument("--stream", action="store_true",
+            help="start moving photos while the input path is still scanned (no disk space check)")
+    parser.add_argument("--duplicates", choices=DUPLICATE_ACTIONS, default="skip",
+            help="what to do with photos which already exist (byte by byte) in their folder: skip (leave them), link or report (leave them and write them in the report) [skip]")
+    parser.add_argument("--no-dedup", action="store_true",
+            help="don't look for duplicate photos")
+    parser.add_argument("--library-index",
+            help="path to the content index of the library [<export path>/{:s}]".format(LIBRARY_INDEX_FILE_NAME))
+    parser.add_argument("--no-library-index", action="store_true",
+            help="only look for duplicates in the destination folders")
+    parser.add_argument("--transfers", type=int,
+            help="number of concurrent moves [--jobs]")
+    parser.add_argument("--device-transfers", type=int, default=2,
+            help="number of concurrent copies from or to the same disk [2]")
+    parser.add_argument("--in-flight", type=int, default=512,
+            help="upper limit of the MB which are copied at the same time [512]")
+    parser.add_argument("--journal",
+            help="path to the journal of the run [<export path>/{:s}]".format(JOURNAL_FILE_NAME))
+    parser.add_argument("--no-journal", action="store_true",
+            help="don't keep a journal (an interrupted run can't be resumed)")
+    parser.add_argument("--incremental", action="store_true",
+            help="only list the directories which changed since the last run and skip the photos which are already in their folder")
+    parser.add_argument("--snapshot",
+            help="path to the snapshot of the input path for --incremental [<export path>/{:s}]".format(SNAPSHOT_FILE_NAME))
+    parser.add_argument("--metrics", metavar="REPORT",
+            help="write the timings and the counters of the run to a .json report and log their summary")
+    parser.add_argument("--no-progress", action="store_true",
+            help="don't print the progress of the moves")
+    parser.add_argument("--resume", metavar="JOURNAL",
+            help="resume the interrupted run of a journal (the paths and the options of the run are not asked again)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """ Executes the application. It is responsible for getting the user's input, asserting its validity
     and initiating the transfer process
 
+    :param argv: argument list to parse (sys.argv by default)
+    :type argv: list
     |
     """
-    # Input path 
-    photos_path = clean_path(path_string(input("Enter the path to your photos: ")))
-    photos_roots = input_path_validation(photos_path)
-
-    # Export path
-    export_path = clean_path(path_string(input("Enter the path where your photo-folders will be created: ")))
-    export_path_validation(export_path, photos_path, photos_roots)
-
-    # Group criteria
-    year, month = group_option()
-    name_pattern = name_convention()
+    args = main_args(argv)
+
+    journal = None
+    snapshot = None
+    metrics = RunMetrics()
+    if args.resume:
+        # The paths and the grouping of the interrupted run
+        journal = TransferJournal(args.resume)
+        if not journal.run:
+            journal.close()
+            raise Exception("The provided journal does not contain a run!")
+        photos_path, export_path = journal.run["photos_path"], journal.run["export_path"]
+        year, month, name_pattern = journal.run["year"], journal.run["month"], journal.run["name_pattern"]
+        manifest_path = journal.run.get("manifest_path")
+        path_exists(photos_path)
+        path_exists(export_path)
+        # The photos which are left (maybe none)
+        photos_roots = stream_photos(photos_path) if args.stream else traverse_photos_path(photos_path)
+    else:
+        # Input path 
+        photos_path = clean_path(path_string(input("Enter the path to your photos: ")))
+        if args.incremental:
+            # The snapshot of the last run is kept under the export path, so the input path is traversed later
+            path_exists(photos_path)
+            path_items(photos_path)
+        elif args.stream:
+            path_exists(photos_path)
+            path_items(photos_path)
+            # The photos are found while they are being moved
+            photos_roots = stream_photos(photos_path)
+        else:
+            photos_roots = input_path_validation(photos_path, metrics)
+
+        # Export path
+        export_path = clean_path(path_string(input("Enter the path where your photo-folders will be created: ")))
+        if args.incremental:
+            path_exists(export_path)
+            snapshot = TreeSnapshot(args.snapshot or default_snapshot_path(export_path))
+            # Only the directories which changed since the last run are listed (there may be no photos at all)
+            if args.stream:
+                photos_roots = stream_photos(photos_path, snapshot=snapshot)
+            else:
+                with metrics.stage("traversal"):
+                    photos_roots = traverse_photos_path(photos_path, snapshot)
+                export_path_validation(export_path, photos_path, photos_roots, metrics)
+        elif args.stream:
+            path_exists(export_path)
+        else:
+            export_path_validation(export_path, photos_path, photos_roots, metrics)
+
+        # Group criteria
+        year, month = group_option()
+        name_pattern = name_convention()
+
+        # Manifest (for undo) and journal (for resume)
+        manifest_path = new_manifest_path(export_path)
+        if not (args.no_journal or args.dry_run):
+            journal_path = args.journal or default_journal_path(export_path)
+            if os.path.exists(journal_path):
+                raise Exception(f"An interrupted run was found, resume it with: --resume {journal_path}")
+            journal = TransferJournal(journal_path)
+            journal.begin(photos_path=photos_path, export_path=export_path, year=year, month=month, name_pattern=name_pattern,
+                          manifest_path=manifest_path)
+
+    # Metadata cache
+    cache_path = None if args.no_cache else (args.cache or default_cache_path(export_path))
+
+    # Library index
+    library_path = None if args.no_library_index else (args.library_index or default_library_index_path(export_path))
+
+    # Transfer scheduler
+    transfers = args.transfers or args.jobs
+    scheduler = None
+    if transfers > 1 and not args.dry_run:
+        scheduler = TransferScheduler(max_transfers=transfers, max_bytes_in_flight=args.in_flight * 2**20, device_transfers=args.device_transfers)
 
     # Moves photos
-    tidy_photos(export_path, photos_roots, year=year, month=month, name_pattern=name_pattern)
-
-    # Open export path on file explorer
-    open_export_folder(export_path)
+    try:
+        plan = tidy_photos(export_path, photos_roots, year=year, month=month, name_pattern=name_pattern, jobs=args.jobs, cache_path=cache_path,
+                           dry_run=args.dry_run, plan_path=args.plan, scheduler=scheduler,
+                           duplicates=None if args.no_dedup else args.duplicates, library_path=library_path, journal=journal,
+                           manifest_path=manifest_path, incremental=args.incremental, metrics=metrics,
+                           progress=None if args.no_progress else print_progress)
+        # The snapshot is only saved for a complete run
+        if snapshot is not None and not args.dry_run:
+            snapshot.save()
+    finally:
+        if scheduler is not None:
+            scheduler.close()
+        # The journal of a complete run is removed
+        if journal is not None:
+            journal.close()
+        if snapshot is not None:
+            snapshot.close()
+
+    if snapshot is not None:
+        # An unchanged directory is not listed
+        metrics.count("avoided_listdir", snapshot.skipped)
+    if args.metrics:
+        metrics.write(args.metrics)
+        logger.start("INFO")
+        metrics.log_summary(logger)
+        logger.stop()
+
+    if snapshot is not None:
+        print(f"{snapshot.skipped} unchanged directories were not listed, {plan.counts['organized']} photos were already in their folders.")
+    if args.dry_run:
+        print(plan.summary())
+    else:
+        if plan.counts[COPY]:
+            print(plan.copy_summary())
+        if scheduler is not None:
+            print(scheduler.summary())
+        if manifest_path and os.path.exists(manifest_path):
+            print(f"The run can be undone with: photonomist undo {manifest_path}")
+        # Open export path on file explorer
+        open_export_folder(export_path)
      
 # Make the script executable.
 if __name__ == "__main__":
@@ -2,6 +2,10 @@
 
 """
 from .hello import main as hello
+from .organize import main as organize
+from .rebuild_index import main as rebuild_index
+from .undo import main as undo
+from .watch import main as watch
 
 
-__all__ = "hello",
+__all__ = "hello", "organize", "rebuild_index", "undo", "watch"
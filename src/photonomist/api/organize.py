@@ -0,0 +1,138 @@
+""" Implement the organize command.
+
+"""
+import os
+
+from ..core.config import config
+from ..core.logger import logger
+from ..__main__ import input_path_validation, export_path_validation, path_exists, path_items, traverse_photos_path, tidy_photos
+from ..metadata_cache import default_cache_path
+from ..library_index import default_library_index_path
+from ..journal import TransferJournal, default_journal_path
+from ..manifest import new_manifest_path
+from ..snapshot import TreeSnapshot, default_snapshot_path
+from ..run_metrics import RunMetrics
+from ..progress import ProgressTracker
+from ..transfer_scheduler import TransferScheduler
+
+
+# Settings which are taken from the organize section of the config file,
+# if they are not given on the command line.
+DEFAULTS = {"group": "day", "name_pattern": "", "jobs": 1, "duplicates": "skip", "batch_size": 1000, "progress": 10}
+
+
+def main(photos_path, export_path, group=None, name_pattern=None, jobs=None,
+         dry_run=False, cache=None, no_cache=False, report=None, plan=None,
+         duplicates=None, no_dedup=False, incremental=False, no_journal=False,
+         metrics=None, batch_size=None, progress=None) -> dict:
+    """ Execute the command.
+
+    Move the photos of the input path to the folders of their dates under the
+    export path, without asking anything. The settings which are not given
+    are taken from the organize section of the config file (etc/config.yml)
+    and else from DEFAULTS.
+
+    A run which was interrupted (e.g. a killed cron job) is resumed by the
+    next run of the same paths, from its journal.
+
+    :param photos_path: path to photos
+    :param export_path: path to the photo library
+    :param group: group the photos by day, month or year
+    :param name_pattern: suffix of the photo folders' names (e.g. _place)
+    :param jobs: number of parallel workers
+    :param dry_run: only plan the run, don't touch the photos
+    :param cache: path to the metadata cache [<export path>/.photonomist_cache.sqlite]
+    :param no_cache: don't use the metadata cache
+    :param report: path to the report of the photos which were not moved
+    :param plan: path to a .json or .csv file where the plan will be written
+    :param duplicates: what to do with duplicate photos (skip, link or report)
+    :param no_dedup: don't look for duplicate photos
+    :param incremental: only list the directories which changed since the
+        last run and skip the photos which are already in their folder
+    :param no_journal: don't keep a journal (the run can't be resumed)
+    :param metrics: path to the .json report of the timings and counters
+    :param batch_size: number of photos which are processed together
+    :param progress: seconds between two lines of progress in the log (0 to
+        never log it)
+    :return: the counts of the run (moves, folders, unplaced, duplicates, ..)
+    """
+    logger.debug("executing organize command")
+    settings = config.get("organize") or {}
+    group, name_pattern, jobs, duplicates, batch_size, progress = (
+        value if value is not None else settings.get(name, DEFAULTS[name])
+        for name, value in (("group", group), ("name_pattern", name_pattern), ("jobs", jobs),
+                            ("duplicates", duplicates), ("batch_size", batch_size), ("progress", progress)))
+    year, month = group == "year", group == "month"
+    run_metrics = RunMetrics()
+    journal = None
+    snapshot = None
+    scheduler = None
+    try:
+        try:
+            path_exists(export_path)
+            if incremental:
+                # Only the directories which changed since the last run are listed
+                path_exists(photos_path)
+                path_items(photos_path)
+                snapshot = TreeSnapshot(default_snapshot_path(export_path))
+                with run_metrics.stage("traversal"):
+                    photos_roots = traverse_photos_path(photos_path, snapshot)
+            else:
+                photos_roots = input_path_validation(photos_path, run_metrics)
+            export_path_validation(export_path, photos_path, photos_roots, run_metrics)
+        except Exception as err:
+            raise RuntimeError("{:s}: {!s}".format(photos_path, err)) from err
+
+        manifest_path = new_manifest_path(export_path)
+        if not (no_journal or dry_run):
+            journal = TransferJournal(default_journal_path(export_path))
+            if journal.run:
+                if journal.run["photos_path"] != photos_path:
+                    raise RuntimeError("an interrupted run of {:s} was found, resume it with: python -m photonomist --resume {:s}".format(
+                        journal.run["photos_path"], journal.path))
+                # The grouping of the interrupted run is kept
+                logger.info("resuming the interrupted run of {:s}".format(photos_path))
+                year, month, name_pattern = journal.run["year"], journal.run["month"], journal.run["name_pattern"]
+                manifest_path = journal.run.get("manifest_path") or manifest_path
+            journal.begin(photos_path=photos_path, export_path=export_path, year=year, month=month,
+                          name_pattern=name_pattern, manifest_path=manifest_path)
+        if jobs > 1 and not dry_run:
+            scheduler = TransferScheduler(max_transfers=jobs)
+
+        logger.info("organizing {:s} into {:s}".format(photos_path, export_path))
+        tracker = None
+        if progress:
+            tracker = ProgressTracker(lambda event: logger.info("progress: {:s}".format(event.describe())), interval=progress)
+        result = tidy_photos(export_path, photos_roots, year=year, month=month, name_pattern=name_pattern, jobs=jobs,
+                             cache_path=None if no_cache else (cache or default_cache_path(export_path)),
+                             dry_run=dry_run, plan_path=plan, report_path=report, batch_size=batch_size,
+                             scheduler=scheduler, duplicates=None if no_dedup else duplicates,
+                             library_path=None if no_dedup else default_library_index_path(export_path),
+                             journal=journal, manifest_path=manifest_path, incremental=incremental, metrics=run_metrics,
+                             progress=tracker)
+        # The snapshot is only saved for a complete run
+        if snapshot is not None and not dry_run:
+            snapshot.save()
+            run_metrics.count("avoided_listdir", snapshot.skipped)
+    finally:
+        if scheduler is not None:
+            scheduler.close()
+        # The journal of a complete run is removed
+        if journal is not None:
+            journal.close()
+        if snapshot is not None:
+            snapshot.close()
+
+    if metrics:
+        run_metrics.write(metrics)
+    run_metrics.log_summary(logger)
+    if dry_run:
+        logger.info(result.summary())
+    else:
+        # The duplicates which were not linked (skipped, reported or whose link failed) are left at their source
+        logger.info("organize of {:s}: {:d} photos moved, {:d} not moved".format(
+            photos_path, result.counts["rename"] + result.counts["copy"] + result.counts["link"],
+            result.counts["unplaced"] + result.counts["duplicates"] - result.counts["link"] + result.counts["cancelled"]))
+        if os.path.exists(manifest_path):
+            logger.info("the run can be undone with: photonomist undo {:s}".format(manifest_path))
+    return dict(result.counts)
@@ -0,0 +1,22 @@
+""" Implement the rebuild-index command.
+
+"""
+from ..core.logger import logger
+from ..library_index import LibraryIndex, default_library_index_path
+
+
+def main(export_path, index=None) -> dict:
+    """ Execute the command.
+
+    Reconcile the content index of the library with the photos under the
+    export path. Only new, changed and removed photos are touched.
+
+    :param export_path: path to the photo library
+    :param index: path to the index [<export path>/.photonomist_library.sqlite]
+    :return: number of added, updated, removed and unchanged photos
+    """
+    logger.debug("executing rebuild-index command")
+    with LibraryIndex(index or default_library_index_path(export_path)) as library:
+        counts = library.rebuild(export_path)
+    logger.info("library index: {added:d} added, {updated:d} updated, {removed:d} removed, {unchanged:d} unchanged".format(**counts))
+    return counts
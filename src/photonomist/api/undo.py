@@ -0,0 +1,37 @@
+""" Implement the undo command.
+
+"""
+import os
+
+from ..core.logger import logger
+from ..manifest import latest_manifest_path, undo_run
+from ..unplaced_report import UnplacedReport
+
+
+def main(manifest=None, export_path=None, jobs=4) -> dict:
+    """ Execute the command.
+
+    Move the photos of a run back to their original paths. The photos which
+    changed since the run are left where they are and written in a report
+    next to the manifest (<manifest>.not_undone.csv). The manifest is renamed
+    to <manifest>.undone, so that the run isn't undone twice.
+
+    :param manifest: path to the manifest of the run
+    :param export_path: path to the photo library (the last run is undone, if
+        no manifest is provided)
+    :param jobs: number of parallel workers
+    :return: number of photos of each outcome and of the removed folders
+    """
+    logger.debug("executing undo command")
+    if manifest is None:
+        if export_path is None:
+            raise RuntimeError("a manifest or an export path is needed")
+        manifest = latest_manifest_path(export_path)
+        if manifest is None:
+            raise RuntimeError("no run to undo in {:s}".format(export_path))
+    with UnplacedReport(manifest + ".not_undone.csv") as report:
+        counts = undo_run(manifest, jobs=jobs, report=report)
+    os.replace(manifest, manifest + ".undone")
+    logger.info("undo of {:s}: {:d} photos moved back, {:d} left, {:d} folders removed".format(
+        manifest, counts["undone"], sum(counts.values()) - counts["undone"] - counts["folders"], counts["folders"]))
+    return dict(counts)
@@ -0,0 +1,45 @@
+""" Implement the watch command.
+
+"""
+from ..core.logger import logger
+from ..__main__ import watch_photos
+from ..metadata_cache import default_cache_path
+from ..transfer_scheduler import TransferScheduler
+
+
+def main(photos_path, export_path, group="day", name_pattern="", settle=5.0,
+         interval=2.0, transfers=1, no_cache=False, polls=None) -> dict:
+    """ Execute the command.
+
+    Watch a hot folder and move each photo to the folder of its date, once it
+    has stopped changing. The command runs until it is interrupted (or for a
+    number of polls).
+
+    :param photos_path: path to the watched folder
+    :param export_path: path to the photo library
+    :param group: group the photos by day, month or year
+    :param name_pattern: suffix of the photo folders' names (e.g. _place)
+    :param settle: seconds for which a photo must not change before it is moved
+    :param interval: maximum number of seconds between two polls
+    :param transfers: number of concurrent moves
+    :param no_cache: don't use the metadata cache
+    :param polls: number of polls after which the command ends
+    :return: number of moved photos (by strategy), of unplaced photos and of polls
+    """
+    logger.debug("executing watch command")
+    cache_path = None if no_cache else default_cache_path(export_path)
+    scheduler = TransferScheduler(max_transfers=transfers) if transfers > 1 else None
+    logger.info("watching {:s}".format(photos_path))
+    try:
+        counts = watch_photos(photos_path, export_path, year=group == "year", month=group == "month",
+                              name_pattern=name_pattern, cache_path=cache_path, settle=settle,
+                              interval=interval, scheduler=scheduler, polls=polls)
+    except KeyboardInterrupt:
+        logger.info("the watch was interrupted")
+        return {}
+    finally:
+        if scheduler is not None:
+            scheduler.close()
+    logger.info("watch of {:s}: {:d} photos moved, {:d} unplaced".format(
+        photos_path, counts["rename"] + counts["copy"], counts["unplaced"]))
+    return dict(counts)
@@ -6,6 +6,10 @@ from inspect import getfullargspec
 
 from . import __version__
 from .api import hello
+from .api import organize
+from .api import rebuild_index
+from .api import undo
+from .api import watch
 from .core.config import config
 from .core.logger import logger
 
@@ -60,6 +64,10 @@ def _args(argv):
     common = ArgumentParser(add_help=False)  # common subcommand arguments
     common.add_argument("--name", "-n", default="World", help="greeting name")
     _hello(subparsers, common)
+    _organize(subparsers)
+    _rebuild_index(subparsers)
+    _undo(subparsers)
+    _watch(subparsers)
     args = parser.parse_args(argv)    
     if not args.command:
         # No sucommand was specified.
@@ -83,6 +91,110 @@ def _hello(subparsers, common):
     return
 
 
+def _organize(subparsers):
+    """ CLI adaptor for the api.organize command.
+
+    The options which are not given are taken from the organize section of the
+    config file.
+
+    :param subparsers: subcommand parsers
+    """
+    parser = subparsers.add_parser("organize",
+            help="move the photos of a path to the folders of their dates, without asking anything")
+    parser.add_argument("photos_path", help="path to the photos")
+    parser.add_argument("export_path", help="path to the photo library")
+    parser.add_argument("--group", choices=("day", "month", "year"),
+            help="group the photos by day, month or year [day]")
+    parser.add_argument("--name-pattern",
+            help="suffix of the photo folders' names, e.g. _place_reason_people")
+    parser.add_argument("-j", "--jobs", type=int,
+            help="number of parallel workers for metadata extraction and moves [1]")
+    parser.add_argument("--dry-run", action="store_true",
+            help="only plan the transfer, don't touch the photos")
+    parser.add_argument("--plan",
+            help="write the transfer plan to a .json or .csv file")
+    parser.add_argument("--cache",
+            help="path to the metadata cache [<export path>/.photonomist_cache.sqlite]")
+    parser.add_argument("--no-cache", action="store_true",
+            help="don't use the metadata cache")
+    parser.add_argument("--report",
+            help="path to the .csv or .jsonl report of the photos which were not moved [<export path>/not_transferred.csv]")
+    parser.add_argument("--duplicates", choices=("skip", "link", "report"),
+            help="what to do with photos which already exist in the library: skip (leave them), link or report (leave them and write them in the report) [skip]")
+    parser.add_argument("--no-dedup", action="store_true",
+            help="don't look for duplicate photos")
+    parser.add_argument("--incremental", action="store_true",
+            help="only list the directories which changed since the last run")
+    parser.add_argument("--no-journal", action="store_true",
+            help="don't keep a journal (an interrupted run can't be resumed)")
+    parser.add_argument("--metrics",
+            help="write the timings and the counters of the run to a .json report")
+    parser.add_argument("--batch-size", type=int,
+            help="number of photos which are processed together [1000]")
+    parser.add_argument("--progress", type=float, metavar="SECONDS",
+            help="log the progress of the run every SECONDS, 0 to never log it [10]")
+    parser.set_defaults(command=organize)
+    return
+
+
+def _rebuild_index(subparsers):
+    """ CLI adaptor for the api.rebuild_index command.
+
+    :param subparsers: subcommand parsers
+    """
+    parser = subparsers.add_parser("rebuild-index",
+            help="reconcile the content index of the library with the export path")
+    parser.add_argument("export_path", help="path to the photo library")
+    parser.add_argument("--index",
+            help="path to the index [<export path>/.photonomist_library.sqlite]")
+    parser.set_defaults(command=rebuild_index)
+    return
+
+
+def _undo(subparsers):
+    """ CLI adaptor for the api.undo command.
+
+    :param subparsers: subcommand parsers
+    """
+    parser = subparsers.add_parser("undo",
+            help="move the photos of a run back to their original paths")
+    parser.add_argument("manifest", nargs="?",
+            help="path to the manifest of the run")
+    parser.add_argument("--export-path",
+            help="undo the last run under this photo library")
+    parser.add_argument("-j", "--jobs", type=int, default=4,
+            help="number of parallel workers [4]")
+    parser.set_defaults(command=undo)
+    return
+
+
+def _watch(subparsers):
+    """ CLI adaptor for the api.watch command.
+
+    :param subparsers: subcommand parsers
+    """
+    parser = subparsers.add_parser("watch",
+            help="move the photos of a hot folder as soon as they arrive")
+    parser.add_argument("photos_path", help="path to the watched folder")
+    parser.add_argument("export_path", help="path to the photo library")
+    parser.add_argument("--group", choices=("day", "month", "year"), default="day",
+            help="group the photos by day, month or year [day]")
+    parser.add_argument("--name-pattern", default="",
+            help="suffix of the photo folders' names, e.g. _place_reason_people")
+    parser.add_argument("--settle", type=float, default=5.0,
+            help="seconds for which a photo must not change before it is moved [5]")
+    parser.add_argument("--interval", type=float, default=2.0,
+            help="maximum number of seconds between two polls [2]")
+    parser.add_argument("--transfers", type=int, default=1,
+            help="number of concurrent moves [1]")
+    parser.add_argument("--no-cache", action="store_true",
+            help="don't use the metadata cache")
+    parser.add_argument("--polls", type=int,
+            help="stop after this number of polls (runs until it's interrupted by default)")
+    parser.set_defaults(command=watch)
+    return
+
+
 # Make the module executable.
 
 if __name__ == "__main__":
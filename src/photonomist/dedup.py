@@ -0,0 +1,210 @@
+""" This module hosts the DuplicateFinder class
+"""
+import collections
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# What is done with a duplicate photo
+SKIP = "skip" # it stays where it is and it is only counted (in the summary of the run)
+LINK = "link" # its destination becomes a hard link to the original photo and the duplicate is removed
+REPORT = "report" # it stays where it is and it is written in the not transferred report, with its original
+DUPLICATE_ACTIONS = (SKIP, LINK, REPORT)
+
+# Bytes which are hashed from the beginning and from the end of a photo, before the whole photo is hashed
+PARTIAL_HASH_SIZE = 64 * 2**10
+# Chunk size of the full hash (hashlib releases the GIL for chunks bigger than 2 KB)
+FULL_HASH_CHUNK = 2**20
+
+
+def partial_hash(path:str, partial_size:int=PARTIAL_HASH_SIZE)->str:
+    """Hashes the first and the last partial_size bytes of a photo.
+
+    :param path: path to photo
+    :type path: str
+    :param partial_size: bytes from the beginning and from the end
+    :type partial_size: int
+
+    :return: hex digest
+    :rtype: str
+    |
+    """
+    digest = hashlib.blake2b()
+    with open(path, "rb") as photo_file:
+        digest.update(photo_file.read(partial_size))
+        photo_file.seek(0, os.SEEK_END)
+        size = photo_file.tell()
+        if size > partial_size:
+            photo_file.seek(max(partial_size, size - partial_size))
+            digest.update(photo_file.read(partial_size))
+    return digest.hexdigest()
+
+def full_hash(path:str)->str:
+    """Hashes the whole photo.
+
+    :param path: path to photo
+    :type path: str
+
+    :return: hex digest
+    :rtype: str
+    |
+    """
+    digest = hashlib.blake2b()
+    with open(path, "rb") as photo_file:
+        for chunk in iter(lambda: photo_file.read(FULL_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def file_size(path:str)->int:
+    """Returns the size of a photo. The photos of the traversal (PhotoEntry) are not stat'ed again.
+    |
+    """
+    return (getattr(path, "stat", None) or os.stat(path)).st_size
+
+
+class DuplicateFinder:
+    """This class is used to represent the duplicate detection stage of a run.
+    The photos which will be moved to a folder are compared with the files of the folder and with each other:
+    | 1) by size (the folder is listed once)
+    | 2) by a hash of their first and last few KB
+    | 3) by a hash of the whole file, only for the photos which still match
+    The hashing runs in a thread pool. The hashes and the folder listings are kept for the whole run,
+    so every file is hashed once, however many batches it is compared in.
+
+    If a library index is provided, the photos are also looked up in the whole library (see LibraryIndex).
+
+    :param jobs: number of hashing threads
+    :type jobs: int
+    :param partial_size: bytes from the beginning and from the end of a photo for the partial hash
+    :type partial_size: int
+    :param library: the content index of the photos under the export path
+    :type library: LibraryIndex
+    |
+    """
+
+    def __init__(self, jobs:int=4, partial_size:int=PARTIAL_HASH_SIZE, library=None):
+        """Constructor method
+        |
+        """
+        self.jobs = max(1, jobs)
+        self.library = library
+        self.partial_size = partial_size
+        self.hashed = collections.Counter()
+        self.__folders = {}
+        self.__partial = {}
+        self.__full = {}
+
+    def __folder_files(self, folder_path:str)->dict:
+        """Returns the files of a folder grouped by size. The folder is listed the first time it's needed.
+        |
+        """
+        if folder_path not in self.__folders:
+            sizes = collections.defaultdict(list)
+            try:
+                with os.scandir(folder_path) as entries:
+                    for entry in sorted(entries, key=lambda entry: entry.name):
+                        if entry.is_file(follow_symlinks=False):
+                            sizes[entry.stat().st_size].append(entry.path)
+            except FileNotFoundError:
+                pass
+            self.__folders[folder_path] = sizes
+        return self.__folders[folder_path]
+
+    def __hash(self, paths:list, hashes:dict, function, kind:str):
+        """Hashes (in the thread pool) the paths which haven't been hashed yet.
+        |
+        """
+        paths = [path for path in dict.fromkeys(paths) if path not in hashes]
+        if not paths:
+            return
+        if self.jobs == 1 or len(paths) == 1:
+            results = map(function, paths)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(paths))) as pool:
+                results = list(pool.map(function, paths))
+        for path, digest in zip(paths, results):
+            hashes[path] = digest
+        self.hashed[kind] += len(paths)
+
+    @staticmethod
+    def __matching(groups:list, hashes:dict, incoming:set)->list:
+        """Splits groups of candidates by hash and keeps the groups which still contain a photo that will be moved.
+        |
+        """
+        matching = []
+        for group in groups:
+            subgroups = collections.defaultdict(list)
+            for path in group:
+                subgroups[hashes[path]].append(path)
+            matching.extend(subgroup for subgroup in subgroups.values()
+                            if len(subgroup) > 1 and any(path in incoming for path in subgroup[1:]))
+        return matching
+
+    def find(self, export_path:str, moves:list)->dict:
+        """Finds the moves of photos which are byte-identical to a file of their destination folder,
+        to a photo which is moved there before them or to a photo of the library index.
+
+        :param export_path: path to the directory where the photo folder structure will be created
+        :type export_path: str
+        :param moves: planned moves (see TransferPlan.pending_moves)
+        :type moves: list
+
+        :return: the moves of duplicates --> path to the original photo
+        :rtype: dict
+        |
+        """
+        # 1) size
+        groups = collections.OrderedDict()
+        sources = {}
+        for move in moves:
+            folder_path = os.path.join(export_path, move.folder)
+            size = file_size(move.source)
+            key = (folder_path, size)
+            if key not in groups:
+                groups[key] = list(self.__folder_files(folder_path).get(size, []))
+            groups[key].append(move.source)
+            sources[move.source] = move
+        incoming = set(sources)
+        candidates = [group for group in groups.values() if len(group) > 1 and any(path in incoming for path in group[1:])]
+
+        # 2) first and last few KB
+        self.__hash([path for group in candidates for path in group], self.__partial,
+                    lambda path: partial_hash(path, self.partial_size), "partial")
+        candidates = self.__matching(candidates, self.__partial, incoming)
+
+        # 3) whole file
+        self.__hash([path for group in candidates for path in group], self.__full, full_hash, "full")
+        candidates = self.__matching(candidates, self.__full, incoming)
+
+        originals = {}
+        for group in candidates:
+            original = group[0]
+            if original in incoming:
+                # The original is moved in the same batch
+                original = os.path.join(export_path, sources[original].folder, sources[original].file_name)
+            for path in group[1:]:
+                if path in incoming:
+                    originals[sources[path]] = original
+
+        if self.library is not None:
+            for move in moves:
+                if move not in originals:
+                    original = self.library.find(move.source, file_size(move.source))
+                    if original is not None:
+                        originals[move] = original
+            # The duplicates of a photo which is in the library are duplicates of the library photo
+            destinations = {os.path.join(export_path, move.folder, move.file_name): move for move in moves}
+            for move, original in originals.items():
+                if original in destinations and destinations[original] in originals:
+                    originals[move] = originals[destinations[original]]
+
+        # The photos which will be moved are files of their folders for the next batches
+        for (folder_path, size), group in groups.items():
+            for path in group:
+                if path in incoming and sources[path] not in originals:
+                    destination = os.path.join(folder_path, sources[path].file_name)
+                    self.__folder_files(folder_path)[size].append(destination)
+                    for hashes in (self.__partial, self.__full):
+                        if path in hashes:
+                            hashes[destination] = hashes[path]
+        return originals
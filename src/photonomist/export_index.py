@@ -0,0 +1,98 @@
+""" This module hosts the ExportIndex class
+"""
+import os
+import re
+
+# year, year_month or year_month_day at the beginning of a folder's name
+DATE_PREFIX = re.compile(r"^(\d{4})(?:_(\d{2}))?(?:_(\d{2}))?(?=_|$)")
+
+
+def date_key(dir_name:str)->str:
+    """Extracts the date prefix of a photo folder's name.
+
+    | *Example:*
+    | *2019_12_14_place_reason_people --> 2019_12_14*
+    | *2019_12_people --> 2019_12*
+    | *holidays --> None*
+
+    :param dir_name: the folder's name
+    :type dir_name: str
+
+    :return: the date prefix or None, if the folder's name doesn't start with a date
+    :rtype: str
+    |
+    """
+    match = DATE_PREFIX.match(dir_name)
+    if not match:
+        return None
+    return "_".join(group for group in match.groups() if group)
+
+
+class ExportIndex:
+    """This class is used to represent the photo folders of the export path.
+    The export path is scanned once and the index is kept up to date as photonomist creates folders,
+    so that looking up a folder doesn't require walking the export path for every photo.
+
+    The folders are also indexed by their date prefix. That way, a folder which was created by an earlier run
+    with a different name pattern (*2019_12_14_place* vs *2019_12_14_reason*) is found too.
+
+    :param export_path: path to the directory where the photo folder structure will be created
+    :type export_path: str
+    |
+    """
+
+    def __init__(self, export_path:str):
+        """Constructor method
+        |
+        """
+        self.export_path = export_path
+        self.__folders = set()
+        self.__dates = {}
+        self.__scan()
+
+    def __scan(self):
+        """Lists the folders of the export path. Sorting keeps the chosen folder deterministic,
+        when more than one folder share the same date prefix.
+        |
+        """
+        try:
+            with os.scandir(self.export_path) as entries:
+                dir_names = sorted(entry.name for entry in entries if entry.is_dir())
+        except FileNotFoundError:
+            dir_names = []
+        for dir_name in dir_names:
+            self.add(dir_name)
+
+    def __contains__(self, dir_name:str)->bool:
+        return dir_name in self.__folders
+
+    def __len__(self)->int:
+        return len(self.__folders)
+
+    def add(self, dir_name:str):
+        """Registers a folder of the export path.
+
+        :param dir_name: the folder's name
+        :type dir_name: str
+        |
+        """
+        self.__folders.add(dir_name)
+        key = date_key(dir_name)
+        if key and key not in self.__dates:
+            self.__dates[key] = dir_name
+
+    def folder_for(self, dir_name:str)->str:
+        """Returns the existing folder in which the photos of dir_name should go.
+        That is dir_name itself, if it exists, or else a folder with the same date prefix.
+
+        :param dir_name: the wonna be directory name
+        :type dir_name: str
+
+        :return: the name of an existing folder or None
+        :rtype: str
+        |
+        """
+        if dir_name in self.__folders:
+            return dir_name
+        key = date_key(dir_name)
+        return self.__dates.get(key) if key else None
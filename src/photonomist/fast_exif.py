@@ -0,0 +1,225 @@
+""" This module hosts a minimal, bounded-read EXIF reader.
+
+Instead of processing the whole tag set (like `exifread <https://exif-py.readthedocs.io/en/latest/>`_ does),
+it only follows the path to the requested tags:
+
+| **JPEG**: SOI --> APP1 (Exif) segment, which is read with a single pread
+| **TIFF based RAW (NEF/CR2)**: TIFF header --> IFD0 --> Exif sub-IFD, a few small preads
+
+A typical photo costs a few KB of I/O. Whatever this reader can't handle raises an ExifError,
+so that the caller can fall back to exifread.
+"""
+import os
+import struct
+
+# TIFF tag id --> metadata key (the same keys that the Photo class gets from exifread)
+TAGS = {
+    0x0110: "Model",
+    0x9003: "DateTimeOriginal",
+    0xA002: "ExifImageWidth",
+    0xA003: "ExifImageLength",
+}
+EXIF_IFD_POINTER = 0x8769
+
+TIFF_HEADERS = {b"II*\x00": "<", b"MM\x00*": ">"}
+JPEG_SOI = b"\xff\xd8"
+JPEG_APP1 = 0xE1
+# Start of scan and end of image. EXIF data is never found after them.
+JPEG_STOP_MARKERS = (0xDA, 0xD9)
+EXIF_HEADER = b"Exif\x00\x00"
+
+# Sanity limits for corrupt files
+MAX_JPEG_SEGMENTS = 32
+MAX_IFD_ENTRIES = 1024
+
+# TIFF types
+ASCII, SHORT, LONG = 2, 3, 4
+
+
+class ExifError(Exception):
+    """Raised when the fast reader can't extract the requested tags from a photo.
+    |
+    """
+
+
+class NoExifError(ExifError):
+    """Raised when a (valid) photo doesn't contain any EXIF data.
+    |
+    """
+
+
+def _pread(fd:int, size:int, offset:int)->bytes:
+    """Reads size bytes at the specified offset of a file descriptor.
+    It uses os.pread where available (it doesn't move the file position) and lseek/read elsewhere (Windows).
+
+    :param fd: file descriptor
+    :type fd: int
+    :param size: number of bytes to read
+    :type size: int
+    :param offset: absolute offset in the file
+    :type offset: int
+
+    :return: the bytes that were read
+    :rtype: bytes
+    |
+    """
+    if hasattr(os, "pread"):
+        data = os.pread(fd, size, offset)
+    else:
+        os.lseek(fd, offset, os.SEEK_SET)
+        data = os.read(fd, size)
+    if len(data) != size:
+        raise ExifError("Unexpected end of file!")
+    return data
+
+
+class _BufferReader:
+    """Reads from the in-memory APP1 segment of a JPEG. Offsets are relative to the TIFF header.
+    |
+    """
+    def __init__(self, buffer:bytes):
+        self.__buffer = buffer
+
+    def __call__(self, offset:int, size:int)->bytes:
+        if offset < 0 or offset + size > len(self.__buffer):
+            raise ExifError("EXIF offset points outside of the APP1 segment!")
+        return self.__buffer[offset:offset + size]
+
+
+class _FileReader:
+    """Reads directly from a TIFF based file. Offsets are relative to the TIFF header (start of the file).
+    |
+    """
+    def __init__(self, fd:int):
+        self.__fd = fd
+
+    def __call__(self, offset:int, size:int)->bytes:
+        return _pread(self.__fd, size, offset)
+
+
+def _jpeg_reader(fd:int)->_BufferReader:
+    """Walks the JPEG markers until it finds the Exif APP1 segment and reads it at once.
+
+    :param fd: file descriptor of the JPEG
+    :type fd: int
+
+    :return: a reader over the TIFF structure of the APP1 segment
+    :rtype: _BufferReader
+    |
+    """
+    offset = len(JPEG_SOI)
+    for _ in range(MAX_JPEG_SEGMENTS):
+        # marker (2 bytes) + segment length (2 bytes, it includes itself)
+        segment_head = _pread(fd, 4, offset)
+        if segment_head[0] != 0xFF:
+            raise ExifError("Corrupt JPEG marker!")
+        if segment_head[1] in JPEG_STOP_MARKERS:
+            # All the segments before the image data were read
+            raise NoExifError("The JPEG doesn't contain an EXIF segment!")
+        length = struct.unpack(">H", segment_head[2:])[0]
+        if segment_head[1] == JPEG_APP1 and _pread(fd, len(EXIF_HEADER), offset + 4) == EXIF_HEADER:
+            return _BufferReader(_pread(fd, length - 2 - len(EXIF_HEADER), offset + 4 + len(EXIF_HEADER)))
+        offset += 2 + length
+    raise ExifError("Too many JPEG segments!")
+
+
+def _ifd_entries(read, endian:str, ifd_offset:int):
+    """Yields the entries of an Image File Directory.
+
+    :param read: reader of the TIFF structure
+    :type read: callable
+    :param endian: struct byte order of the TIFF structure
+    :type endian: str
+    :param ifd_offset: offset of the IFD
+    :type ifd_offset: int
+
+    :return: tuples of tag, type, count, and raw (4 bytes) value
+    :rtype: generator
+    |
+    """
+    count = struct.unpack(endian + "H", read(ifd_offset, 2))[0]
+    if count > MAX_IFD_ENTRIES:
+        raise ExifError("Corrupt IFD!")
+    entries = read(ifd_offset + 2, count * 12)
+    for index in range(0, count * 12, 12):
+        yield struct.unpack(endian + "HHI4s", entries[index:index + 12])
+
+
+def _tag_value(read, endian:str, tag_type:int, count:int, value:bytes):
+    """Decodes the value of an IFD entry. Only the types that photonomist needs are supported.
+
+    :return: the decoded value
+    :rtype: str or int
+    |
+    """
+    if tag_type == ASCII:
+        raw = value[:count] if count <= 4 else read(struct.unpack(endian + "I", value)[0], count)
+        return raw.split(b"\x00", 1)[0].decode("ascii", "replace").strip()
+    if tag_type == SHORT:
+        return struct.unpack(endian + "H", value[:2])[0]
+    if tag_type == LONG:
+        return struct.unpack(endian + "I", value)[0]
+    raise ExifError(f"Unsupported tag type {tag_type}!")
+
+
+def _tiff_tags(read, tags:tuple)->dict:
+    """Reads the requested tags from IFD0 and the Exif sub-IFD of a TIFF structure.
+
+    :param read: reader of the TIFF structure
+    :type read: callable
+    :param tags: the metadata keys to extract
+    :type tags: tuple
+
+    :return: the extracted tags
+    :rtype: dict
+    |
+    """
+    header = read(0, 8)
+    if header[:4] not in TIFF_HEADERS:
+        raise ExifError("Invalid TIFF header!")
+    endian = TIFF_HEADERS[header[:4]]
+
+    metadata = {}
+    ifd_offsets = [struct.unpack(endian + "I", header[4:])[0]]
+    visited = set()
+    while ifd_offsets and not all(tag in metadata for tag in tags):
+        ifd_offset = ifd_offsets.pop(0)
+        if ifd_offset in visited:
+            raise ExifError("Circular IFD chain!")
+        visited.add(ifd_offset)
+        for tag, tag_type, count, value in _ifd_entries(read, endian, ifd_offset):
+            if tag == EXIF_IFD_POINTER:
+                ifd_offsets.append(struct.unpack(endian + "I", value)[0])
+            elif TAGS.get(tag) in tags and TAGS[tag] not in metadata:
+                tag_value = _tag_value(read, endian, tag_type, count, value)
+                if tag_value != "":
+                    metadata[TAGS[tag]] = tag_value
+    return metadata
+
+
+def read_exif_tags(photo_path:str, tags:tuple=("DateTimeOriginal",))->dict:
+    """Reads the requested EXIF tags of a JPEG or TIFF based (NEF/CR2) photo with a few small reads.
+
+    :param photo_path: path to photo
+    :type photo_path: str
+    :param tags: the metadata keys to extract
+    :type tags: tuple
+
+    :return: the found tags. The missing ones are not included.
+    :rtype: dict
+    |
+    """
+    fd = os.open(photo_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        head = _pread(fd, 4, 0)
+        if head[:2] == JPEG_SOI:
+            read = _jpeg_reader(fd)
+        elif head in TIFF_HEADERS:
+            read = _FileReader(fd)
+        else:
+            raise ExifError("Unknown file format!")
+        return _tiff_tags(read, tags)
+    except struct.error as e:
+        raise ExifError(str(e))
+    finally:
+        os.close(fd)
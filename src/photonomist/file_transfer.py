@@ -0,0 +1,230 @@
+""" This module hosts the functions which move a photo to its destination folder
+"""
+import collections
+import errno
+import os
+import shutil
+import time
+
+# Transfer strategies, as they are recorded in the transfer report
+RENAME = "rename"
+COPY = "copy"
+
+# Buffer of the copy, when the kernel can't copy the file on its own
+COPY_BUFFER_SIZE = 8 * 2**20
+# Largest chunk which is handed to copy_file_range/sendfile in one call
+ZERO_COPY_CHUNK = 2**30
+# Errors which mean that a zero-copy call isn't supported for these files (and nothing was copied)
+UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF, errno.EPERM}
+
+# The outcome of a move: the strategy, the size of a copied photo (bytes) and the time it took (seconds)
+Transfer = collections.namedtuple("Transfer", ("strategy", "size", "seconds"))
+
+
+def mb_per_s(size:int, seconds:float)->float:
+    """Returns the throughput of a copy in MB/s.
+
+    :param size: bytes
+    :type size: int
+    :param seconds: duration
+    :type seconds: float
+
+    :return: MB/s (0 if no time was measured)
+    :rtype: float
+    |
+    """
+    return size / 2**20 / seconds if seconds > 0 else 0.0
+
+def device(path:str)->int:
+    """Returns the id of the file system (st_dev) on which a path is located.
+    The photos of the traversal (PhotoEntry) carry their stat data, so they are not stat'ed again.
+
+    :param path: path to a file or a directory
+    :type path: str
+
+    :return: the device id
+    :rtype: int
+    |
+    """
+    stat = getattr(path, "stat", None) or os.stat(path)
+    return stat.st_dev
+
+def _copy_file_range(source_fd:int, destination_fd:int, size:int)->int:
+    """Copies inside the kernel (no data passes through user space). Reflinks on file systems which support them.
+    |
+    """
+    copied = 0
+    while copied < size:
+        copied_now = os.copy_file_range(source_fd, destination_fd, min(size - copied, ZERO_COPY_CHUNK))
+        if copied_now == 0:
+            break
+        copied += copied_now
+    return copied
+
+def _sendfile(source_fd:int, destination_fd:int, size:int)->int:
+    """Copies inside the kernel with sendfile (file to file is supported by Linux).
+    |
+    """
+    offset = os.lseek(source_fd, 0, os.SEEK_CUR)
+    copied = 0
+    while copied < size:
+        copied_now = os.sendfile(destination_fd, source_fd, offset + copied, min(size - copied, ZERO_COPY_CHUNK))
+        if copied_now == 0:
+            break
+        copied += copied_now
+    # sendfile doesn't move the position of the source
+    os.lseek(source_fd, offset + copied, os.SEEK_SET)
+    return copied
+
+ZERO_COPY_FUNCTIONS = [function for name, function in (("copy_file_range", _copy_file_range), ("sendfile", _sendfile)) if hasattr(os, name)]
+
+def copy_contents(source_file, destination_file, size:int, buffer_size:int=COPY_BUFFER_SIZE)->int:
+    """Copies the contents of an open file to another. The kernel copies the file (copy_file_range or sendfile)
+    if it can, or else the file is copied through a large buffer.
+
+    :param source_file: unbuffered binary file, opened for reading
+    :type source_file: io.FileIO
+    :param destination_file: unbuffered binary file, opened for writing
+    :type destination_file: io.FileIO
+    :param size: number of bytes to copy, from the current position of the source file
+    :type size: int
+    :param buffer_size: size of the buffer of the fallback copy
+    :type buffer_size: int
+
+    :return: number of copied bytes
+    :rtype: int
+    |
+    """
+    copied = 0
+    positions = (source_file.tell(), destination_file.tell())
+    for zero_copy in ZERO_COPY_FUNCTIONS:
+        try:
+            copied = zero_copy(source_file.fileno(), destination_file.fileno(), size)
+            break
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_ERRNOS or (source_file.tell(), destination_file.tell()) != positions:
+                raise
+
+    # Whatever is left (e.g. a file system without zero-copy support or a file which grew)
+    buffer = memoryview(bytearray(buffer_size))
+    while True:
+        read = source_file.readinto(buffer)
+        if not read:
+            break
+        written = 0
+        while written < read:
+            written += destination_file.write(buffer[written:read])
+        copied += read
+    return copied
+
+def copy_file(source:str, destination:str, buffer_size:int=COPY_BUFFER_SIZE)->Transfer:
+    """Copies a photo (contents and metadata, like shutil.copy2) to another file system.
+    The destination is never overwritten and a partially written destination is removed, if the copy fails.
+    The data are flushed to the disk before the destination is closed.
+
+    :param source: path to photo
+    :type source: str
+    :param destination: path to the new file
+    :type destination: str
+    :param buffer_size: size of the buffer, when the kernel can't copy the file on its own
+    :type buffer_size: int
+
+    :return: the copy strategy, the copied bytes and the duration of the copy
+    :rtype: Transfer
+    |
+    """
+    started = time.perf_counter()
+    created = False
+    try:
+        with open(source, "rb", buffering=0) as source_file:
+            with open(destination, "xb", buffering=0) as destination_file:
+                created = True
+                size = copy_contents(source_file, destination_file, os.fstat(source_file.fileno()).st_size, buffer_size)
+                os.fsync(destination_file.fileno())
+        shutil.copystat(source, destination)
+    except BaseException:
+        if created and os.path.exists(destination):
+            os.remove(destination)
+        raise
+    return Transfer(COPY, size, time.perf_counter() - started)
+
+def resume_copy(source:str, destination:str, buffer_size:int=COPY_BUFFER_SIZE)->Transfer:
+    """Finishes an interrupted copy: the bytes which are missing from the end of the destination are appended.
+    A destination which is not shorter than the source is left as it is (see move_file for a fresh copy).
+
+    :param source: path to photo
+    :type source: str
+    :param destination: path to the partially copied file
+    :type destination: str
+    :param buffer_size: size of the buffer, when the kernel can't copy the file on its own
+    :type buffer_size: int
+
+    :return: the copy strategy, the appended bytes and the duration of the copy
+    :rtype: Transfer
+    |
+    """
+    started = time.perf_counter()
+    with open(source, "rb", buffering=0) as source_file:
+        with open(destination, "r+b", buffering=0) as destination_file:
+            offset = destination_file.seek(0, os.SEEK_END)
+            size = os.fstat(source_file.fileno()).st_size - offset
+            if size <= 0:
+                return Transfer(COPY, 0, time.perf_counter() - started)
+            source_file.seek(offset)
+            size = copy_contents(source_file, destination_file, size, buffer_size)
+            os.fsync(destination_file.fileno())
+    shutil.copystat(source, destination)
+    return Transfer(COPY, size, time.perf_counter() - started)
+
+def rename_no_clobber(source:str, destination:str):
+    """Renames a photo, but never over an existing file. The photo is hard linked to its new name
+    (which raises FileExistsError if the name is taken) and its old name is removed, so that no exists probe is needed.
+    On file systems without hard links (e.g. FAT memory cards) the name is checked before a plain rename.
+
+    :param source: path to photo
+    :type source: str
+    :param destination: path to the new file
+    :type destination: str
+    |
+    """
+    try:
+        os.link(source, destination)
+    except OSError as e:
+        if e.errno not in UNSUPPORTED_ERRNOS and e.errno != errno.EMLINK:
+            raise
+        # No hard links on this file system (or too many links to this photo)
+        if os.path.lexists(destination):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), destination)
+        os.rename(source, destination)
+        return
+    os.remove(source)
+
+def move_file(source:str, destination:str, same_device:bool=None, no_clobber:bool=False)->Transfer:
+    """Moves a photo. On the same file system the photo is renamed (atomic, no data is copied).
+    Across file systems it is copied and the source is removed after the copy is complete (and closed).
+
+    :param source: path to photo
+    :type source: str
+    :param destination: path to the new file
+    :type destination: str
+    :param same_device: whether source and destination are on the same file system (it is detected by st_dev if None)
+    :type same_device: bool
+    :param no_clobber: if True, a rename never replaces an existing destination (FileExistsError), as a copy never does
+    :type no_clobber: bool
+
+    :return: the strategy which was used (rename or copy), the copied bytes and the duration of the move
+    :rtype: Transfer
+    |
+    """
+    if same_device is None:
+        same_device = device(source) == device(os.path.dirname(destination) or os.curdir)
+    if same_device:
+        started = time.perf_counter()
+        if no_clobber:
+            rename_no_clobber(source, destination)
+        else:
+            os.rename(source, destination)
+        return Transfer(RENAME, 0, time.perf_counter() - started)
+    transfer = copy_file(source, destination)
+    os.remove(source)
+    return transfer
@@ -0,0 +1,179 @@
+""" This module hosts the FolderTree class
+"""
+import os
+
+
+class FolderNode:
+    """This class is used to represent a folder of the tree: its own photos and the totals of its subtree.
+    |
+    """
+    __slots__ = ("path", "parent", "children", "photos", "size", "total_photos", "total_size", "excluded_photos", "excluded")
+
+    def __init__(self, path:str, parent=None):
+        """Constructor method
+        |
+        """
+        self.path = path
+        self.parent = parent
+        # name --> FolderNode
+        self.children = {}
+        self.photos = 0
+        self.size = 0
+        self.total_photos = 0
+        self.total_size = 0
+        # photos of the subtree which are excluded
+        self.excluded_photos = 0
+        self.excluded = False
+
+
+class FolderTree:
+    """This class is used to represent the folders of the found photos as a hierarchy (under their common path),
+    for a folder browser which only shows the folders which are expanded or searched (e.g. a ttk.Treeview):
+    | 1) the number and the size of the photos of each subtree
+    | 2) the folders which are excluded, a whole subtree at once
+    | 3) an incremental search of the folders by name
+    The tree is built in one pass over photos_roots, the sizes are taken from the stat data of the traversal.
+
+    :param photos_roots: a dict with all the paths that contain photos
+    :type photos_roots: dict
+    |
+    """
+
+    def __init__(self, photos_roots:dict):
+        """Constructor method
+        |
+        """
+        self.photos_roots = photos_roots
+        self.root = FolderNode(os.path.commonpath(list(photos_roots)) if photos_roots else "")
+        self.nodes = {self.root.path: self.root}
+        self.__folders = sorted(photos_roots)
+        self.__last_search = (None, [])
+        for folder, photo_list in photos_roots.items():
+            node = self.__node(folder)
+            node.photos = len(photo_list)
+            node.size = sum((getattr(photo, "stat", None) or os.stat(photo)).st_size for photo in photo_list)
+            size = node.size
+            while node is not None:
+                node.total_photos += len(photo_list)
+                node.total_size += size
+                node = node.parent
+
+    def __node(self, folder:str)->FolderNode:
+        """Returns the node of a folder, the missing nodes between the folder and the root are created.
+        |
+        """
+        node = self.nodes.get(folder)
+        if node is None:
+            parent_path = os.path.dirname(folder)
+            # A folder outside of the common path (it can't happen for a traversal) hangs from the root
+            parent = self.root if parent_path == folder else self.__node(parent_path)
+            node = FolderNode(folder, parent)
+            parent.children[os.path.basename(folder)] = node
+            self.nodes[folder] = node
+        return node
+
+    def children(self, folder:str)->list:
+        """Returns the subfolders of a folder (e.g. when it's expanded), by name.
+
+        :param folder: path to the folder
+        :type folder: str
+
+        :return: paths of the subfolders
+        :rtype: list
+        |
+        """
+        node = self.nodes[folder]
+        return [node.children[name].path for name in sorted(node.children, key=str.lower)]
+
+    def state(self, folder:str)->str:
+        """Returns whether the photos of a subtree are included, excluded or partially excluded.
+
+        :param folder: path to the folder
+        :type folder: str
+
+        :return: "included", "excluded" or "partial"
+        :rtype: str
+        |
+        """
+        node = self.nodes[folder]
+        if not node.excluded_photos:
+            return "included"
+        if node.excluded_photos == node.total_photos:
+            return "excluded"
+        return "partial"
+
+    def set_included(self, folder:str, included:bool):
+        """Includes or excludes all the folders of a subtree.
+
+        :param folder: path to the root of the subtree
+        :type folder: str
+        :param included: whether the photos of the subtree will be moved
+        :type included: bool
+        |
+        """
+        top = self.nodes[folder]
+        excluded_photos = top.excluded_photos
+        stack = [top]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children.values())
+            if node.photos:
+                node.excluded = not included
+        self.__recount(top)
+        # The ancestors only change by the difference of the subtree
+        delta = top.excluded_photos - excluded_photos
+        node = top.parent
+        while node is not None:
+            node.excluded_photos += delta
+            node = node.parent
+
+    def __recount(self, top:FolderNode):
+        """Recounts the excluded photos of each folder of a subtree.
+        |
+        """
+        order = []
+        stack = [top]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(node.children.values())
+        for node in reversed(order):
+            node.excluded_photos = (node.photos if node.excluded else 0) + sum(child.excluded_photos for child in node.children.values())
+
+    def toggle(self, folder:str):
+        """Excludes a subtree which is (partially) included and includes a subtree which is excluded.
+
+        :param folder: path to the root of the subtree
+        :type folder: str
+        |
+        """
+        self.set_included(folder, self.state(folder) == "excluded")
+
+    def search(self, text:str, limit:int=None)->list:
+        """Returns the folders with photos whose path contains a text (case insensitive).
+        When the text extends the text of the previous search (e.g. one more typed letter), only the previous matches are searched.
+
+        :param text: the searched text
+        :type text: str
+        :param limit: the maximum number of returned folders (all of them if None)
+        :type limit: int
+
+        :return: paths of the matching folders, sorted
+        :rtype: list
+        |
+        """
+        text = text.lower()
+        last_text, last_matches = self.__last_search
+        candidates = last_matches if last_text is not None and text.startswith(last_text) else self.__folders
+        matches = [folder for folder in candidates if text in folder.lower()]
+        self.__last_search = (text, matches)
+        return matches if limit is None else matches[:limit]
+
+    def included_roots(self)->dict:
+        """Returns the photos of the folders which are included.
+
+        :return: a dict with all the included paths that contain photos
+        :rtype: dict
+        |
+        """
+        return {folder: photo_list for folder, photo_list in self.photos_roots.items() if not self.nodes[folder].excluded}
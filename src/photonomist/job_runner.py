@@ -0,0 +1,128 @@
+""" This module hosts the JobRunner class
+"""
+import queue
+import threading
+
+# Kinds of the events of a job
+PROGRESS = "progress"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+class JobControl:
+    """This class is used to represent the pause, resume and cancel requests of a job.
+    The job checks them at its file boundaries (see proceed), so a photo is never left half moved:
+    a paused job blocks before its next photo and a cancelled job does not start any other photo.
+    |
+    """
+
+    def __init__(self):
+        """Constructor method
+        |
+        """
+        self.__running = threading.Event()
+        self.__running.set()
+        self.__cancelled = threading.Event()
+
+    @property
+    def paused(self)->bool:
+        return not self.__running.is_set()
+
+    @property
+    def cancelled(self)->bool:
+        return self.__cancelled.is_set()
+
+    def pause(self):
+        self.__running.clear()
+
+    def resume(self):
+        self.__running.set()
+
+    def cancel(self):
+        self.__cancelled.set()
+        # A paused job wakes up to stop
+        self.__running.set()
+
+    def proceed(self)->bool:
+        """Called by the job before each unit of work (e.g. the move of a photo). It blocks while the job is paused.
+
+        :return: False if the job is cancelled
+        :rtype: bool
+        |
+        """
+        if not self.__running.is_set():
+            self.__running.wait()
+        return not self.__cancelled.is_set()
+
+
+class JobRunner:
+    """This class is used to represent a job (e.g. tidy_photos) which runs on a worker thread of a GUI.
+    The job gets a JobControl (control) and a progress sink (progress) as keyword arguments.
+    The worker never touches the GUI: its progress and its end (done, cancelled or failed, with the result or the exception)
+    are put in a queue, which the GUI thread drains (see poll), e.g. from a Tk after() callback.
+
+    :param function: the job
+    :type function: callable
+    |
+    """
+
+    def __init__(self, function, *args, **kwargs):
+        """Constructor method
+        |
+        """
+        self.__function = function
+        self.__args = args
+        self.__kwargs = kwargs
+        self.__thread = None
+        self.control = JobControl()
+        self.events = queue.Queue()
+
+    @property
+    def running(self)->bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def start(self):
+        """Starts the job on a (daemon) worker thread.
+        |
+        """
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def pause(self):
+        self.control.pause()
+
+    def resume(self):
+        self.control.resume()
+
+    def cancel(self):
+        self.control.cancel()
+
+    def join(self, timeout:float=None):
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+
+    def poll(self)->list:
+        """Drains the events of the job, without blocking.
+
+        :return: (kind, payload) of each event: (PROGRESS, ProgressEvent), (DONE, result), (CANCELLED, result) or (FAILED, exception)
+        :rtype: list
+        |
+        """
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def __run(self):
+        try:
+            result = self.__function(*self.__args, control=self.control, progress=self.__progress, **self.__kwargs)
+        except Exception as err:
+            self.events.put((FAILED, err))
+        else:
+            self.events.put((CANCELLED if self.control.cancelled else DONE, result))
+
+    def __progress(self, event):
+        self.events.put((PROGRESS, event))
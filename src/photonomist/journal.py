@@ -0,0 +1,238 @@
+""" This module hosts the TransferJournal class
+"""
+import json
+import os
+from file_transfer import move_file, resume_copy, Transfer, COPY
+from dedup import full_hash, LINK
+
+# Name of the journal when it is stored under the export path
+JOURNAL_FILE_NAME = ".photonomist_journal.jsonl"
+
+# Kinds of journal records
+RUN = "run" # the options of the run, so that it can be resumed
+MOVE = "move" # a move which is about to start
+DONE = "done" # a move (or link) which is complete
+SKIP = "skip" # a photo which was written in the not transferred report
+
+
+def default_journal_path(export_path:str)->str:
+    """Returns the default location of the journal (under the export path).
+
+    :param export_path: path to the directory where the photo folder structure will be created
+    :type export_path: str
+
+    :return: path to the journal
+    :rtype: str
+    |
+    """
+    return os.path.join(export_path, JOURNAL_FILE_NAME)
+
+def read_journal(journal_path:str)->list:
+    """Reads the records of a journal. A record which was cut short by a crash (the last line) is ignored.
+
+    :param journal_path: path to the journal
+    :type journal_path: str
+
+    :return: the records (dicts) in the order they were written
+    :rtype: list
+    |
+    """
+    records = []
+    with open(journal_path, "r", encoding="utf-8") as journal_file:
+        for line in journal_file:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+    return records
+
+def is_prefix(path:str, other_path:str, chunk_size:int=2**20)->bool:
+    """Checks if a file is byte by byte the beginning of another file (e.g. an interrupted copy).
+
+    :param path: path to the shorter file
+    :type path: str
+    :param other_path: path to the longer file
+    :type other_path: str
+    :param chunk_size: bytes which are compared at a time
+    :type chunk_size: int
+
+    :return: True if other_path starts with the contents of path
+    :rtype: bool
+    |
+    """
+    with open(path, "rb") as prefix_file, open(other_path, "rb") as other_file:
+        for chunk in iter(lambda: prefix_file.read(chunk_size), b""):
+            if other_file.read(len(chunk)) != chunk:
+                return False
+    return True
+
+
+class TransferJournal:
+    """This class is used to represent the write-ahead journal of a run (JSON lines, append only).
+    | 1) The moves and links of a batch are written (and fsynced) before any of them starts
+    | 2) The completed moves and the reported photos are written as they finish and fsynced in batches
+    | 3) The journal is removed when the run is complete
+
+    If a run is interrupted, the journal that is left behind tells which photos were already placed or reported,
+    which moves were in progress (see recover) and the options of the run (see run).
+
+    :param journal_path: path to the journal
+    :type journal_path: str
+    :param sync_every: number of records after which the journal is fsynced
+    :type sync_every: int
+    |
+    """
+
+    def __init__(self, journal_path:str, sync_every:int=1000):
+        """Constructor method
+        |
+        """
+        self.path = journal_path
+        self.sync_every = sync_every
+        self.run = {}
+        self.started = {}
+        self.finished = set()
+        if os.path.exists(journal_path):
+            for record in read_journal(journal_path):
+                if record["kind"] == RUN:
+                    self.run = record["options"]
+                elif record["kind"] == MOVE:
+                    self.started[record["source"]] = record
+                else:
+                    self.finished.add(record["source"])
+        self.__complete = False
+        self.__pending = 0
+        self.__file = open(journal_path, "a", encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __write(self, record:dict):
+        self.__file.write(json.dumps(record) + "\n")
+        self.__pending += 1
+
+    def begin(self, **options):
+        """Writes the options of the run (only once, a resumed run keeps the options of the first run).
+
+        :param options: JSON serializable options (e.g. photos_path, export_path, year, month, name_pattern)
+        :type options: dict
+        |
+        """
+        if not self.run:
+            self.run = options
+            self.__write({"kind": RUN, "options": options})
+            self.sync()
+
+    def plan(self, plan):
+        """Writes the moves and the links of a batch and fsyncs the journal, before they are applied.
+
+        :param plan: the plan of the batch
+        :type plan: TransferPlan
+        |
+        """
+        for move in plan.moves:
+            self.__write({"kind": MOVE, "source": move.source, "destination": plan.destination(move)})
+        for duplicate in plan.duplicates:
+            if duplicate.action == LINK:
+                self.__write({"kind": MOVE, "source": duplicate.source, "destination": plan.destination(duplicate), "original": duplicate.original})
+        self.sync()
+
+    def done(self, source:str):
+        """Writes a completed move or link.
+
+        :param source: path to photo (before the move)
+        :type source: str
+        |
+        """
+        self.__write({"kind": DONE, "source": source})
+        self.finished.add(source)
+        if self.__pending >= self.sync_every:
+            self.sync()
+
+    def skip(self, source:str):
+        """Writes a photo which was written in the not transferred report (it is not processed again by a resumed run).
+
+        :param source: path to photo
+        :type source: str
+        |
+        """
+        self.__write({"kind": SKIP, "source": source})
+        self.finished.add(source)
+        if self.__pending >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        """Flushes the written records to the disk.
+        |
+        """
+        if self.__pending:
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+            self.__pending = 0
+
+    def recover(self)->tuple:
+        """Finishes the moves and links which were started by an interrupted run but not recorded as done.
+        | 1) The source is gone and the destination exists: the move was complete
+        | 2) Both exist and they are identical: the copy was complete, the source is removed
+        | 3) The destination is the beginning of the source: the copy is finished (see resume_copy)
+        | 4) Only the source exists: the move (or link) is applied again
+        A destination which differs from its source in any other way was not written by the run, so it is left alone
+        and the photo is processed again by the resumed run.
+
+        :return: (source, destination, transfer) of each recovered move (transfer is None if the move was already complete)
+            and the sources which are missing
+        :rtype: tuple
+        |
+        """
+        transfers = []
+        missing = []
+        for source, record in self.started.items():
+            if source in self.finished:
+                continue
+            destination = record["destination"]
+            transfer = None
+            try:
+                if not os.path.exists(destination):
+                    if "original" in record:
+                        os.link(record["original"], destination)
+                        os.remove(source)
+                        transfer = Transfer(LINK, 0, 0)
+                    else:
+                        transfer = move_file(source, destination)
+                elif os.path.exists(source):
+                    if os.path.getsize(destination) < os.path.getsize(source) and is_prefix(destination, source):
+                        transfer = resume_copy(source, destination)
+                    elif os.path.getsize(destination) == os.path.getsize(source) and full_hash(source) == full_hash(destination):
+                        transfer = Transfer(LINK if "original" in record else COPY, 0, 0)
+                    else:
+                        raise FileExistsError(destination)
+                    if os.path.exists(source):
+                        os.remove(source)
+            except OSError:
+                if not os.path.exists(source):
+                    missing.append(source)
+                continue
+            transfers.append((source, destination, transfer))
+            self.done(source)
+        self.sync()
+        return transfers, missing
+
+    def complete(self):
+        """Marks the run as complete, so that the journal is removed when it is closed.
+        |
+        """
+        self.__complete = True
+
+    def close(self):
+        """Fsyncs and closes the journal. The journal of a complete run is removed.
+        |
+        """
+        if self.__file.closed:
+            return
+        self.sync()
+        self.__file.close()
+        if self.__complete:
+            os.remove(self.path)
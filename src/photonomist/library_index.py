@@ -0,0 +1,226 @@
+""" This module hosts the LibraryIndex class
+"""
+import os
+import sqlite3
+from traversal import is_photo
+from dedup import partial_hash, full_hash
+
+# Name of the index file when it is stored under the export path
+LIBRARY_INDEX_FILE_NAME = ".photonomist_library.sqlite"
+
+
+def default_library_index_path(export_path:str)->str:
+    """Returns the default location of the library index (under the export path).
+
+    :param export_path: path to the directory where the photo folder structure will be created
+    :type export_path: str
+
+    :return: path to the index file
+    :rtype: str
+    |
+    """
+    return os.path.join(export_path, LIBRARY_INDEX_FILE_NAME)
+
+
+class LibraryIndex:
+    """This class is used to represent a persistent (SQLite) content index of the photos under the export path.
+    Photos are indexed by (size, partial hash) --> full hash. The hashes are computed lazily, the first time
+    another photo with the same size (and partial hash) is looked up, so that the archive is never re-hashed as a whole.
+
+    The index is kept up to date by tidy_photos, as it places photos, and it can be reconciled with the archive
+    (see rebuild), which only looks at the files whose size or modification time changed.
+
+    :param index_path: path to the SQLite file
+    :type index_path: str
+    :param partial_size: bytes from the beginning and from the end of a photo for the partial hash
+    :type partial_size: int
+    |
+    """
+    # Pending writes are committed in batches
+    COMMIT_EVERY = 1000
+
+    def __init__(self, index_path:str, partial_size:int=64 * 2**10):
+        """Constructor method
+        |
+        """
+        self.path = index_path
+        self.partial_size = partial_size
+        self.hashed = 0
+        self.__pending = 0
+        self.__connection = sqlite3.connect(index_path, check_same_thread=False)
+        self.__connection.execute("""CREATE TABLE IF NOT EXISTS files (
+                                        path TEXT PRIMARY KEY,
+                                        size INTEGER NOT NULL,
+                                        mtime_ns INTEGER NOT NULL,
+                                        partial TEXT,
+                                        full TEXT)""")
+        # The lookups go by size and partial hash (the index also serves the lookups by size alone)
+        self.__connection.execute("DROP INDEX IF EXISTS files_size")
+        self.__connection.execute("CREATE INDEX IF NOT EXISTS files_size_partial ON files (size, partial)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self)->int:
+        return self.__connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def __write(self, statement:str, parameters:tuple):
+        """Executes a write statement. The transaction is committed every COMMIT_EVERY writes.
+        |
+        """
+        self.__connection.execute(statement, parameters)
+        self.__pending += 1
+        if self.__pending >= self.COMMIT_EVERY:
+            self.__connection.commit()
+            self.__pending = 0
+
+    def add(self, path:str, stat:os.stat_result=None, partial:str=None, full:str=None):
+        """Adds (or updates) a photo of the library.
+
+        :param path: path to photo
+        :type path: str
+        :param stat: stat result of the photo (it is stat'ed if None)
+        :type stat: os.stat_result
+        :param partial: partial hash, if it's already known
+        :type partial: str
+        :param full: full hash, if it's already known
+        :type full: str
+        |
+        """
+        stat = stat or os.stat(path)
+        self.__write("INSERT OR REPLACE INTO files (path, size, mtime_ns, partial, full) VALUES (?, ?, ?, ?, ?)",
+                     (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, partial, full))
+
+    def remove(self, path:str):
+        """Removes a photo from the index.
+
+        :param path: path to photo
+        :type path: str
+        |
+        """
+        self.__write("DELETE FROM files WHERE path = ?", (os.path.abspath(path),))
+
+    def __unchanged(self, path:str, size:int, mtime_ns:int)->bool:
+        """Returns whether a library photo is unchanged since it was indexed. The entry of a photo which changed
+        or was removed (e.g. by an undo) is dropped, so that it is never returned as an original.
+        |
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        if stat is None or (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+            self.remove(path)
+            return False
+        return True
+
+    def __store_hash(self, path:str, column:str, function)->str:
+        """Computes a hash of a library photo and stores it. None if the photo can't be read (its entry is dropped).
+        |
+        """
+        try:
+            digest = function(path)
+        except OSError:
+            self.remove(path)
+            return None
+        self.hashed += 1
+        self.__write(f"UPDATE files SET {column} = ? WHERE path = ?", (digest, path))
+        return digest
+
+    def find(self, path:str, size:int=None)->str:
+        """Looks up a photo which is byte-identical to the provided one, through the (size, partial hash) index:
+        | 1) a photo with a new size costs a single lookup
+        | 2) the library photos of the same size which were never hashed are (partially) hashed, once
+        | 3) only the library photos with the same size and partial hash are checked (stat) and compared by full hash,
+        | which is also computed once
+
+        :param path: path to the incoming photo
+        :type path: str
+        :param size: size of the incoming photo (it is stat'ed if None)
+        :type size: int
+
+        :return: path to the library photo or None
+        :rtype: str
+        |
+        """
+        if size is None:
+            size = (getattr(path, "stat", None) or os.stat(path)).st_size
+        if self.__connection.execute("SELECT 1 FROM files WHERE size = ? LIMIT 1", (size,)).fetchone() is None:
+            return None
+        source = os.path.abspath(path)
+
+        unhashed = self.__connection.execute("SELECT path, mtime_ns FROM files WHERE size = ? AND partial IS NULL", (size,)).fetchall()
+        for candidate, mtime_ns in unhashed:
+            if candidate != source and self.__unchanged(candidate, size, mtime_ns):
+                self.__store_hash(candidate, "partial", lambda photo: partial_hash(photo, self.partial_size))
+        incoming_partial = partial_hash(path, self.partial_size)
+        candidates = [row for row in self.__connection.execute("SELECT path, mtime_ns, full FROM files WHERE size = ? AND partial = ? ORDER BY path",
+                                                               (size, incoming_partial)) if row[0] != source]
+        if not candidates:
+            return None
+
+        incoming_full = full_hash(path)
+        for candidate, mtime_ns, full in candidates:
+            if not self.__unchanged(candidate, size, mtime_ns):
+                continue
+            if full is None:
+                full = self.__store_hash(candidate, "full", full_hash)
+            if full == incoming_full:
+                return candidate
+        return None
+
+    def rebuild(self, export_path:str)->dict:
+        """Reconciles the index with the photos under the export path. New photos are added, photos whose
+        size or modification time changed are re-indexed (their hashes are dropped) and missing photos are removed.
+        Unchanged photos are not touched.
+
+        :param export_path: path to the directory where the photo folder structure was created
+        :type export_path: str
+
+        :return: the number of added, updated, removed and unchanged photos
+        :rtype: dict
+        |
+        """
+        counts = dict.fromkeys(("added", "updated", "removed", "unchanged"), 0)
+        indexed = {row[0]: (row[1], row[2]) for row in self.__connection.execute("SELECT path, size, mtime_ns FROM files")}
+        directories = [os.path.abspath(export_path)]
+        while directories:
+            directory = directories.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    entries = list(entries)
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(entry.path)
+                        continue
+                    if not (is_photo(entry.name) and entry.is_file(follow_symlinks=False)):
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                known = indexed.pop(entry.path, None)
+                if known == (stat.st_size, stat.st_mtime_ns):
+                    counts["unchanged"] += 1
+                    continue
+                self.add(entry.path, stat)
+                counts["updated" if known else "added"] += 1
+        for path in indexed:
+            self.remove(path)
+            counts["removed"] += 1
+        self.__connection.commit()
+        return counts
+
+    def close(self):
+        """Commits and closes the index (once).
+        |
+        """
+        if self.__connection is not None:
+            self.__connection.commit()
+            self.__connection.close()
+            self.__connection = None
@@ -0,0 +1,230 @@
+""" This module hosts the MoveManifest class and the undo of a run
+"""
+import collections
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unplaced_report import UnplacedReport
+from file_transfer import move_file, device
+
+# Folder (under the export path) with one manifest per run
+MANIFEST_DIR_NAME = ".photonomist_manifests"
+
+# Outcomes of the undo of a move
+UNDONE = "undone"
+CHANGED = "changed" # the photo was modified (or replaced) after the run, it is left where it is
+MISSING = "missing" # the photo is not at its final path anymore
+OCCUPIED = "occupied" # another file took the original path of the photo
+
+
+def new_manifest_path(export_path:str)->str:
+    """Returns a new (not existing) manifest path for a run, under the export path.
+
+    :param export_path: path to the directory where the photo folder structure will be created
+    :type export_path: str
+
+    :return: path to the manifest
+    :rtype: str
+    |
+    """
+    manifest_dir = os.path.join(export_path, MANIFEST_DIR_NAME)
+    name = time.strftime("run_%Y%m%d_%H%M%S")
+    for counter in itertools.count():
+        manifest_path = os.path.join(manifest_dir, f"{name}_{counter}.csv" if counter else f"{name}.csv")
+        if not os.path.exists(manifest_path):
+            return manifest_path
+
+def latest_manifest_path(export_path:str)->str:
+    """Returns the manifest of the last run under the export path.
+
+    :param export_path: path to the directory where the photo folder structure was created
+    :type export_path: str
+
+    :return: path to the manifest or None, if no run left a manifest
+    :rtype: str
+    |
+    """
+    manifest_dir = os.path.join(export_path, MANIFEST_DIR_NAME)
+    try:
+        manifests = [entry for entry in os.scandir(manifest_dir) if entry.is_file() and entry.name.endswith(".csv")]
+    except FileNotFoundError:
+        return None
+    if not manifests:
+        return None
+    return max(manifests, key=lambda entry: (entry.stat().st_mtime_ns, entry.name)).path
+
+
+class MoveManifest(UnplacedReport):
+    """This class is used to represent the manifest of a run: the original path, the final path
+    and the size and modification time (ns) of each placed photo, as it was placed.
+    It is buffered and written like the UnplacedReport (CSV), so a run with many moves writes it in a few appends.
+    A run can be reversed from its manifest (see undo_run).
+
+    :param report_path: path to the manifest
+    :type report_path: str
+    :param buffer_size: number of entries which are kept in memory before they are written
+    :type buffer_size: int
+    |
+    """
+    FIELDS = ("source", "destination", "size", "mtime_ns")
+
+    def add(self, photo_path:str, destination:str="", stat:os.stat_result=None):
+        """Adds a placed photo to the manifest.
+
+        :param photo_path: path to photo (before the move)
+        :type photo_path: str
+        :param destination: path to photo (after the move)
+        :type destination: str
+        :param stat: stat result of the placed photo (it is stat'ed if None)
+        :type stat: os.stat_result
+        |
+        """
+        stat = stat or os.stat(destination)
+        self.add_entry((photo_path, destination, stat.st_size, stat.st_mtime_ns))
+
+    def flush(self):
+        """Appends the buffered entries to the manifest (its folder is created the first time).
+        |
+        """
+        if self.count:
+            os.makedirs(os.path.dirname(self.path) or os.curdir, exist_ok=True)
+        super().flush()
+
+
+def read_manifest(manifest_path:str, batch_size:int=10000):
+    """Reads a manifest in batches, so that the manifest of a big run is never loaded as a whole.
+
+    :param manifest_path: path to the manifest
+    :type manifest_path: str
+    :param batch_size: number of entries in a batch
+    :type batch_size: int
+
+    :return: lists of (source, destination, size, mtime_ns)
+    :rtype: generator
+    |
+    """
+    with open(manifest_path, "r", newline="", encoding="utf-8") as manifest_file:
+        rows = csv.reader(manifest_file)
+        next(rows, None)
+        while True:
+            batch = [(source, destination, int(size), int(mtime_ns)) for source, destination, size, mtime_ns in itertools.islice(rows, batch_size)]
+            if not batch:
+                return
+            yield batch
+
+def undo_move(source:str, destination:str, size:int, mtime_ns:int, same_device:bool=None, created:set=None)->str:
+    """Moves a placed photo back to its original path, if it hasn't changed since it was placed.
+    The original folder is only created (if it is gone) when the photo is actually moved back.
+
+    :param source: the original path of the photo
+    :type source: str
+    :param destination: the final path of the photo
+    :type destination: str
+    :param size: size of the photo when it was placed
+    :type size: int
+    :param mtime_ns: modification time of the photo when it was placed
+    :type mtime_ns: int
+    :param same_device: whether the two paths are on the same file system (detected by st_dev if None)
+    :type same_device: bool
+    :param created: the original folders which are known to exist (the original folder is created if it's not one of them)
+    :type created: set
+
+    :return: the outcome (undone, changed, missing or occupied)
+    :rtype: str
+    |
+    """
+    try:
+        stat = os.stat(destination)
+    except FileNotFoundError:
+        return MISSING
+    if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+        return CHANGED
+    if os.path.lexists(source):
+        return OCCUPIED
+    source_folder = os.path.dirname(source)
+    if created is not None and source_folder not in created:
+        os.makedirs(source_folder, exist_ok=True)
+        created.add(source_folder)
+    try:
+        move_file(destination, source, same_device=same_device)
+    except FileExistsError:
+        return OCCUPIED
+    return UNDONE
+
+def undo_moves(moves:list, created:set)->list:
+    """Undoes the moves of a destination folder, one after the other. The original folders are created
+    (once each) if they are gone and a photo is moved back there, and the file system of each original folder is looked up once.
+
+    :param moves: (source, destination, size, mtime_ns) of moves from the same destination folder
+    :type moves: list
+    :param created: the original folders which are known to exist (shared by the workers)
+    :type created: set
+
+    :return: the outcome of each move
+    :rtype: list
+    |
+    """
+    try:
+        folder_device = device(os.path.dirname(moves[0][1]))
+    except FileNotFoundError:
+        # The whole folder is gone
+        return [MISSING] * len(moves)
+    source_devices = {}
+    outcomes = []
+    for source, destination, size, mtime_ns in moves:
+        source_folder = os.path.dirname(source)
+        # The file system of an original folder is detected by the first move back (the folder may not exist yet)
+        same_device = source_devices[source_folder] == folder_device if source_folder in source_devices else None
+        outcome = undo_move(source, destination, size, mtime_ns, same_device=same_device, created=created)
+        if outcome == UNDONE and source_folder not in source_devices:
+            source_devices[source_folder] = device(source_folder)
+        outcomes.append(outcome)
+    return outcomes
+
+def undo_run(manifest_path:str, jobs:int=4, batch_size:int=10000, report:UnplacedReport=None)->collections.Counter:
+    """Reverses a run from its manifest:
+    | 1) The manifest is read in batches and the moves of each batch are grouped by destination folder
+    | 2) The folders are undone in parallel (over a bounded thread pool). A photo which changed since the run, which is gone
+    | or whose original path is taken is left where it is (and written in the report, if one is provided)
+    | 3) The destination folders which are left empty are removed at the end, in one pass
+
+    :param manifest_path: path to the manifest of the run
+    :type manifest_path: str
+    :param jobs: number of parallel workers
+    :type jobs: int
+    :param batch_size: number of manifest entries which are undone together
+    :type batch_size: int
+    :param report: a report of the photos which were not moved back (source = final path, reason = outcome, detail = original path)
+    :type report: UnplacedReport
+
+    :return: the number of photos of each outcome and of the removed folders
+    :rtype: collections.Counter
+    |
+    """
+    counts = collections.Counter()
+    created = set()
+    folders = set()
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for batch in read_manifest(manifest_path, batch_size):
+            folders_moves = collections.OrderedDict()
+            for move in batch:
+                folders_moves.setdefault(os.path.dirname(move[1]), []).append(move)
+            folders.update(folders_moves)
+            # list() re-raises the first exception of the workers (if any)
+            for moves, outcomes in zip(folders_moves.values(), list(pool.map(undo_moves, folders_moves.values(), itertools.repeat(created)))):
+                counts.update(outcomes)
+                if report is not None:
+                    for (source, destination, _, _), outcome in zip(moves, outcomes):
+                        if outcome != UNDONE:
+                            report.add(destination, outcome, source)
+
+    # The deepest folders first, so that a parent which is left empty is removed too
+    for folder in sorted(folders, key=lambda folder: folder.count(os.sep), reverse=True):
+        try:
+            os.rmdir(folder)
+            counts["folders"] += 1
+        except OSError:
+            pass
+    return counts
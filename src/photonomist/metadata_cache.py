@@ -0,0 +1,160 @@
+""" This module hosts the MetadataCache class
+"""
+import json
+import os
+import sqlite3
+import time
+
+# Name of the cache file when it is stored under the export path
+CACHE_FILE_NAME = ".photonomist_cache.sqlite"
+
+
+def default_cache_path(export_path:str)->str:
+    """Returns the default location of the metadata cache (under the export path).
+
+    :param export_path: path to the directory where the photo folder structure will be created
+    :type export_path: str
+
+    :return: path to the cache file
+    :rtype: str
+    |
+    """
+    return os.path.join(export_path, CACHE_FILE_NAME)
+
+
+class MetadataCache:
+    """This class is used to represent a persistent (SQLite) cache of photos' projected metadata.
+    Entries are keyed by the file identity (device and inode or, if the filesystem doesn't provide one, the path)
+    and they are only valid as long as the size and the modification time (in ns) of the file don't change.
+    Keying by inode means that an entry survives the move of a photo within the same filesystem.
+
+    When the cache is closed, the least recently used entries above max_entries are evicted.
+
+    :param cache_path: path to the SQLite file
+    :type cache_path: str
+    :param max_entries: maximum number of entries which are kept
+    :type max_entries: int
+    |
+    """
+    # Pending writes are committed in batches
+    COMMIT_EVERY = 1000
+
+    def __init__(self, cache_path:str, max_entries:int=1000000):
+        """Constructor method
+        |
+        """
+        self.path = cache_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.__pending = 0
+        self.__now = int(time.time())
+        self.__connection = sqlite3.connect(cache_path, check_same_thread=False)
+        self.__connection.execute("""CREATE TABLE IF NOT EXISTS photos (
+                                        key TEXT PRIMARY KEY,
+                                        size INTEGER NOT NULL,
+                                        mtime_ns INTEGER NOT NULL,
+                                        metadata TEXT NOT NULL,
+                                        accessed INTEGER NOT NULL)""")
+        self.__connection.execute("CREATE INDEX IF NOT EXISTS photos_accessed ON photos (accessed)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @staticmethod
+    def __stat(photo_path:str, stat:os.stat_result)->os.stat_result:
+        """Returns the stat result of a photo. The photos of the traversal (PhotoEntry) carry
+        the stat data of their scan, so the photo is only stat'ed if nothing is known about it.
+        |
+        """
+        return stat or getattr(photo_path, "stat", None) or os.stat(photo_path)
+
+    def __key(self, photo_path:str, stat:os.stat_result)->str:
+        """Returns the identity of a file.
+
+        :param photo_path: path to photo
+        :type photo_path: str
+        :param stat: stat result of the photo
+        :type stat: os.stat_result
+
+        :return: cache key
+        :rtype: str
+        |
+        """
+        if stat.st_ino:
+            return f"{stat.st_dev}:{stat.st_ino}"
+        return os.path.abspath(photo_path)
+
+    def get(self, photo_path:str, stat:os.stat_result=None)->dict:
+        """Returns the cached metadata of a photo, if the photo hasn't changed since it was cached.
+
+        :param photo_path: path to photo
+        :type photo_path: str
+        :param stat: stat result of the photo (if it's already known, the photo is not stat'ed again)
+        :type stat: os.stat_result
+
+        :return: the projected metadata or None
+        :rtype: dict
+        |
+        """
+        try:
+            stat = self.__stat(photo_path, stat)
+        except OSError:
+            self.misses += 1
+            return None
+        key = self.__key(photo_path, stat)
+        row = self.__connection.execute("SELECT size, mtime_ns, metadata FROM photos WHERE key = ?", (key,)).fetchone()
+        if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__write("UPDATE photos SET accessed = ? WHERE key = ?", (self.__now, key))
+        return json.loads(row[2])
+
+    def put(self, photo_path:str, metadata:dict, stat:os.stat_result=None):
+        """Stores the projected metadata of a photo.
+
+        :param photo_path: path to photo
+        :type photo_path: str
+        :param metadata: the projected metadata
+        :type metadata: dict
+        :param stat: stat result of the photo (if it's already known, the photo is not stat'ed again)
+        :type stat: os.stat_result
+        |
+        """
+        try:
+            stat = self.__stat(photo_path, stat)
+        except OSError:
+            return
+        self.__write("INSERT OR REPLACE INTO photos (key, size, mtime_ns, metadata, accessed) VALUES (?, ?, ?, ?, ?)",
+                     (self.__key(photo_path, stat), stat.st_size, stat.st_mtime_ns, json.dumps(metadata), self.__now))
+
+    def __write(self, statement:str, parameters:tuple):
+        """Executes a write statement. The transaction is committed every COMMIT_EVERY writes.
+        |
+        """
+        self.__connection.execute(statement, parameters)
+        self.__pending += 1
+        if self.__pending >= self.COMMIT_EVERY:
+            self.__connection.commit()
+            self.__pending = 0
+
+    def evict(self):
+        """Deletes the least recently used entries, so that at most max_entries are kept.
+        |
+        """
+        count = self.__connection.execute("SELECT COUNT(*) FROM photos").fetchone()[0]
+        if count > self.max_entries:
+            self.__connection.execute("DELETE FROM photos WHERE key IN (SELECT key FROM photos ORDER BY accessed LIMIT ?)",
+                                      (count - self.max_entries,))
+
+    def close(self):
+        """Evicts the surplus entries, commits and closes the cache.
+        |
+        """
+        self.evict()
+        self.__connection.commit()
+        self.__connection.close()
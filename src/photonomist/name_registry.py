@@ -0,0 +1,76 @@
+""" This module hosts the NameRegistry class
+"""
+import os
+import threading
+
+
+class NameRegistry:
+    """This class is used to represent the file names which are taken in the destination folders.
+    Each folder is listed once, the first time a name is asked for it. After that, unique names
+    are handed out from memory: *name.ext, name(1).ext, name(2).ext, ..* without probing the file system.
+
+    The next free counter of each name is remembered, so importing many cards with the same file names
+    into the same folder doesn't retry the counters which were already handed out.
+    The registry is shared by the workers which move photos in parallel, so it is guarded by a lock.
+    |
+    """
+
+    def __init__(self):
+        """Constructor method
+        |
+        """
+        self.__lock = threading.Lock()
+        self.__taken = {}
+        self.__counters = {}
+
+    @staticmethod
+    def __folder_key(folder_path:str)->str:
+        return os.path.normcase(os.path.abspath(folder_path))
+
+    def __taken_names(self, folder_key:str)->set:
+        """Returns the names which are taken in a folder. An existing folder is listed the first time it's needed.
+        Names are compared with os.path.normcase (case insensitive on Windows, like the file system).
+        |
+        """
+        if folder_key not in self.__taken:
+            try:
+                self.__taken[folder_key] = {os.path.normcase(name) for name in os.listdir(folder_key)}
+            except (FileNotFoundError, NotADirectoryError):
+                self.__taken[folder_key] = set()
+        return self.__taken[folder_key]
+
+    def add_folder(self, folder_path:str):
+        """Registers a folder which doesn't exist yet (it is not listed).
+
+        :param folder_path: path to the folder
+        :type folder_path: str
+        |
+        """
+        with self.__lock:
+            self.__taken.setdefault(self.__folder_key(folder_path), set())
+
+    def reserve(self, folder_path:str, file_name:str)->str:
+        """Returns a name which isn't taken in the folder and marks it as taken.
+
+        :param folder_path: path to the destination folder
+        :type folder_path: str
+        :param file_name: the wanted name
+        :type file_name: str
+
+        :return: file_name or, if it is taken, file_name with a set of parentheses with a number
+        :rtype: str
+        |
+        """
+        folder_key = self.__folder_key(folder_path)
+        with self.__lock:
+            taken = self.__taken_names(folder_key)
+            if os.path.normcase(file_name) in taken:
+                name, extension = os.path.splitext(file_name)
+                counter_key = (folder_key, os.path.normcase(file_name))
+                counter = self.__counters.get(counter_key, 1)
+                while os.path.normcase(f"{name}({counter}){extension}") in taken:
+                    counter += 1
+                self.__counters[counter_key] = counter + 1
+                file_name = f"{name}({counter}){extension}"
+            taken.add(os.path.normcase(file_name))
+            return file_name
@@ -1,8 +1,12 @@
 """ This module hosts the Photo class 
 """
 import exifread
-import os, shutil
+import os
 import re 
+from fast_exif import read_exif_tags, ExifError, NoExifError
+from unplaced_report import UNREADABLE, CORRUPT, PERMISSION
+from name_registry import NameRegistry
+from file_transfer import move_file
 
 class Photo:
     """This class is used to represent a photo.
@@ -11,15 +15,34 @@ class Photo:
 
     :param photo_path: Path to photo
     :type photo_path: str
+    :param metadata: already extracted metadata (e.g. by a worker process). If given, the photo is not read again.
+    :type metadata: dict
+    :param cache: persistent metadata cache which is consulted before opening the photo
+    :type cache: MetadataCache
+    :param read_error: reason code of a failed read (together with already extracted metadata)
+    :type read_error: str
     |
     """
+    # Metadata keys which are sent back from the worker processes of tidy_photos and stored in the metadata cache
+    PROJECTED_TAGS = ("DateTimeOriginal", "Model", "ExifImageWidth", "ExifImageLength")
 
-    def __init__(self, photo_path:str):
+    def __init__(self, photo_path:str, metadata:dict=None, cache=None, read_error:str=None):
         """Constructor method
         |
         """
         self.path = photo_path
-        self.__metadata_dict()
+        # None or the reason code (unreadable, corrupt, permission) of a failed read
+        self.read_error = read_error
+        if metadata is None and cache is not None:
+            metadata = cache.get(photo_path)
+
+        if metadata is not None:
+            self.metadata = metadata
+        else:
+            self.__metadata_dict()
+            # Failed reads are not cached, so that they are retried in the next run
+            if cache is not None and self.read_error is None:
+                cache.put(photo_path, self.projection())
     
     def __str__(self)->str:
         """Returns the name of the photo.
@@ -38,14 +61,40 @@ class Photo:
         """
         self.__tags = {}
         try:
-            photo_file = open(self.path, 'rb')
-            # details=False --> Faster Processing: Don’t process makernote tags, don’t extract the thumbnail image (if any).
-            self.__tags = exifread.process_file(photo_file, details=False)
+            with open(self.path, 'rb') as photo_file:
+                # details=False --> Faster Processing: Don’t process makernote tags, don’t extract the thumbnail image (if any).
+                self.__tags = exifread.process_file(photo_file, details=False)
         except: #TODO Log it
             print("I didn't manage to extract photo's tags!")
+            if self.read_error is None:
+                self.read_error = CORRUPT
+
+    def __extract_fast_tags(self)->dict:
+        """Extracts only the projected tags using the bounded-read reader of the fast_exif module.
+        It reads the JPEG APP1 segment or the TIFF IFD0/Exif sub-IFD chain instead of the whole file.
+
+        :return: the projected tags, an empty dict if the photo has no EXIF data or can't be opened,
+            or None if the fast reader failed (e.g. an unsupported format), so that exifread has to be tried
+        :rtype: dict
+        |
+        """
+        try:
+            return read_exif_tags(self.path, self.PROJECTED_TAGS)
+        except PermissionError:
+            self.read_error = PERMISSION
+        except OSError:
+            self.read_error = UNREADABLE
+        except NoExifError:
+            # The photo was parsed to its image data, exifread wouldn't find anything either
+            pass
+        except ExifError:
+            self.read_error = CORRUPT
+            return None
+        return {}
 
     def __metadata_dict(self):
-        """Populates the metadata dictionary with all key/tags (extracted using the 
+        """Populates the metadata dictionary. The fast reader is tried first and, only if it fails
+        (e.g. an unsupported format or a structure it doesn't handle), it falls back to all key/tags (extracted using the 
         `exifread <https://exif-py.readthedocs.io/en/latest/>`_ library) that contain values.
         It also avoids duplicate keys with different tags:
 
@@ -54,6 +103,10 @@ class Photo:
         | *EXIF DateTimeOriginal, value 2019:12:14 15:04:33*
         |
         """
+        self.metadata = self.__extract_fast_tags()
+        if self.metadata is not None:
+            return
+
         self.__extract_exif_tags()
         self.metadata = {}
         
@@ -66,6 +119,20 @@ class Photo:
                 if (len(str(self.__tags[tag_key]))>0) and (key_no_tag not in self.metadata):
                     self.metadata[key_no_tag] = self.__tags[tag_key]
 
+        if "DateTimeOriginal" in self.metadata:
+            # exifread managed where the fast reader failed
+            self.read_error = None
+
+    def projection(self)->dict:
+        """Returns the part of the metadata that photonomist actually uses, with plain string values.
+        Unlike the exifread tags, it is cheap to pickle and send from a worker process back to the main one.
+
+        :return: the projected metadata
+        :rtype: dict
+        |
+        """
+        return {tag: str(self.metadata[tag]) for tag in self.PROJECTED_TAGS if tag in self.metadata}
+
     def get_date(self, year:bool=False, month:bool=False)->str:
         """Returns the date of a photo from the metadata dictionary. 
         As date considered the value of the "DateTimeOriginal" tag. 
@@ -146,46 +213,67 @@ class Photo:
         return filepath + f"({counter})" + extension
 
 
-    def check_same_name(self, new_path:str):
+    def check_same_name(self, new_path:str, registry:NameRegistry=None):
         """Checks if the photo which is being transfered already exists in the destination folder.
+        If a name registry is provided, the name is reserved in the registry without probing the file system.
 
         :param new_path: the path to the destination folder together with photo's name
         :type new_path: str
+        :param registry: the taken names of the destination folders
+        :type registry: NameRegistry
 
         :return: the path to the destination folder together with photo's name and a set of parentheses with a number (if this photo already exists)
         :rtype: str
         |
         """
+        if registry is not None:
+            new_folder_path, file_name = os.path.split(new_path)
+            return os.path.join(new_folder_path, registry.reserve(new_folder_path, file_name))
+
+        filepath, file_extension = os.path.splitext(new_path)
         counter = 1
         while os.path.exists(new_path):
-            filepath, file_extension = os.path.splitext(new_path)
-            if counter >= 2:
-                matches_list = self.find_parentheses_numbers(new_path)
-                new_path = self.construct_new_photo_path(new_path[:matches_list[-1][0]], counter, file_extension)
-            else:
-                new_path = self.construct_new_photo_path(filepath, counter, file_extension)
+            new_path = self.construct_new_photo_path(filepath, counter, file_extension)
             counter += 1
         return new_path
     
-    def move_to_folder(self, new_folder_path:str):
+    def move_to_folder(self, new_folder_path:str, file_name:str=None, registry:NameRegistry=None, same_device:bool=None):
         """If a photo's path is different than the destination path, moves the photo to the destination folder.
         If directory doesn't exist it creates one.
+        The photo is renamed, if the destination folder is on the same file system, or else it is copied (see file_transfer).
+        A file is never overwritten: if the name was taken after it was decided (e.g. a file was added to the folder
+        after it was listed by the registry), the next free name is decided and the move is retried.
 
         :param new_folder_path: the path to directory
         :type new_folder_path: str
+        :param file_name: the (planned) name of the photo in the destination folder, which is already reserved. Photo's name by default.
+        :type file_name: str
+        :param registry: the taken names of the destination folders (see check_same_name)
+        :type registry: NameRegistry
+        :param same_device: whether the photo and the destination folder are on the same file system (detected by st_dev if None)
+        :type same_device: bool
+
+        :return: the transfer strategy (rename or copy), size and duration or None, if the photo is already in the destination folder
+        :rtype: Transfer
         |
         """
-        new_path = os.path.join(new_folder_path, self.__str__())        
-        try:
-            if self.path != new_path:
-                new_path = self.check_same_name(new_path)
-                shutil.move(self.path, new_path)
-        except:
-            os.makedirs(new_folder_path)
-            shutil.move(self.path, new_path)
-        finally:
-            self.path = new_path
-
+        new_path = os.path.join(new_folder_path, file_name or self.__str__())
+        transfer = None
+        if self.path != new_path:
+            if file_name is None:
+                new_path = self.check_same_name(new_path, registry)
+            while transfer is None:
+                try:
+                    transfer = move_file(self.path, new_path, same_device, no_clobber=True)
+                except FileNotFoundError:
+                    if os.path.isdir(new_folder_path):
+                        raise
+                    os.makedirs(new_folder_path, exist_ok=True)
+                except FileExistsError:
+                    # The next name is counted from the photo's name (not from the taken name)
+                    new_path = self.check_same_name(os.path.join(new_folder_path, self.__str__()), registry)
+        self.path = new_path
+        return transfer
 
 if __name__ == "__main__":
     #pass
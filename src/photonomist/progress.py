@@ -0,0 +1,157 @@
+""" This module hosts the ProgressTracker class
+"""
+import collections
+import threading
+import time
+
+# Weight of the latest throughput in the moving average of the rate
+SMOOTHING = 0.3
+
+
+class ProgressEvent(collections.namedtuple("ProgressEvent", ("files", "total", "bytes", "rate", "byte_rate", "eta", "failures", "last_failure", "done"))):
+    """This class is used to represent the progress of a run at a point in time.
+
+    :param files: number of photos which are done (moved, linked, skipped or failed)
+    :type files: int
+    :param total: number of photos of the run (None if it is not known, e.g. for a stream of photos)
+    :type total: int
+    :param bytes: bytes of the moved photos
+    :type bytes: int
+    :param rate: photos per second (moving average)
+    :type rate: float
+    :param byte_rate: bytes per second (moving average)
+    :type byte_rate: float
+    :param eta: seconds till the end of the run (None if the total or the rate is not known)
+    :type eta: float
+    :param failures: number of photos which could not be placed
+    :type failures: int
+    :param last_failure: (photo, reason) of the latest failure or None
+    :type last_failure: tuple
+    :param done: whether it is the last event of the run
+    :type done: bool
+    |
+    """
+    __slots__ = ()
+
+    def describe(self)->str:
+        """Returns a one line description of the progress (e.g. for a status bar).
+
+        :return: the description
+        :rtype: str
+        |
+        """
+        description = f"{self.files}/{self.total} photos" if self.total is not None else f"{self.files} photos"
+        description += f", {self.bytes / 2**20:.1f} MB, {self.rate:.0f} photos/s ({self.byte_rate / 2**20:.1f} MB/s)"
+        if self.eta is not None and not self.done:
+            description += f", {int(self.eta) // 60}:{int(self.eta) % 60:02d} left"
+        if self.failures:
+            description += f", {self.failures} not placed"
+        return description
+
+
+class ProgressTracker:
+    """This class is used to represent the progress of a run which is sent to a sink (e.g. a front end).
+    The photos are counted as they are done (by any worker), but an event is only sent every interval seconds
+    (and once at the end), so counting a photo costs a lock and a clock read, whatever the number of photos.
+
+    The rate is a moving average of the throughput between two events, so the ETA follows the changes of speed
+    (e.g. from renames to copies to another disk) without jumping at every event.
+
+    :param sink: a callable which takes a ProgressEvent or a queue (anything with put_nowait, e.g. for a GUI thread)
+    :type sink: callable
+    :param total: number of photos of the run (None if it is not known yet)
+    :type total: int
+    :param interval: minimum number of seconds between two events
+    :type interval: float
+    |
+    """
+
+    def __init__(self, sink, total:int=None, interval:float=0.25):
+        """Constructor method
+        |
+        """
+        self.__emit = getattr(sink, "put_nowait", sink)
+        self.total = total
+        self.interval = interval
+        self.files = 0
+        self.bytes = 0
+        self.failures = 0
+        self.last_failure = None
+        self.rate = 0.0
+        self.byte_rate = 0.0
+        self.__lock = threading.Lock()
+        self.__last = (time.monotonic(), 0, 0)
+        self.__next = self.__last[0] + interval
+
+    def advance(self, files:int=1, size:int=0):
+        """Counts photos which are done.
+
+        :param files: number of photos
+        :type files: int
+        :param size: their bytes
+        :type size: int
+        |
+        """
+        with self.__lock:
+            self.files += files
+            self.bytes += size
+            now = time.monotonic()
+            if now < self.__next:
+                return
+            event = self.__event(now)
+        self.__emit(event)
+
+    def add_transfer(self, source:str, transfer):
+        """Counts a moved photo. The size of a rename is taken from the stat data of the traversal (if there are any).
+
+        :param source: path to photo (before the move)
+        :type source: str
+        :param transfer: the transfer of the photo
+        :type transfer: Transfer
+        |
+        """
+        stat = getattr(source, "stat", None)
+        self.advance(1, transfer.size or (stat.st_size if stat is not None else 0))
+
+    def fail(self, source:str, reason:str):
+        """Counts a photo which could not be placed.
+
+        :param source: path to photo
+        :type source: str
+        :param reason: reason code (e.g. no_exif, unreadable)
+        :type reason: str
+        |
+        """
+        with self.__lock:
+            self.failures += 1
+            self.last_failure = (source, reason)
+        self.advance()
+
+    def finish(self):
+        """Sends the last event of the run.
+        |
+        """
+        with self.__lock:
+            event = self.__event(time.monotonic(), done=True)
+        self.__emit(event)
+
+    def __event(self, now:float, done:bool=False)->ProgressEvent:
+        """Updates the moving averages and builds an event (the lock is held).
+        |
+        """
+        last_time, last_files, last_bytes = self.__last
+        elapsed = now - last_time
+        if elapsed > 0:
+            rate = (self.files - last_files) / elapsed
+            byte_rate = (self.bytes - last_bytes) / elapsed
+            if self.rate or self.byte_rate:
+                rate = SMOOTHING * rate + (1 - SMOOTHING) * self.rate
+                byte_rate = SMOOTHING * byte_rate + (1 - SMOOTHING) * self.byte_rate
+            self.rate, self.byte_rate = rate, byte_rate
+        self.__last = (now, self.files, self.bytes)
+        self.__next = now + self.interval
+        eta = None
+        if self.total is not None and self.rate > 0:
+            eta = max(0, self.total - self.files) / self.rate
+        return ProgressEvent(self.files, self.total, self.bytes, self.rate, self.byte_rate, eta,
+                             self.failures, self.last_failure, done)
@@ -0,0 +1,202 @@
+""" This module hosts the RunMetrics class
+"""
+import collections
+import contextlib
+import json
+import math
+import os
+import threading
+import time
+
+# Percentiles of the latency histograms in the report
+PERCENTILES = (50, 90, 99)
+
+
+class LatencyHistogram:
+    """This class is used to represent the per-file latencies of a stage (e.g. the EXIF extraction of each photo).
+    The latencies are counted in buckets of powers of two microseconds (1us, 2us, 4us, .. ), so a histogram has
+    a few dozen buckets whatever the number of photos and its percentiles are accurate up to a factor of two.
+    |
+    """
+
+    def __init__(self):
+        """Constructor method
+        |
+        """
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        # upper bound of the bucket in microseconds --> number of latencies
+        self.buckets = collections.Counter()
+
+    def add(self, seconds:float):
+        """Adds a latency.
+
+        :param seconds: the latency in seconds
+        :type seconds: float
+        |
+        """
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+        microseconds = seconds * 1e6
+        self.buckets[2 ** max(0, math.ceil(math.log2(microseconds))) if microseconds > 1 else 1] += 1
+
+    def percentile(self, percent:float)->float:
+        """Returns the upper bound (in seconds) of the bucket of a percentile.
+
+        :param percent: the percentile (e.g. 99)
+        :type percent: float
+
+        :return: the latency in seconds (0 if the histogram is empty)
+        :rtype: float
+        |
+        """
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for upper_bound in sorted(self.buckets):
+            seen += self.buckets[upper_bound]
+            if seen >= rank:
+                return min(upper_bound / 1e6, self.max)
+        return self.max
+
+    def to_dict(self)->dict:
+        histogram = {"count": self.count, "total": self.total, "min": self.min or 0.0, "max": self.max or 0.0,
+                     "mean": self.total / self.count if self.count else 0.0}
+        histogram.update({f"p{percent}": self.percentile(percent) for percent in PERCENTILES})
+        histogram["buckets_us"] = {str(upper_bound): self.buckets[upper_bound] for upper_bound in sorted(self.buckets)}
+        return histogram
+
+
+class RunMetrics:
+    """This class is used to represent the instrumentation of a run:
+    | 1) the wall time and the number of calls of each stage (traversal, EXIF extraction, planning, moves, ..)
+    | 2) a latency histogram per stage for the stages which are timed photo by photo
+    | 3) counters of photos, bytes, cache hits and file system calls which were avoided (e.g. stats served by the traversal)
+    The metrics are shared by the workers of a run, so they are guarded by a lock.
+    The report is written as JSON (see write) and summarized in a few lines (see summary).
+    |
+    """
+
+    def __init__(self):
+        """Constructor method
+        |
+        """
+        self.__lock = threading.Lock()
+        self.started = time.time()
+        # stage --> [seconds, calls]
+        self.stages = collections.OrderedDict()
+        self.latencies = collections.OrderedDict()
+        self.counters = collections.Counter()
+
+    @contextlib.contextmanager
+    def stage(self, name:str):
+        """Times a stage (a context manager). A stage which runs more than once (e.g. once per batch) is accumulated.
+
+        :param name: name of the stage
+        :type name: str
+        |
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start)
+
+    def add_stage(self, name:str, seconds:float, calls:int=1):
+        """Adds the duration of a stage which was timed elsewhere.
+
+        :param name: name of the stage
+        :type name: str
+        :param seconds: the duration in seconds
+        :type seconds: float
+        :param calls: number of times the stage ran
+        :type calls: int
+        |
+        """
+        with self.__lock:
+            timing = self.stages.setdefault(name, [0.0, 0])
+            timing[0] += seconds
+            timing[1] += calls
+
+    def observe(self, name:str, seconds:float):
+        """Adds the latency of a photo to the histogram of a stage.
+
+        :param name: name of the stage
+        :type name: str
+        :param seconds: the latency in seconds
+        :type seconds: float
+        |
+        """
+        with self.__lock:
+            if name not in self.latencies:
+                self.latencies[name] = LatencyHistogram()
+            self.latencies[name].add(seconds)
+
+    def count(self, name:str, value:int=1):
+        """Increments a counter.
+
+        :param name: name of the counter (counters of avoided file system calls start with "avoided_")
+        :type name: str
+        :param value: the increment (a counter which is never incremented is left out of the report)
+        :type value: int
+        |
+        """
+        if not value:
+            return
+        with self.__lock:
+            self.counters[name] += value
+
+    def to_dict(self)->dict:
+        with self.__lock:
+            return {"started": self.started,
+                    "seconds": time.time() - self.started,
+                    "stages": {name: {"seconds": seconds, "calls": calls} for name, (seconds, calls) in self.stages.items()},
+                    "latencies": {name: histogram.to_dict() for name, histogram in self.latencies.items()},
+                    "counters": dict(sorted(self.counters.items()))}
+
+    def write(self, report_path:str):
+        """Writes the report as JSON.
+
+        :param report_path: path to the .json report
+        :type report_path: str
+        |
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+        with open(report_path, "w", encoding="utf-8") as report_file:
+            json.dump(self.to_dict(), report_file, indent=2)
+
+    def summary(self)->list:
+        """Summarizes the report: the stages from the slowest to the fastest, the latencies and the counters.
+
+        :return: lines of the summary
+        :rtype: list
+        |
+        """
+        report = self.to_dict()
+        lines = [f"run: {report['seconds']:.3f}s"]
+        for name, timing in sorted(report["stages"].items(), key=lambda item: item[1]["seconds"], reverse=True):
+            lines.append(f"stage {name}: {timing['seconds']:.3f}s in {timing['calls']} call(s)")
+        for name, histogram in report["latencies"].items():
+            lines.append(f"latency {name}: {histogram['count']} photos, mean {histogram['mean'] * 1e3:.3f}ms, "
+                         + ", ".join(f"p{percent} {histogram[f'p{percent}'] * 1e3:.3f}ms" for percent in PERCENTILES)
+                         + f", max {histogram['max'] * 1e3:.3f}ms")
+        avoided = sum(value for name, value in report["counters"].items() if name.startswith("avoided_"))
+        if report["counters"]:
+            lines.append("counters: " + ", ".join(f"{name} {value}" for name, value in report["counters"].items()))
+            lines.append(f"file system calls avoided: {avoided}")
+        return lines
+
+    def log_summary(self, logger):
+        """Logs the summary (info level).
+
+        :param logger: the application logger (core.logger)
+        :type logger: logging.Logger
+        |
+        """
+        for line in self.summary():
+            logger.info(line)
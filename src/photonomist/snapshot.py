@@ -0,0 +1,124 @@
+""" This module hosts the TreeSnapshot class
+"""
+import json
+import os
+import sqlite3
+
+# Name of the snapshot file when it is stored under the export path
+SNAPSHOT_FILE_NAME = ".photonomist_snapshot.sqlite"
+
+
+def default_snapshot_path(export_path:str)->str:
+    """Returns the default location of the snapshot of the input paths (under the export path).
+
+    :param export_path: path to the directory where the photo folder structure will be created
+    :type export_path: str
+
+    :return: path to the snapshot file
+    :rtype: str
+    |
+    """
+    return os.path.join(export_path, SNAPSHOT_FILE_NAME)
+
+
+class TreeSnapshot:
+    """This class is used to represent the directories of the input paths, as they were found by the last run:
+    the modification time (ns) and the subdirectories of each directory.
+
+    A directory's modification time changes when an entry is added to it, removed or renamed, so a directory
+    whose modification time is the same as in the snapshot has the same photos as in the last run and it doesn't
+    have to be listed again. Its subdirectories are taken from the snapshot and only stat'ed
+    (see traversal.iter_photos), so an unchanged tree costs one stat per directory and no listing at all.
+
+    The directories which are found by a run are only saved (see save) when the run is complete,
+    so that an interrupted run lists them again.
+
+    :param snapshot_path: path to the SQLite file
+    :type snapshot_path: str
+    |
+    """
+
+    def __init__(self, snapshot_path:str):
+        """Constructor method
+        |
+        """
+        self.path = snapshot_path
+        self.listed = 0
+        self.skipped = 0
+        self.__connection = sqlite3.connect(snapshot_path, check_same_thread=False)
+        self.__connection.execute("""CREATE TABLE IF NOT EXISTS directories (
+                                        path TEXT PRIMARY KEY,
+                                        mtime_ns INTEGER NOT NULL,
+                                        subdirectories TEXT NOT NULL)""")
+        self.__previous = {path: (mtime_ns, subdirectories) for path, mtime_ns, subdirectories
+                           in self.__connection.execute("SELECT path, mtime_ns, subdirectories FROM directories")}
+        self.__current = {}
+        self.__roots = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def add_root(self, path:str):
+        """Registers an input path which is traversed by this run. The directories of the last run
+        under it which are not found again are dropped by save.
+
+        :param path: path to photos
+        :type path: str
+        |
+        """
+        self.__roots.add(os.path.abspath(path))
+
+    def unchanged(self, path:str, mtime_ns:int)->list:
+        """Looks up a directory. If it hasn't changed since the last run, it is recorded for the next run as well.
+
+        :param path: path to the directory
+        :type path: str
+        :param mtime_ns: the current modification time of the directory
+        :type mtime_ns: int
+
+        :return: the paths of its subdirectories, if it hasn't changed, or else None (it has to be listed)
+        :rtype: list
+        |
+        """
+        key = os.path.abspath(path)
+        previous = self.__previous.get(key)
+        if previous is None or previous[0] != mtime_ns:
+            self.listed += 1
+            return None
+        self.skipped += 1
+        self.__current[key] = previous
+        return [os.path.join(path, name) for name in json.loads(previous[1])]
+
+    def add(self, path:str, mtime_ns:int, subdirectories:list):
+        """Records a directory which was listed by this run.
+
+        :param path: path to the directory
+        :type path: str
+        :param mtime_ns: the modification time of the directory before it was listed
+        :type mtime_ns: int
+        :param subdirectories: paths of its subdirectories
+        :type subdirectories: list
+        |
+        """
+        self.__current[os.path.abspath(path)] = (mtime_ns, json.dumps([os.path.basename(subdirectory) for subdirectory in subdirectories]))
+
+    def save(self):
+        """Replaces the directories of the traversed input paths with the ones which were found by this run.
+        |
+        """
+        with self.__connection:
+            for root in self.__roots:
+                self.__connection.execute("DELETE FROM directories WHERE path = ? OR substr(path, 1, ?) = ?",
+                                          (root, len(root) + 1, os.path.join(root, "")))
+            self.__connection.executemany("INSERT OR REPLACE INTO directories (path, mtime_ns, subdirectories) VALUES (?, ?, ?)",
+                                          ((path, mtime_ns, subdirectories) for path, (mtime_ns, subdirectories) in self.__current.items()))
+        self.__previous.update(self.__current)
+
+    def close(self):
+        """Closes the snapshot (what was not saved is discarded).
+        |
+        """
+        self.__connection.close()
@@ -0,0 +1,230 @@
+""" This module hosts the TransferPlan class
+"""
+import collections
+import csv
+import json
+import os
+from name_registry import NameRegistry
+from file_transfer import mb_per_s
+
+# A planned move: source path --> destination folder (name under the export path) --> final file name
+Move = collections.namedtuple("Move", ("source", "folder", "file_name"))
+# A photo that can't be placed and the reason code (see unplaced_report)
+Unplaced = collections.namedtuple("Unplaced", ("source", "reason"))
+# A planned move whose photo is byte-identical to another (original) photo and what to do with it (see dedup)
+Duplicate = collections.namedtuple("Duplicate", ("source", "folder", "file_name", "original", "action"))
+
+
+class TransferPlan:
+    """This class is used to represent the full plan of a photonomist run, before anything is touched on disk.
+    It holds the folders that will be created, the moves (with the final, collision free, file names),
+    the photos that can't be placed and the duplicates.
+
+    The final file names are decided here, by a NameRegistry. Each destination folder is listed (once) and the names
+    that the plan hands out are remembered, so no file system probing is needed for the collisions.
+
+    A plan can be built and executed in batches (see drain), while the names and the counts
+    of the whole run are kept.
+
+    :param export_path: path to the directory where the photo folder structure will be created
+    :type export_path: str
+    |
+    """
+
+    def __init__(self, export_path:str):
+        """Constructor method
+        |
+        """
+        self.export_path = export_path
+        self.folders = []
+        self.moves = []
+        self.unplaced = []
+        self.duplicates = []
+        self.counts = collections.Counter()
+        self.names = NameRegistry()
+        self.__drained = (0, 0, 0, 0)
+
+    def __len__(self)->int:
+        return len(self.moves) + len(self.unplaced) + len(self.duplicates)
+
+    def add_folder(self, folder:str):
+        """Registers a folder which will be created by the executor.
+
+        :param folder: name of the folder under the export path
+        :type folder: str
+        |
+        """
+        self.folders.append(folder)
+        self.counts["folders"] += 1
+        self.names.add_folder(os.path.join(self.export_path, folder))
+
+    def add_move(self, source:str, folder:str)->Move:
+        """Plans the move of a photo to a folder and decides its final name.
+        The naming follows Photo.check_same_name: *name.ext, name(1).ext, name(2).ext, ..*
+
+        :param source: path to photo
+        :type source: str
+        :param folder: name of the destination folder under the export path
+        :type folder: str
+
+        :return: the planned move or None, if the photo is already in the destination folder (it is counted as organized)
+        :rtype: Move
+        |
+        """
+        folder_path = os.path.join(self.export_path, folder)
+        if os.path.dirname(os.path.abspath(source)) == os.path.abspath(folder_path):
+            self.counts["organized"] += 1
+            return None
+
+        file_name = self.names.reserve(folder_path, os.path.basename(source))
+        move = Move(source, folder, file_name)
+        self.moves.append(move)
+        self.counts["moves"] += 1
+        return move
+
+    def add_unplaced(self, source:str, reason:str):
+        """Registers a photo that can't be placed (it has no date).
+
+        :param source: path to photo
+        :type source: str
+        :param reason: reason code (no_exif, unreadable, corrupt, permission)
+        :type reason: str
+        |
+        """
+        self.unplaced.append(Unplaced(source, reason))
+        self.counts["unplaced"] += 1
+
+    def pending_moves(self)->list:
+        """Returns the moves which were added since the last drain.
+        |
+        """
+        return self.moves[self.__drained[1]:]
+
+    def add_duplicates(self, originals:dict, action:str):
+        """Registers the pending moves of duplicate photos and removes them from the moves
+        (a skipped or reported duplicate stays where it is, a linked one is linked by the executor).
+
+        :param originals: the pending moves of duplicates --> path to the original photo
+        :type originals: dict
+        :param action: what will be done with the duplicates (skip, link or report)
+        :type action: str
+        |
+        """
+        if not originals:
+            return
+        pending = self.__drained[1]
+        for move in self.moves[pending:]:
+            if move in originals:
+                self.duplicates.append(Duplicate(*move, originals[move], action))
+                self.counts["duplicates"] += 1
+        self.moves[pending:] = [move for move in self.moves[pending:] if move not in originals]
+        self.counts["moves"] -= len(originals)
+
+    def drain(self, keep:bool=True):
+        """Returns a plan with the folders, moves, unplaced photos and duplicates which were added since the last drain,
+        so that they can be executed while the rest of the plan is still being built.
+
+        :param keep: if False, the drained items are removed from this plan (the memory stays flat)
+        :type keep: bool
+
+        :return: the new part of the plan
+        :rtype: TransferPlan
+        |
+        """
+        folders, moves, unplaced, duplicates = self.__drained
+        batch = TransferPlan(self.export_path)
+        batch.folders = self.folders[folders:]
+        batch.moves = self.moves[moves:]
+        batch.unplaced = self.unplaced[unplaced:]
+        batch.duplicates = self.duplicates[duplicates:]
+        if keep:
+            self.__drained = (len(self.folders), len(self.moves), len(self.unplaced), len(self.duplicates))
+        else:
+            self.folders, self.moves, self.unplaced, self.duplicates = [], [], [], []
+        return batch
+
+    def destination(self, move:Move)->str:
+        """Returns the final path of a planned move.
+
+        :param move: a planned move
+        :type move: Move
+
+        :return: path to the destination file
+        :rtype: str
+        |
+        """
+        return os.path.join(self.export_path, move.folder, move.file_name)
+
+    def to_dict(self)->dict:
+        """Returns the plan as a JSON serializable dict.
+        |
+        """
+        return {
+            "export_path": self.export_path,
+            "folders": list(self.folders),
+            "moves": [dict(move._asdict(), destination=self.destination(move)) for move in self.moves],
+            "unplaced": [unplaced._asdict() for unplaced in self.unplaced],
+            "duplicates": [duplicate._asdict() for duplicate in self.duplicates],
+        }
+
+    def write(self, plan_path:str):
+        """Writes the plan to a .json or a .csv file (according to the extension of plan_path).
+
+        :param plan_path: path to the plan file
+        :type plan_path: str
+        |
+        """
+        if plan_path.lower().endswith(".csv"):
+            with open(plan_path, "w", newline="", encoding="utf-8") as plan_file:
+                writer = csv.writer(plan_file)
+                writer.writerow(("action", "source", "folder", "file_name", "destination", "reason", "original"))
+                for folder in self.folders:
+                    writer.writerow(("mkdir", "", folder, "", os.path.join(self.export_path, folder), "", ""))
+                for move in self.moves:
+                    writer.writerow(("move",) + tuple(move) + (self.destination(move), "", ""))
+                for unplaced in self.unplaced:
+                    writer.writerow(("unplaced", unplaced.source, "", "", "", unplaced.reason, ""))
+                for duplicate in self.duplicates:
+                    writer.writerow(("duplicate", duplicate.source, duplicate.folder, duplicate.file_name,
+                                     os.path.join(self.export_path, duplicate.folder, duplicate.file_name), duplicate.action, duplicate.original))
+        else:
+            with open(plan_path, "w", encoding="utf-8") as plan_file:
+                json.dump(self.to_dict(), plan_file, indent=1)
+
+    @classmethod
+    def load(cls, plan_path:str):
+        """Reads a plan which was written as .json.
+
+        :param plan_path: path to the plan file
+        :type plan_path: str
+
+        :return: the plan
+        :rtype: TransferPlan
+        |
+        """
+        with open(plan_path, "r", encoding="utf-8") as plan_file:
+            data = json.load(plan_file)
+        plan = cls(data["export_path"])
+        plan.folders = data["folders"]
+        plan.moves = [Move(move["source"], move["folder"], move["file_name"]) for move in data["moves"]]
+        plan.unplaced = [Unplaced(unplaced["source"], unplaced["reason"]) for unplaced in data["unplaced"]]
+        plan.duplicates = [Duplicate(**duplicate) for duplicate in data.get("duplicates", [])]
+        plan.counts.update(folders=len(plan.folders), moves=len(plan.moves), unplaced=len(plan.unplaced), duplicates=len(plan.duplicates))
+        return plan
+
+    def summary(self)->str:
+        """Returns a one line description of the plan.
+        |
+        """
+        summary = f"{self.counts['moves']} photos will be moved, {self.counts['folders']} folders will be created and {self.counts['unplaced']} photos can't be placed."
+        if self.counts["duplicates"]:
+            summary += f" {self.counts['duplicates']} photos are duplicates."
+        return summary
+
+    def copy_summary(self)->str:
+        """Returns a one line description of the copies to another disk (after the plan was executed).
+        The speed is the aggregate of the copies: copied bytes over the time that was spent copying.
+        |
+        """
+        copied_mb = self.counts["copied_bytes"] / 2**20
+        return f"{self.counts['copy']} photos ({copied_mb:.0f} MB) were copied to another disk at {mb_per_s(self.counts['copied_bytes'], self.counts['copy_seconds']):.1f} MB/s."
@@ -0,0 +1,52 @@
+""" This module hosts the TransferReport class
+"""
+import os
+from unplaced_report import UnplacedReport
+from file_transfer import mb_per_s, COPY
+
+# Name of the report when it is stored under the export path
+TRANSFER_REPORT_FILE_NAME = "transferred.csv"
+
+
+def default_transfer_report_path(export_path:str)->str:
+    """Returns the default location of the transferred photos report (under the export path).
+
+    :param export_path: path to the directory where the photo folder structure will be created
+    :type export_path: str
+
+    :return: path to the report
+    :rtype: str
+    |
+    """
+    return os.path.join(export_path, TRANSFER_REPORT_FILE_NAME)
+
+
+class TransferReport(UnplacedReport):
+    """This class is used to represent the report of the photos that were transferred.
+    Each entry holds the source, the destination and the strategy (rename or copy) of a move
+    and, for the copies, the size and the speed (MB/s).
+    It is buffered and written like the UnplacedReport (CSV or, if report_path ends with .jsonl, JSON lines).
+
+    :param report_path: path to the report
+    :type report_path: str
+    :param buffer_size: number of entries which are kept in memory before they are written
+    :type buffer_size: int
+    |
+    """
+    FIELDS = ("source", "destination", "strategy", "size", "mb_per_s")
+
+    def add(self, photo_path:str, destination:str="", transfer=None):
+        """Adds a moved photo to the report.
+
+        :param photo_path: path to photo (before the move)
+        :type photo_path: str
+        :param destination: path to photo (after the move)
+        :type destination: str
+        :param transfer: strategy (rename or copy), size and duration of the move
+        :type transfer: file_transfer.Transfer
+        |
+        """
+        if transfer is not None and transfer.strategy == COPY:
+            self.add_entry((photo_path, destination, transfer.strategy, transfer.size, f"{mb_per_s(transfer.size, transfer.seconds):.1f}"))
+        else:
+            self.add_entry((photo_path, destination, transfer.strategy if transfer else "", "", ""))
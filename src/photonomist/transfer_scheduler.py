@@ -0,0 +1,196 @@
+""" This module hosts the TransferScheduler class
+"""
+import collections
+import threading
+import time
+from concurrent.futures import Future
+
+# A snapshot of the scheduler: time since start, waiting and running transfers, bytes in flight and the throughput so far
+Sample = collections.namedtuple("Sample", ("seconds", "queued", "running", "bytes_in_flight", "mb_per_s"))
+
+# A waiting transfer
+Job = collections.namedtuple("Job", ("function", "args", "size", "devices", "future"))
+
+
+class TransferScheduler:
+    """This class is used to represent a bounded pool of transfer workers.
+    Copies (transfers with a size) are limited by:
+    | 1) the number of workers
+    | 2) the bytes in flight, so that a lot of big files don't flood the page cache
+    | 3) the number of copies per source and per destination device, so that a slow card reader
+    | only holds back its own copies and not those of the other devices.
+
+    Transfers wait in one queue per (source, destination) device pair and the workers pick, round robin,
+    the first queue whose devices are not busy. A transfer without a size (a rename) only waits for a worker.
+
+    The queue depth and the throughput are sampled over time (see samples).
+
+    :param max_transfers: number of workers
+    :type max_transfers: int
+    :param max_bytes_in_flight: upper limit of the bytes which are copied at the same time. A bigger file is copied alone.
+    :type max_bytes_in_flight: int
+    :param device_transfers: number of copies which may read from (or write to) the same device at the same time
+    :type device_transfers: int
+    :param sample_interval: minimum number of seconds between two samples
+    :type sample_interval: float
+    |
+    """
+
+    def __init__(self, max_transfers:int=4, max_bytes_in_flight:int=512 * 2**20, device_transfers:int=2, sample_interval:float=1.0):
+        """Constructor method
+        |
+        """
+        self.max_transfers = max(1, max_transfers)
+        self.max_bytes_in_flight = max_bytes_in_flight
+        self.device_transfers = max(1, device_transfers)
+        self.sample_interval = sample_interval
+        self.samples = []
+        self.transferred_bytes = 0
+        self.transfers = 0
+
+        self.__condition = threading.Condition()
+        self.__queues = collections.OrderedDict()
+        self.__queued = 0
+        self.__running = 0
+        self.__bytes_in_flight = 0
+        self.__busy_devices = collections.Counter()
+        self.__closed = False
+        self.__started = time.perf_counter()
+        self.__finished = None
+        self.__last_sample = None
+        self.__workers = [threading.Thread(target=self.__work, name=f"photonomist-transfer-{i}", daemon=True) for i in range(self.max_transfers)]
+        for worker in self.__workers:
+            worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def submit(self, function, *args, size:int=0, source_device:int=None, destination_device:int=None)->Future:
+        """Queues a transfer.
+
+        :param function: the transfer, which is called with args
+        :type function: callable
+        :param size: bytes which will be copied (0 for a rename, which isn't limited by the devices or the bytes in flight)
+        :type size: int
+        :param source_device: id (st_dev) of the source device
+        :type source_device: int
+        :param destination_device: id (st_dev) of the destination device
+        :type destination_device: int
+
+        :return: the future result of the transfer
+        :rtype: concurrent.futures.Future
+        |
+        """
+        devices = (source_device, destination_device) if size else ()
+        job = Job(function, args, size, devices, Future())
+        with self.__condition:
+            if self.__closed:
+                raise RuntimeError("The transfer scheduler is closed")
+            self.__queues.setdefault(devices, collections.deque()).append(job)
+            self.__queued += 1
+            self.__condition.notify()
+        return job.future
+
+    def __runnable(self, job:Job)->bool:
+        """Checks if a transfer can start without exceeding the limits.
+        |
+        """
+        if any(self.__busy_devices[device] >= self.device_transfers for device in set(job.devices)):
+            return False
+        return not job.size or not self.__bytes_in_flight or self.__bytes_in_flight + job.size <= self.max_bytes_in_flight
+
+    def __next_job(self)->Job:
+        """Removes and returns the first transfer which can start (None, if they all have to wait).
+        The queue of the picked transfer moves to the end, so that the device pairs take turns.
+        |
+        """
+        for devices, queue in self.__queues.items():
+            if self.__runnable(queue[0]):
+                job = queue.popleft()
+                if queue:
+                    self.__queues.move_to_end(devices)
+                else:
+                    del self.__queues[devices]
+                return job
+        return None
+
+    def __work(self):
+        """The loop of a worker.
+        |
+        """
+        while True:
+            with self.__condition:
+                job = self.__next_job()
+                while job is None:
+                    if self.__closed and not self.__queued:
+                        return
+                    self.__condition.wait()
+                    job = self.__next_job()
+                self.__queued -= 1
+                self.__running += 1
+                self.__bytes_in_flight += job.size
+                self.__busy_devices.update(set(job.devices))
+
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    job.future.set_result(job.function(*job.args))
+                except BaseException as e:
+                    job.future.set_exception(e)
+
+            with self.__condition:
+                self.__running -= 1
+                self.__bytes_in_flight -= job.size
+                self.__busy_devices.subtract(set(job.devices))
+                self.transferred_bytes += job.size
+                self.transfers += 1
+                self.__sample()
+                self.__condition.notify_all()
+
+    def __sample(self, force:bool=False):
+        """Records the queue depth and the throughput, at most once every sample_interval.
+        |
+        """
+        now = time.perf_counter() - self.__started
+        if force or self.__last_sample is None or now - self.__last_sample >= self.sample_interval:
+            self.__last_sample = now
+            self.samples.append(Sample(now, self.__queued, self.__running, self.__bytes_in_flight, self.mb_per_s(now)))
+
+    def mb_per_s(self, seconds:float=None)->float:
+        """Returns the throughput (MB/s) of the copies since the scheduler started.
+        |
+        """
+        if seconds is None:
+            seconds = (self.__finished or time.perf_counter()) - self.__started
+        return self.transferred_bytes / 2**20 / seconds if seconds > 0 else 0.0
+
+    def wait(self):
+        """Blocks until all the queued transfers are done.
+        |
+        """
+        with self.__condition:
+            while self.__queued or self.__running:
+                self.__condition.wait()
+
+    def close(self):
+        """Waits for the queued transfers and stops the workers.
+        |
+        """
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+        for worker in self.__workers:
+            worker.join()
+        with self.__condition:
+            if self.__finished is None:
+                self.__finished = time.perf_counter()
+                self.__sample(force=True)
+
+    def summary(self)->str:
+        """Returns a one line description of the transfers.
+        |
+        """
+        max_queued = max((sample.queued for sample in self.samples), default=0)
+        return f"{self.transfers} transfers, {self.transferred_bytes / 2**20:.0f} MB copied at {self.mb_per_s():.1f} MB/s (up to {max_queued} queued)."
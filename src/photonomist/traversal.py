@@ -0,0 +1,254 @@
+""" This module hosts the streaming traversal of the input path
+"""
+import collections
+import os
+import queue
+import threading
+
+# Photos are identified by the (lower case) ending of their names
+PHOTO_EXTENSIONS = ("jpg", "jpeg", "nef", "cr2")
+
+
+class PhotoEntry(str):
+    """This class is used to represent a photo found by the traversal.
+    It is a path (str), so it can be used wherever a photo path is expected,
+    which also carries the stat data of the os.scandir DirEntry that it came from.
+
+    :param path: path to photo
+    :type path: str
+    :param stat: stat result of the photo
+    :type stat: os.stat_result
+    |
+    """
+
+    def __new__(cls, path:str, stat:os.stat_result=None):
+        entry = super(PhotoEntry, cls).__new__(cls, path)
+        entry.stat = stat
+        return entry
+
+    @property
+    def size(self)->int:
+        """Size of the photo in bytes
+        |
+        """
+        return self.stat.st_size
+
+    @property
+    def mtime_ns(self)->int:
+        """Modification time of the photo in ns
+        |
+        """
+        return self.stat.st_mtime_ns
+
+
+def is_photo(file_name:str)->bool:
+    """Checks if a file is a .jpg, .jpeg, .nef or .cr2 photo
+
+    :param file_name: name of the file
+    :type file_name: str
+    |
+    """
+    return file_name.lower().endswith(PHOTO_EXTENSIONS)
+
+
+def list_directory(directory:str):
+    """Lists a directory with os.scandir. The entries are sorted, so that the order is the same in every run.
+
+    :param directory: path to the directory
+    :type directory: str
+
+    :return: (subdirectories, photos) of the directory or None if it can't be listed
+    :rtype: tuple
+    |
+    """
+    try:
+        with os.scandir(directory) as scanner:
+            entries = sorted(scanner, key=lambda entry: entry.name)
+    except OSError:
+        return None
+
+    subdirectories = []
+    photos = []
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+            elif is_photo(entry.name) and entry.is_file():
+                photos.append(PhotoEntry(entry.path, entry.stat()))
+        except OSError:
+            continue
+    return subdirectories, photos
+
+
+def iter_photos(photos_path:str, snapshot=None):
+    """Recursively traverses all the directories under the provided path with os.scandir,
+    top-down like os.walk, and yields the photos as soon as they are found.
+    The entries of each directory are sorted, so that the order is the same in every run.
+    Directories which can't be listed are skipped (like os.walk does).
+
+    If a snapshot of the last run is provided, the directories which haven't changed since (same modification time)
+    are not listed: their photos are skipped and their subdirectories are taken from the snapshot.
+    The directories which are listed are recorded in the snapshot.
+
+    :param photos_path: path to photos
+    :type photos_path: str
+    :param snapshot: the directories of the last run (incremental traversal)
+    :type snapshot: TreeSnapshot
+
+    :return: the photos
+    :rtype: generator of PhotoEntry
+    |
+    """
+    if snapshot is not None:
+        snapshot.add_root(photos_path)
+    directories = [photos_path]
+    while directories:
+        directory = directories.pop()
+        if snapshot is not None:
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            subdirectories = snapshot.unchanged(directory, mtime_ns)
+            if subdirectories is not None:
+                directories.extend(reversed(subdirectories))
+                continue
+        listing = list_directory(directory)
+        if listing is None:
+            continue
+        subdirectories, photos = listing
+        yield from photos
+        if snapshot is not None:
+            snapshot.add(directory, mtime_ns, subdirectories)
+        # Reversed, so that they are popped in order
+        directories.extend(reversed(subdirectories))
+
+
+def stream_photos(photos_path:str, maxsize:int=10000, snapshot=None):
+    """Traverses the provided path in a background thread and yields the photos through a bounded queue.
+    The consumer can start working while the scan continues and, as the scanner blocks when the queue is full,
+    the memory stays flat regardless of the size of the library.
+
+    :param photos_path: path to photos
+    :type photos_path: str
+    :param maxsize: maximum number of photos which wait in the queue
+    :type maxsize: int
+    :param snapshot: the directories of the last run (see iter_photos)
+    :type snapshot: TreeSnapshot
+
+    :return: the photos
+    :rtype: generator of PhotoEntry
+    |
+    """
+    photos_queue = queue.Queue(maxsize=maxsize)
+    done = object()
+    stop = threading.Event()
+    errors = []
+
+    def scan():
+        try:
+            for photo in iter_photos(photos_path, snapshot):
+                while not stop.is_set():
+                    try:
+                        photos_queue.put(photo, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+                if stop.is_set():
+                    return
+        except Exception as e:
+            errors.append(e)
+        finally:
+            photos_queue.put(done)
+
+    scanner = threading.Thread(target=scan, name="photonomist-scanner", daemon=True)
+    scanner.start()
+    try:
+        while True:
+            photo = photos_queue.get()
+            if photo is done:
+                break
+            yield photo
+    finally:
+        # The consumer stopped early (or failed), release the scanner
+        stop.set()
+        while scanner.is_alive():
+            try:
+                photos_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+    if errors:
+        raise errors[0]
+
+
+class TraversalCache:
+    """This class is used to represent the traversals of the input paths (e.g. of a GUI session), so that an input path
+    which is traversed again (e.g. by Find Photos and then by Run) is only listed where it changed.
+
+    The modification time, the subdirectories and the photos of each directory are kept. A directory's modification time
+    changes when an entry is added to it, removed or renamed, so a directory with the same modification time is not listed
+    again: an unchanged input path costs one stat per directory and its photos_roots are returned as they are.
+    A photo which is rewritten in place (without a rename) keeps the stat data of its last listing.
+
+    It is meant for one traversal at a time (e.g. from a single worker thread).
+    |
+    """
+
+    def __init__(self):
+        """Constructor method
+        |
+        """
+        # photos path --> {directory: (mtime_ns, subdirectories, photos)}
+        self.__directories = {}
+        # photos path --> photos_roots
+        self.__photos_roots = {}
+        self.listed = 0
+        self.skipped = 0
+
+    def photos_roots(self, photos_path:str)->dict:
+        """Traverses the provided path (top-down, like traverse_photos_path) and lists only the directories
+        which are new or changed since the last traversal of the same path.
+
+        :param photos_path: path to photos
+        :type photos_path: str
+
+        :return: A dictionary with key a path with photos and value a list of .jpg, .jpeg, .nef or .cr2 photos.
+            It is the same dictionary as the last time if nothing changed, so it must not be modified.
+        :rtype: dict
+        |
+        """
+        previous = self.__directories.get(photos_path, {})
+        directories = {}
+        changed = photos_path not in self.__photos_roots
+        stack = [photos_path]
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                changed = True
+                continue
+            cached = previous.get(directory)
+            if cached is not None and cached[0] == mtime_ns:
+                self.skipped += 1
+            else:
+                changed = True
+                listing = list_directory(directory)
+                if listing is None:
+                    continue
+                self.listed += 1
+                cached = (mtime_ns,) + listing
+            directories[directory] = cached
+            # Reversed, so that they are popped in order
+            stack.extend(reversed(cached[1]))
+        # A directory which was removed has no listing to change
+        changed = changed or len(directories) != len(previous)
+        self.__directories[photos_path] = directories
+
+        if changed:
+            photos_roots = collections.defaultdict(list)
+            for _, _, photos in directories.values():
+                if photos:
+                    photos_roots[os.path.dirname(photos[0])].extend(photos)
+            self.__photos_roots[photos_path] = photos_roots
+        return self.__photos_roots[photos_path]
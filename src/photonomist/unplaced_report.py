@@ -0,0 +1,127 @@
+""" This module hosts the UnplacedReport class
+"""
+import csv
+import json
+import os
+
+# Reason codes of the photos that can't be placed
+NO_EXIF = "no_exif"
+UNREADABLE = "unreadable"
+CORRUPT = "corrupt"
+PERMISSION = "permission"
+DUPLICATE = "duplicate"
+MISSING = "missing"
+
+# Name of the report when it is stored under the export path
+REPORT_FILE_NAME = "not_transferred.csv"
+
+
+def default_report_path(export_path:str)->str:
+    """Returns the default location of the unplaced photos report (under the export path).
+
+    :param export_path: path to the directory where the photo folder structure will be created
+    :type export_path: str
+
+    :return: path to the report
+    :rtype: str
+    |
+    """
+    return os.path.join(export_path, REPORT_FILE_NAME)
+
+
+class UnplacedReport:
+    """This class is used to represent the report of the photos that were not transferred.
+    It lives for the whole run: entries are buffered and written with a single open/append,
+    when the buffer is full, at the end of the run or on interruption (when it's used as a context manager).
+
+    Each entry carries a reason code (no_exif, unreadable, corrupt, permission, duplicate, missing), so that only
+    the photos that failed can be reprocessed. The format is CSV or, if report_path ends with .jsonl, JSON lines.
+
+    :param report_path: path to the report
+    :type report_path: str
+    :param buffer_size: number of entries which are kept in memory before they are written
+    :type buffer_size: int
+    |
+    """
+    FIELDS = ("source", "reason", "detail")
+
+    def __init__(self, report_path:str, buffer_size:int=10000):
+        """Constructor method
+        |
+        """
+        self.path = report_path
+        self.buffer_size = buffer_size
+        self.count = 0
+        self.__buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def add(self, photo_path:str, reason:str=NO_EXIF, detail:str=""):
+        """Adds a photo to the report.
+
+        :param photo_path: path to photo
+        :type photo_path: str
+        :param reason: reason code
+        :type reason: str
+        :param detail: free text (e.g. an error message)
+        :type detail: str
+        |
+        """
+        self.add_entry((photo_path, reason, detail))
+
+    def add_entry(self, entry:tuple):
+        """Adds an entry to the report, with one value for each one of the FIELDS.
+
+        :param entry: the values of the entry
+        :type entry: tuple
+        |
+        """
+        self.__buffer.append(entry)
+        self.count += 1
+        if len(self.__buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Appends the buffered entries to the report. The file is only created if there is something to write.
+        |
+        """
+        if not self.__buffer:
+            return
+        if self.path.lower().endswith(".jsonl"):
+            with open(self.path, "a", encoding="utf-8") as report_file:
+                for entry in self.__buffer:
+                    report_file.write(json.dumps(dict(zip(self.FIELDS, entry))) + "\n")
+        else:
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, "a", newline="", encoding="utf-8") as report_file:
+                writer = csv.writer(report_file)
+                if new_file:
+                    writer.writerow(self.FIELDS)
+                writer.writerows(self.__buffer)
+        self.__buffer = []
+
+    def close(self):
+        """Writes whatever is left in the buffer.
+        |
+        """
+        self.flush()
+
+
+def read_report(report_path:str)->list:
+    """Reads a report (CSV or JSON lines), e.g. in order to reprocess the failed photos.
+
+    :param report_path: path to the report
+    :type report_path: str
+
+    :return: a list of dicts with source, reason and detail
+    :rtype: list
+    |
+    """
+    with open(report_path, "r", newline="", encoding="utf-8") as report_file:
+        if report_path.lower().endswith(".jsonl"):
+            return [json.loads(line) for line in report_file if line.strip()]
+        return list(csv.DictReader(report_file))
@@ -0,0 +1,168 @@
+""" This module hosts the FolderWatcher class
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import time
+from traversal import iter_photos
+
+# inotify events which mean that a directory's entries (or a file) changed
+IN_MODIFY = 0x2
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_NONBLOCK = 0o4000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+# Seconds which the watcher waits after it is woken up, so that a burst of events causes a single poll
+DEBOUNCE = 0.25
+
+
+class _Inotify:
+    """Wakes the watcher up as soon as something changes under the watched directories (Linux only).
+    It only tells that something changed, the changes themselves are found by the scandir poll.
+    |
+    """
+
+    def __init__(self):
+        """Constructor method
+        |
+        """
+        self.__libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.__fd = self.__libc.inotify_init1(IN_NONBLOCK)
+        if self.__fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.__watched = set()
+
+    def add_watch(self, path:str):
+        if path not in self.__watched:
+            # A directory which can't be watched (e.g. the limit of watches was reached) is still polled
+            if self.__libc.inotify_add_watch(self.__fd, os.fsencode(path), WATCH_MASK) >= 0:
+                self.__watched.add(path)
+
+    def wait(self, timeout:float)->bool:
+        """Blocks until something changes or the timeout expires. The pending events are discarded.
+        |
+        """
+        readable, _, _ = select.select([self.__fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            while os.read(self.__fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.__fd)
+
+
+class FolderWatcher:
+    """This class is used to represent a hot folder (e.g. the drop folder of a camera or of tethering software).
+    The folder is polled with scandir and each poll is compared with the previous one (path --> size, modification time).
+    A photo is handed out once, when it has stopped changing for settle seconds, so that files which are still being
+    written are left alone. A photo which is handed out and stays in the folder (e.g. it has no date) is only handed out
+    again if it changes.
+
+    On Linux the watcher sleeps on inotify between the polls, so it wakes up as soon as a file arrives. Everywhere else
+    (or if inotify is not available) it sleeps for the poll interval.
+
+    :param photos_path: path to the watched folder
+    :type photos_path: str
+    :param settle: seconds for which a photo must not change, before it is handed out
+    :type settle: float
+    :param interval: maximum number of seconds between two polls
+    :type interval: float
+    :param use_inotify: whether inotify is used (when it's available) to wake up between the polls
+    :type use_inotify: bool
+    |
+    """
+
+    def __init__(self, photos_path:str, settle:float=5.0, interval:float=2.0, use_inotify:bool=True):
+        """Constructor method
+        |
+        """
+        self.photos_path = photos_path
+        self.settle = settle
+        self.interval = interval
+        self.polls = 0
+        # photo --> (size, mtime_ns, the time when it was first seen with them)
+        self.__pending = {}
+        # photo --> (size, mtime_ns) when it was handed out
+        self.__handed = {}
+        self.__inotify = None
+        if use_inotify:
+            try:
+                self.__inotify = _Inotify()
+            except (OSError, AttributeError):
+                self.__inotify = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def waiting(self)->int:
+        """Number of photos which are still changing
+        |
+        """
+        return len(self.__pending)
+
+    def poll(self, now:float=None)->list:
+        """Lists the folder and returns the photos which have stopped changing.
+
+        :param now: the time of the poll (time.monotonic() by default)
+        :type now: float
+
+        :return: the photos (PhotoEntry) which are ready, in the order of the traversal
+        :rtype: list
+        |
+        """
+        now = time.monotonic() if now is None else now
+        self.polls += 1
+        ready = []
+        found = set()
+        for photo in iter_photos(self.photos_path):
+            found.add(photo)
+            if self.__inotify is not None:
+                self.__inotify.add_watch(os.path.dirname(photo))
+            state = (photo.size, photo.mtime_ns)
+            if self.__handed.get(photo) == state:
+                continue
+            pending = self.__pending.get(photo)
+            if pending is None or pending[:2] != state:
+                self.__pending[photo] = state + (now,)
+            elif now - pending[2] >= self.settle:
+                del self.__pending[photo]
+                self.__handed[photo] = state
+                ready.append(photo)
+        # Forget the photos which are gone (moved away or deleted)
+        for photos in (self.__pending, self.__handed):
+            for photo in [photo for photo in photos if photo not in found]:
+                del photos[photo]
+        return ready
+
+    def wait(self):
+        """Sleeps until the next poll: the poll interval or, with inotify, until something changes.
+        While photos are settling, the next poll is not later than when the first one is ready.
+        |
+        """
+        timeout = self.interval
+        if self.__pending:
+            timeout = min(timeout, max(0.05, self.settle))
+        if self.__inotify is not None:
+            self.__inotify.add_watch(self.photos_path)
+            if self.__inotify.wait(timeout):
+                # A file which is being written wakes the watcher up on every write
+                time.sleep(min(timeout, DEBOUNCE))
+        else:
+            time.sleep(timeout)
+
+    def close(self):
+        if self.__inotify is not None:
+            self.__inotify.close()
+            self.__inotify = None
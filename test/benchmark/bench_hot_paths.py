@@ -0,0 +1,211 @@
+""" Benchmarks of the hot paths of photonomist.
+
+Each benchmark builds a synthetic corpus (see corpus.build_corpus) of every requested size and times:
+| traverse_photos_path : the traversal of the corpus
+| Photo                : the construction (EXIF extraction) of every photo
+| dir_name_exists      : the lookup of the destination folder of a sample of photos, walking the export path
+| dir_name_exists_indexed : the same lookup for every photo, through an ExportIndex (its scan included)
+| check_same_name      : the free name of a sample of photos in destination folders full of same-named files, probing the file system
+| check_same_name_registry : the same for every photo, through a NameRegistry
+| tidy_photos          : the end-to-end run (planning and moves) of the corpus into an empty export path
+
+The results are written as JSON, so that the results of two versions can be compared:
+
+    python bench_hot_paths.py --sizes 1000 10000 100000 --output new.json --baseline old.json
+
+The photonomist package must be importable (e.g. installed in develop mode), like for the tests.
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from corpus import build_corpus
+from photonomist.__version__ import __version__
+from photonomist.__main__ import traverse_photos_path, dir_name_exists, photo_dir_name, tidy_photos
+from photonomist.photo import Photo
+from photonomist.export_index import ExportIndex
+from photonomist.name_registry import NameRegistry
+
+# Sizes (number of photos) of the corpora
+DEFAULT_SIZES = (1000, 10000, 100000)
+# Name pattern of the destination folders
+NAME_PATTERN = "_place_reason_people"
+
+
+def timed(function, repeat:int=1):
+    """Calls a function repeat times.
+
+    :return: the best duration in seconds and the result of the last call
+    :rtype: tuple
+    |
+    """
+    best = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = function()
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+    return best, result
+
+def stage(seconds:float, calls:int)->dict:
+    return {"seconds": seconds, "calls": calls, "per_call": seconds / calls if calls else 0.0}
+
+def benchmark_size(work_path:str, size:int, sample:int=200, repeat:int=3, seed:int=0, **corpus_options)->dict:
+    """Builds a corpus of size photos under work_path and times the hot paths on it.
+
+    :param work_path: an empty directory for the corpus and the export paths
+    :type work_path: str
+    :param size: number of photos
+    :type size: int
+    :param sample: number of photos for the lookups which probe the file system
+    :type sample: int
+    :param repeat: number of times each read only stage is repeated (the best time is kept)
+    :type repeat: int
+    :param seed: seed of the corpus and of the sample
+    :type seed: int
+    :param corpus_options: options of build_corpus (depth, fan_out, duplicate_ratio, collision_ratio, ..)
+    :type corpus_options: dict
+
+    :return: stage --> seconds, calls and seconds per call
+    :rtype: dict
+    |
+    """
+    photos_path = os.path.join(work_path, "photos")
+    library_path = os.path.join(work_path, "library")
+    export_path = os.path.join(work_path, "export")
+    results = {}
+
+    seconds, counts = timed(lambda: build_corpus(photos_path, size, seed=seed, **corpus_options))
+    results["build_corpus"] = dict(stage(seconds, size), **counts)
+
+    seconds, photos_roots = timed(lambda: traverse_photos_path(photos_path), repeat)
+    photo_paths = [photo for photo_list in photos_roots.values() for photo in photo_list]
+    results["traverse_photos_path"] = stage(seconds, len(photo_paths))
+
+    seconds, photos = timed(lambda: [Photo(photo_path) for photo_path in photo_paths], repeat)
+    results["Photo"] = stage(seconds, len(photos))
+
+    # A library which already holds a file of the same name as every photo, in the photo's destination folder
+    destinations = []
+    for photo in photos:
+        date = photo.get_date()
+        if date is None:
+            continue
+        dir_name = photo_dir_name(date, name_pattern=NAME_PATTERN)
+        destinations.append((photo, dir_name, os.path.join(library_path, dir_name, str(photo))))
+    for dir_name in {dir_name for _, dir_name, _ in destinations}:
+        os.makedirs(os.path.join(library_path, dir_name))
+    for _, _, new_path in destinations:
+        open(new_path, "wb").close()
+    sampled = random.Random(seed).sample(destinations, min(sample, len(destinations)))
+
+    seconds, _ = timed(lambda: [dir_name_exists(dir_name, library_path) for _, dir_name, _ in sampled], repeat)
+    results["dir_name_exists"] = stage(seconds, len(sampled))
+
+    def indexed_lookups():
+        export_index = ExportIndex(library_path)
+        return [dir_name_exists(dir_name, library_path, export_index) for _, dir_name, _ in destinations]
+    seconds, _ = timed(indexed_lookups, repeat)
+    results["dir_name_exists_indexed"] = stage(seconds, len(destinations))
+
+    seconds, _ = timed(lambda: [photo.check_same_name(new_path) for photo, _, new_path in sampled], repeat)
+    results["check_same_name"] = stage(seconds, len(sampled))
+
+    def registry_lookups():
+        registry = NameRegistry()
+        return [photo.check_same_name(new_path, registry) for photo, _, new_path in destinations]
+    seconds, _ = timed(registry_lookups, repeat)
+    results["check_same_name_registry"] = stage(seconds, len(destinations))
+
+    # It moves the photos, so it runs once and last
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        seconds, _ = timed(lambda: tidy_photos(export_path, photos_roots, name_pattern=NAME_PATTERN,
+                                               report_path=os.path.join(work_path, "not_transferred.csv")))
+    results["tidy_photos"] = stage(seconds, len(photo_paths))
+    return results
+
+def compare(results:dict, baseline:dict, tolerance:float=0.25)->list:
+    """Compares the seconds per call of each stage with a baseline (the results of another version).
+
+    :param results: the results of this version
+    :type results: dict
+    :param baseline: the results of the other version
+    :type baseline: dict
+    :param tolerance: the allowed slowdown (0.25 means 25% slower)
+    :type tolerance: float
+
+    :return: (size, stage, baseline per call, per call, ratio) of the stages which are slower than the tolerance
+    :rtype: list
+    |
+    """
+    regressions = []
+    for size, stages in results["results"].items():
+        for name, timing in stages.items():
+            old_timing = baseline.get("results", {}).get(size, {}).get(name)
+            if name == "build_corpus" or not old_timing or not old_timing["per_call"]:
+                continue
+            ratio = timing["per_call"] / old_timing["per_call"]
+            print(f"{size:>8} {name:<26} {old_timing['per_call'] * 1e6:>12.1f}us {timing['per_call'] * 1e6:>12.1f}us {ratio:>7.2f}x")
+            if ratio > 1 + tolerance:
+                regressions.append((size, name, old_timing["per_call"], timing["per_call"], ratio))
+    return regressions
+
+def main_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks the hot paths of photonomist on synthetic corpora")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="number of photos of each corpus")
+    parser.add_argument("--output", default="benchmark.json", help="path to the JSON results")
+    parser.add_argument("--baseline", help="JSON results of another version to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    parser.add_argument("--sample", type=int, default=200, help="photos for the lookups which probe the file system")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions of the read only stages")
+    parser.add_argument("--work-path", help="directory for the corpora (a temporary directory by default)")
+    parser.add_argument("--depth", type=int, default=3, help="levels of folders of the corpus")
+    parser.add_argument("--duplicates", type=float, default=0.05, help="share of byte-identical photos")
+    parser.add_argument("--collisions", type=float, default=0.1, help="share of photos with a colliding name")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the corpus")
+    return parser.parse_args(argv)
+
+def main(argv=None)->int:
+    args = main_args(argv)
+    results = {"version": __version__,
+               "python": platform.python_version(),
+               "platform": platform.platform(),
+               "created": datetime.datetime.now().isoformat(timespec="seconds"),
+               "options": {"sample": args.sample, "repeat": args.repeat, "depth": args.depth,
+                           "duplicates": args.duplicates, "collisions": args.collisions, "seed": args.seed},
+               "results": {}}
+    for size in args.sizes:
+        work_path = tempfile.mkdtemp(prefix=f"photonomist_bench_{size}_", dir=args.work_path)
+        try:
+            results["results"][str(size)] = benchmark_size(work_path, size, args.sample, args.repeat, args.seed, depth=args.depth,
+                                                           duplicate_ratio=args.duplicates, collision_ratio=args.collisions)
+        finally:
+            shutil.rmtree(work_path, ignore_errors=True)
+        for name, timing in results["results"][str(size)].items():
+            print(f"{size:>8} {name:<26} {timing['seconds']:>10.3f}s {timing['per_call'] * 1e6:>12.1f}us/call")
+
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f"Compared with {baseline.get('version')} ({baseline.get('created')}):")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} stage(s) are more than {args.tolerance:.0%} slower than the baseline")
+            return 1
+    return 0
+
+
+# Make the script executable.
+if __name__ == "__main__":
+    sys.exit(main())
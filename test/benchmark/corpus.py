@@ -0,0 +1,196 @@
+""" This module hosts the synthetic photo corpus of the benchmarks.
+
+The corpus is a tree of tiny, valid JPEG and TIFF based (NEF) files which carry an EXIF DateTimeOriginal,
+so that every stage of photonomist (traversal, EXIF extraction, planning, duplicate detection and transfer)
+runs on it as it would on the photos of a camera card.
+
+The script can be executed on its own to build a corpus:
+
+    python corpus.py <root> --files 10000 --depth 3 --duplicates 0.05 --collisions 0.1
+"""
+import argparse
+import collections
+import datetime
+import os
+import random
+import struct
+
+# Extension of each kind of photo
+JPEG = ".JPG"
+TIFF = ".NEF"
+
+
+def tiff_bytes(date:str, endian:str="<", payload:bytes=b"")->bytes:
+    """Builds a TIFF structure: header --> IFD0 (Exif pointer) --> Exif IFD (DateTimeOriginal) --> payload
+
+    :param date: the EXIF date (YYYY:MM:DD HH:MM:SS)
+    :type date: str
+    :param endian: "<" (Intel) or ">" (Motorola) byte order
+    :type endian: str
+    :param payload: bytes which are appended after the date (e.g. to make the file unique)
+    :type payload: bytes
+
+    :return: the contents of the file
+    :rtype: bytes
+    |
+    """
+    date_bytes = date.encode("ascii") + b"\x00"
+    header = (b"II*\x00" if endian == "<" else b"MM\x00*") + struct.pack(endian + "I", 8)
+    ifd0 = struct.pack(endian + "H", 1) + struct.pack(endian + "HHII", 0x8769, 4, 1, 26) + struct.pack(endian + "I", 0)
+    exif_ifd = struct.pack(endian + "H", 1) + struct.pack(endian + "HHII", 0x9003, 2, len(date_bytes), 44) + struct.pack(endian + "I", 0)
+    return header + ifd0 + exif_ifd + date_bytes + payload
+
+def jpeg_bytes(date:str, payload:bytes=b"")->bytes:
+    """Builds a JPEG with an APP0 (JFIF) segment, the Exif APP1 segment and the payload as scan data
+
+    :param date: the EXIF date (YYYY:MM:DD HH:MM:SS)
+    :type date: str
+    :param payload: scan data (it must not contain 0xFF bytes)
+    :type payload: bytes
+
+    :return: the contents of the file
+    :rtype: bytes
+    |
+    """
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    exif = b"Exif\x00\x00" + tiff_bytes(date)
+    app1 = b"\xff\xe1" + struct.pack(">H", len(exif) + 2) + exif
+    return b"\xff\xd8" + app0 + app1 + b"\xff\xda\x00\x02" + (payload or b"\x00" * 64) + b"\xff\xd9"
+
+def photo_bytes(extension:str, date:str, number:int, payload_size:int=64)->bytes:
+    """Builds a unique photo: the number of the photo is written in its payload.
+
+    :param extension: JPEG or TIFF
+    :type extension: str
+    :param date: the EXIF date (YYYY:MM:DD HH:MM:SS)
+    :type date: str
+    :param number: the number of the photo in the corpus
+    :type number: int
+    :param payload_size: size of the payload in bytes
+    :type payload_size: int
+
+    :return: the contents of the file
+    :rtype: bytes
+    |
+    """
+    payload = str(number).encode("ascii").rjust(max(payload_size, 16), b"0")
+    if extension == TIFF:
+        return tiff_bytes(date, "<" if number % 2 else ">", payload)
+    return jpeg_bytes(date, payload)
+
+def corpus_folders(root:str, depth:int=3, fan_out:int=4)->list:
+    """Returns the folders of a corpus: a tree of depth levels with fan_out subfolders each (e.g. cards --> DCIM folders).
+    The photos are spread over the leaves.
+
+    :param root: path to the corpus
+    :type root: str
+    :param depth: number of levels of folders under the root
+    :type depth: int
+    :param fan_out: number of subfolders of each folder
+    :type fan_out: int
+
+    :return: paths to the leaf folders
+    :rtype: list
+    |
+    """
+    folders = [root]
+    for level in range(depth):
+        folders = [os.path.join(folder, f"{100 + level}_{index:02d}") for folder in folders for index in range(fan_out)]
+    return folders
+
+def build_corpus(root:str, files:int=1000, depth:int=3, fan_out:int=4, duplicate_ratio:float=0.05, collision_ratio:float=0.1,
+                 tiff_ratio:float=0.2, days:int=365, payload_size:int=64, seed:int=0)->collections.Counter:
+    """Builds a synthetic corpus of photos under root. It is reproducible for the same arguments.
+    | 1) Unique photos: a camera name (DSC_00001.JPG), a date in one of the days after 2019-01-01 and unique contents
+    | 2) Duplicates (duplicate_ratio): byte-identical copies of an earlier photo, with their own names, in another folder
+    | 3) Collisions (collision_ratio): different photos with the name and the date of an earlier photo, in another folder,
+    | so they end up in the same destination folder and one of them is renamed (see Photo.check_same_name)
+
+    :param root: path to the corpus (it is created if it doesn't exist)
+    :type root: str
+    :param files: number of photos
+    :type files: int
+    :param depth: number of levels of folders under the root
+    :type depth: int
+    :param fan_out: number of subfolders of each folder
+    :type fan_out: int
+    :param duplicate_ratio: share of the photos which are duplicates
+    :type duplicate_ratio: float
+    :param collision_ratio: share of the photos whose name collides with another photo of the same day
+    :type collision_ratio: float
+    :param tiff_ratio: share of the photos which are TIFF based (NEF)
+    :type tiff_ratio: float
+    :param days: number of different capture days
+    :type days: int
+    :param payload_size: size of the payload of each photo in bytes
+    :type payload_size: int
+    :param seed: seed of the random generator
+    :type seed: int
+
+    :return: the number of photos, unique photos, duplicates, collisions and folders
+    :rtype: collections.Counter
+    |
+    """
+    generator = random.Random(seed)
+    folders = corpus_folders(root, depth, fan_out)
+    for folder in folders:
+        os.makedirs(folder, exist_ok=True)
+    start = datetime.datetime(2019, 1, 1)
+    counts = collections.Counter(folders=len(folders))
+    # (folder, file name, date, contents) of the photos which were written
+    written = []
+    for number in range(files):
+        folder = generator.choice(folders)
+        draw = generator.random()
+        if written and draw < duplicate_ratio:
+            _, _, date, contents = generator.choice(written)
+            extension = TIFF if contents[:2] in (b"II", b"MM") else JPEG
+            file_name = f"DSC_{number:05d}{extension}"
+            counts["duplicates"] += 1
+        elif written and draw < duplicate_ratio + collision_ratio:
+            original_folder, file_name, date, _ = generator.choice(written)
+            extension = os.path.splitext(file_name)[1]
+            contents = photo_bytes(extension, date, number, payload_size)
+            if len(folders) > 1:
+                folder = generator.choice([other for other in folders if other != original_folder])
+            counts["collisions"] += 1
+        else:
+            extension = TIFF if generator.random() < tiff_ratio else JPEG
+            date = (start + datetime.timedelta(days=generator.randrange(max(1, days)), seconds=generator.randrange(86400))).strftime("%Y:%m:%d %H:%M:%S")
+            file_name = f"DSC_{number:05d}{extension}"
+            contents = photo_bytes(extension, date, number, payload_size)
+            counts["unique"] += 1
+        photo_path = os.path.join(folder, file_name)
+        if os.path.exists(photo_path):
+            # A collision which landed in a folder with a photo of the same name
+            file_name = f"DSC_{number:05d}{extension}"
+            photo_path = os.path.join(folder, file_name)
+        with open(photo_path, "wb") as photo_file:
+            photo_file.write(contents)
+        written.append((folder, file_name, date, contents))
+        counts["photos"] += 1
+    return counts
+
+def main_args(argv=None):
+    parser = argparse.ArgumentParser(description="Builds a synthetic corpus of photos with EXIF dates")
+    parser.add_argument("root", help="path to the corpus")
+    parser.add_argument("--files", type=int, default=1000, help="number of photos")
+    parser.add_argument("--depth", type=int, default=3, help="levels of folders")
+    parser.add_argument("--fan-out", type=int, default=4, help="subfolders of each folder")
+    parser.add_argument("--duplicates", type=float, default=0.05, help="share of byte-identical photos")
+    parser.add_argument("--collisions", type=float, default=0.1, help="share of photos with a colliding name")
+    parser.add_argument("--tiff", type=float, default=0.2, help="share of TIFF based (NEF) photos")
+    parser.add_argument("--days", type=int, default=365, help="number of capture days")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random generator")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = main_args(argv)
+    counts = build_corpus(args.root, args.files, args.depth, args.fan_out, args.duplicates, args.collisions,
+                          args.tiff, args.days, seed=args.seed)
+    print(", ".join(f"{key}: {value}" for key, value in sorted(counts.items())))
+
+
+# Make the script executable.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Test suite for the synthetic corpus and the benchmarks of the hot paths.
+
+This test suite aims to test that the synthetic photos are valid photos (with EXIF dates)
+for photonomist and that a (tiny) benchmark runs end to end.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import pytest
+import collections
+import json
+import os
+from corpus import build_corpus, corpus_folders
+from bench_hot_paths import benchmark_size, compare, main
+from photonomist.fast_exif import read_exif_tags
+from photonomist.__main__ import traverse_photos_path
+
+
+def test_build_corpus(tmp_path):
+    """Test test\\benchmark\\corpus > build_corpus
+    """
+    counts = build_corpus(str(tmp_path), files=200, depth=2, fan_out=3, duplicate_ratio=0.1, collision_ratio=0.2)
+    photos = [photo for photo_list in traverse_photos_path(str(tmp_path)).values() for photo in photo_list]
+    assert counts["photos"] == len(photos) == 200
+    assert counts["folders"] == len(corpus_folders(str(tmp_path), 2, 3)) == 9
+    assert counts["unique"] + counts["duplicates"] + counts["collisions"] == 200
+    assert counts["duplicates"] and counts["collisions"]
+
+    contents = collections.Counter()
+    names = collections.Counter()
+    for photo in photos:
+        assert read_exif_tags(photo)["DateTimeOriginal"].startswith("2019:")
+        with open(photo, "rb") as photo_file:
+            contents[photo_file.read()] += 1
+        names[os.path.basename(photo)] += 1
+    assert sum(count - 1 for count in contents.values()) == counts["duplicates"]
+    assert sum(count - 1 for count in names.values()) <= counts["collisions"]
+
+def test_build_corpus_is_reproducible(tmp_path):
+    """Test test\\benchmark\\corpus > build_corpus
+    """
+    def listing(root):
+        return sorted((os.path.relpath(photo, root), open(photo, "rb").read())
+                      for photo_list in traverse_photos_path(root).values() for photo in photo_list)
+
+    build_corpus(str(tmp_path / "first"), files=50, seed=7)
+    build_corpus(str(tmp_path / "second"), files=50, seed=7)
+    assert listing(str(tmp_path / "first")) == listing(str(tmp_path / "second"))
+
+def test_benchmark_size(tmp_path):
+    """Test test\\benchmark\\bench_hot_paths > benchmark_size
+    """
+    results = benchmark_size(str(tmp_path), 60, sample=10, repeat=1, depth=1, fan_out=2)
+    assert set(results) == {"build_corpus", "traverse_photos_path", "Photo", "dir_name_exists", "dir_name_exists_indexed",
+                            "check_same_name", "check_same_name_registry", "tidy_photos"}
+    assert results["traverse_photos_path"]["calls"] == results["tidy_photos"]["calls"] == 60
+    assert results["dir_name_exists"]["calls"] == 10
+    # Every photo was moved
+    assert not any(files for _, _, files in os.walk(tmp_path / "photos"))
+
+def test_compare():
+    """Test test\\benchmark\\bench_hot_paths > compare
+    """
+    baseline = {"results": {"1000": {"Photo": {"per_call": 1.0}, "tidy_photos": {"per_call": 1.0}}}}
+    results = {"results": {"1000": {"Photo": {"per_call": 1.1}, "tidy_photos": {"per_call": 2.0}, "new_stage": {"per_call": 1.0}}}}
+    assert [(size, name) for size, name, *_ in compare(results, baseline, 0.25)] == [("1000", "tidy_photos")]
+
+def test_main_writes_json(tmp_path):
+    """Test test\\benchmark\\bench_hot_paths > main
+    """
+    output_path = str(tmp_path / "benchmark.json")
+    assert main(["--sizes", "20", "--sample", "5", "--repeat", "1", "--depth", "1", "--work-path", str(tmp_path), "--output", output_path]) == 0
+    with open(output_path) as output_file:
+        results = json.load(output_file)
+    assert list(results["results"]) == ["20"]
+    assert main(["--sizes", "20", "--repeat", "1", "--depth", "1", "--work-path", str(tmp_path),
+                 "--output", output_path, "--baseline", output_path, "--tolerance", "100"]) == 0
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
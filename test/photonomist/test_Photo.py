@@ -13,6 +13,7 @@ environment or setuptools develop mode to test against the development version.
 import pytest
 import os, shutil
 from photonomist.photo import Photo
+from photonomist.name_registry import NameRegistry
 
 @pytest.fixture
 def my_photo():
@@ -170,6 +171,50 @@ def test_date_year_returns_only_year(my_photo, date, expected):
     """Test src\\photonomist\\photo.Photo> date_year
     """
     assert my_photo.date_year(date) == expected
+
+def test_check_same_name_appends_the_next_number(tmp_path):
+    """Test src\\photonomist\\photo.Photo> check_same_name
+    """
+    for file_name in ("DSC_0262.NEF", "DSC_0262(1).NEF"):
+        (tmp_path / file_name).write_text("")
+    my_photo = Photo(str(tmp_path / "DSC_0262.NEF"), metadata={})
+    assert my_photo.check_same_name(str(tmp_path / "DSC_0262.NEF")) == str(tmp_path / "DSC_0262(2).NEF")
+
+def test_move_to_folder_with_a_name_registry(tmp_path):
+    """Test src\\photonomist\\photo.Photo> move_to_folder with a NameRegistry
+    """
+    registry = NameRegistry()
+    for card in ("card_a", "card_b"):
+        os.makedirs(tmp_path / card)
+        (tmp_path / card / "DSC_0262.NEF").write_text(card)
+        Photo(str(tmp_path / card / "DSC_0262.NEF"), metadata={}).move_to_folder(str(tmp_path / "2019_12_14"), registry=registry)
+    assert sorted(os.listdir(tmp_path / "2019_12_14")) == ["DSC_0262(1).NEF", "DSC_0262.NEF"]
+
+def test_move_to_folder_never_overwrites_a_file_added_after_the_listing(tmp_path):
+    """Test src\\photonomist\\photo.Photo> move_to_folder with a NameRegistry (the folder changed after it was listed)
+    """
+    registry = NameRegistry()
+    os.makedirs(tmp_path / "card")
+    os.makedirs(tmp_path / "2019_12_14")
+    assert registry.reserve(str(tmp_path / "2019_12_14"), "IMG_0001.JPG") == "IMG_0001.JPG"
+    (tmp_path / "2019_12_14" / "DSC_0262.NEF").write_text("added later")
+    (tmp_path / "2019_12_14" / "DSC_0262(1).NEF").write_text("added later too")
+    (tmp_path / "card" / "DSC_0262.NEF").write_text("card")
+    photo = Photo(str(tmp_path / "card" / "DSC_0262.NEF"), metadata={})
+    photo.move_to_folder(str(tmp_path / "2019_12_14"), registry=registry)
+    assert (tmp_path / "2019_12_14" / "DSC_0262.NEF").read_text() == "added later"
+    assert (tmp_path / "2019_12_14" / "DSC_0262(1).NEF").read_text() == "added later too"
+    assert photo.path == str(tmp_path / "2019_12_14" / "DSC_0262(2).NEF")
+    assert (tmp_path / "2019_12_14" / "DSC_0262(2).NEF").read_text() == "card"
+
+def test_move_to_a_new_folder_keeps_the_strategy(tmp_path):
+    """Test src\\photonomist\\photo.Photo> move_to_folder (the folder is created, same_device is not detected again)
+    """
+    (tmp_path / "DSC_0262.NEF").write_text("raw")
+    photo = Photo(str(tmp_path / "DSC_0262.NEF"), metadata={})
+    transfer = photo.move_to_folder(str(tmp_path / "2019_12_14"), "DSC_0262.NEF", same_device=False)
+    assert transfer.strategy == "copy"
+    assert (tmp_path / "2019_12_14" / "DSC_0262.NEF").read_text() == "raw"
     
 # Make the script executable.
 if __name__ == "__main__":
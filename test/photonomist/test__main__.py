@@ -9,12 +9,26 @@ precedence over the version in this project directory. Use a virtualenv test
 environment or setuptools develop mode to test against the development version.
 """
 import pytest
-import os, shutil
+import os, shutil, contextlib
 from photonomist.__main__ import path_exists, path_items, clean_path, path_string,\
      path_photos, traverse_photos_path, photos_size, disk_space, photo_dir_name,\
           dir_name_exists, create_photo_dir, transfer_photo, paths_same_disk,\
                input_path_validation, export_path_validation, tidy_photos, replace_backslashes,\
-                   group_by_message, group_by_, group_option
+                   group_by_message, group_by_, group_option, extract_photos, plan_photos, execute_plan,\
+                       main_args, recover_journal, already_organized, watch_photos
+from photonomist.photo import Photo
+from photonomist.transfer_scheduler import TransferScheduler
+from photonomist.dedup import DuplicateFinder
+from photonomist.journal import TransferJournal
+from photonomist.unplaced_report import UnplacedReport, read_report
+from photonomist.transfer_report import TransferReport
+from photonomist.manifest import MoveManifest, undo_run
+from photonomist.metadata_cache import MetadataCache
+from photonomist.export_index import ExportIndex
+from photonomist.run_metrics import RunMetrics
+from photonomist.progress import ProgressTracker
+from photonomist.job_runner import JobControl
+from photonomist.manifest import read_manifest
 
 @pytest.mark.parametrize("sample_path", [("blablabla"), 
                                          (r'test\data\blablabla'), 
@@ -100,6 +114,17 @@ def test_photos_total_size():
     photos_total_size = photos_size(sample_photo_roots)
     assert photos_total_size == 140855708
 
+def test_photos_size_uses_the_traversal_stat(tmp_path, monkeypatch):
+    """Test src\\photonomist\\__main__ > photos_size (no extra stat calls)
+    """
+    (tmp_path / "DSC_0262.NEF").write_bytes(b"12345")
+    (tmp_path / "IMG_5494.CR2").write_bytes(b"123")
+    sample_photo_roots = traverse_photos_path(str(tmp_path))
+    def no_stat(*args, **kwargs):
+        raise AssertionError("os.stat was called")
+    monkeypatch.setattr(os, "stat", no_stat)
+    assert photos_size(sample_photo_roots) == 8
+
 def test_enough_free_disk_space(capsys):
     """Test src\\photonomist\\__main__ > disk_space
     """
@@ -312,6 +337,13 @@ def test_if_export_and_input_paths_do_not_point_to_the_same_disk():
     export_path = r"test\data\testing_folder_with_photos"
     assert paths_same_disk(photos_path, export_path) == False
 
+def test_existing_paths_are_compared_by_device(tmp_path):
+    """Test src\\photonomist\\__main__ > paths_same_disk
+    """
+    os.makedirs(tmp_path / "photos")
+    os.makedirs(tmp_path / "export")
+    assert paths_same_disk(str(tmp_path / "photos"), str(tmp_path / "export")) == True
+
 def test_input_path_validation_path_exists():
     """ Test for src\\photonomist\\__main__ > input_path_validation
     """
@@ -355,7 +387,7 @@ def move_photos_del_folders():
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder\2019_12_14_place_reason_people")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder\2020_04_24_place_reason_people")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder\2020_10_25_place_reason_people")
-    os.remove(r"test\data\testing_folder_with_photos\move_folder\not_transferred.txt")
+    os.remove(r"test\data\testing_folder_with_photos\move_folder\not_transferred.csv")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder")
 
 def test_move_all_photos_of_all_folders(move_photos_del_folders):
@@ -377,7 +409,7 @@ def move_photos_del_folders_month():
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder\2019_12_place_reason_people")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder\2020_04_place_reason_people")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder\2020_10_place_reason_people")
-    os.remove(r"test\data\testing_folder_with_photos\move_folder\not_transferred.txt")
+    os.remove(r"test\data\testing_folder_with_photos\move_folder\not_transferred.csv")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder")
 
 def test_move_all_photos_of_all_folders_month(move_photos_del_folders_month):
@@ -398,7 +430,7 @@ def move_photos_del_folders_year():
     shutil.move(r"test\data\testing_folder_with_photos\move_folder\2020_place_reason_people\IMG_5494.CR2", r"test\data\testing_folder_with_photos\bla\blabla\IMG_5494.CR2")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder\2019_place_reason_people")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder\2020_place_reason_people")
-    os.remove(r"test\data\testing_folder_with_photos\move_folder\not_transferred.txt")
+    os.remove(r"test\data\testing_folder_with_photos\move_folder\not_transferred.csv")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder")
 
 def test_move_all_photos_of_all_folders_year(move_photos_del_folders_year):
@@ -419,7 +451,7 @@ def move_photos_del_folders_place():
     shutil.move(r"test\data\testing_folder_with_photos\move_folder\2020_place\IMG_5494.CR2", r"test\data\testing_folder_with_photos\bla\blabla\IMG_5494.CR2")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder\2019_place")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder\2020_place")
-    os.remove(r"test\data\testing_folder_with_photos\move_folder\not_transferred.txt")
+    os.remove(r"test\data\testing_folder_with_photos\move_folder\not_transferred.csv")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder")
 
 def test_move_all_photos_of_all_folders_place(move_photos_del_folders_place):
@@ -440,7 +472,7 @@ def move_photos_del_folders_place_reason():
     shutil.move(r"test\data\testing_folder_with_photos\move_folder\2020_place_reason\IMG_5494.CR2", r"test\data\testing_folder_with_photos\bla\blabla\IMG_5494.CR2")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder\2019_place_reason")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder\2020_place_reason")
-    os.remove(r"test\data\testing_folder_with_photos\move_folder\not_transferred.txt")
+    os.remove(r"test\data\testing_folder_with_photos\move_folder\not_transferred.csv")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder")
 
 def test_move_all_photos_of_all_folders_place_reason(move_photos_del_folders_place_reason):
@@ -461,7 +493,7 @@ def move_photos_del_folders_place_people():
     shutil.move(r"test\data\testing_folder_with_photos\move_folder\2020_place_people\IMG_5494.CR2", r"test\data\testing_folder_with_photos\bla\blabla\IMG_5494.CR2")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder\2019_place_people")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder\2020_place_people")
-    os.remove(r"test\data\testing_folder_with_photos\move_folder\not_transferred.txt")
+    os.remove(r"test\data\testing_folder_with_photos\move_folder\not_transferred.csv")
     os.rmdir(r"test\data\testing_folder_with_photos\move_folder")
 
 def test_move_all_photos_of_all_folders_place_people(move_photos_del_folders_place_people):
@@ -473,6 +505,343 @@ def test_move_all_photos_of_all_folders_place_people(move_photos_del_folders_pla
     assert "DSC_1402.JPG" in os.listdir(r"test\data\testing_folder_with_photos\move_folder\2020_place_people")
     assert "IMG_5494.CR2" in os.listdir(r"test\data\testing_folder_with_photos\move_folder\2020_place_people")
 
+def test_extract_photos_keeps_the_order_of_the_paths():
+    """ Test for src\\photonomist\\__main__ > extract_photos
+    """
+    photo_paths = [os.path.join("a", "random", "path", f"photo_{i}.jpg") for i in range(5)]
+    photos = extract_photos(photo_paths, jobs=2)
+    assert [photo.path for photo in photos] == photo_paths
+    assert all(photo.get_date() is None for photo in photos)
+
+def test_plan_and_execute_photos_with_same_name_is_deterministic(tmp_path):
+    """ Test for src\\photonomist\\__main__ > plan_photos, execute_plan
+    """
+    export_path = str(tmp_path / "export")
+    os.makedirs(export_path)
+    photos = []
+    for card in ("card_a", "card_b", "card_c"):
+        os.makedirs(tmp_path / card)
+        (tmp_path / card / "DSC_0001.NEF").write_text(card)
+        photos.append(Photo(str(tmp_path / card / "DSC_0001.NEF"), metadata={"DateTimeOriginal": "2019:12:14 15:04:33"}))
+
+    plan = plan_photos(photos, export_path, name_pattern="")
+    assert plan.folders == ["2019_12_14"]
+    assert [move.file_name for move in plan.moves] == ["DSC_0001.NEF", "DSC_0001(1).NEF", "DSC_0001(2).NEF"]
+    assert os.listdir(export_path) == []
+    execute_plan(plan, jobs=2)
+
+    assert (tmp_path / "export" / "2019_12_14" / "DSC_0001.NEF").read_text() == "card_a"
+    assert (tmp_path / "export" / "2019_12_14" / "DSC_0001(1).NEF").read_text() == "card_b"
+    assert (tmp_path / "export" / "2019_12_14" / "DSC_0001(2).NEF").read_text() == "card_c"
+    # Same file system, the photos were renamed
+    with open(tmp_path / "export" / "transferred.csv") as report_file:
+        assert [line.split(",")[2] for line in report_file] == ["strategy", "rename", "rename", "rename"]
+    assert plan.counts["rename"] == 3
+
+def test_execute_plan_never_overwrites_a_name_taken_after_planning(tmp_path):
+    """ Test for src\\photonomist\\__main__ > execute_plan (no exists probe, no clobber)
+    """
+    export_path = str(tmp_path / "export")
+    photos = []
+    for card in ("card_a", "card_b", "card_c"):
+        os.makedirs(tmp_path / card)
+        (tmp_path / card / "DSC_0001.NEF").write_text(card)
+        photos.append(Photo(str(tmp_path / card / "DSC_0001.NEF"), metadata={"DateTimeOriginal": "2019:12:14 15:04:33"}))
+    plan = plan_photos(photos, export_path, name_pattern="")
+    os.makedirs(tmp_path / "export" / "2019_12_14")
+    (tmp_path / "export" / "2019_12_14" / "DSC_0001(1).NEF").write_text("taken")
+    execute_plan(plan)
+
+    # The next name is counted from the photo's name and it is reserved, so the next photo doesn't take it
+    assert (tmp_path / "export" / "2019_12_14" / "DSC_0001.NEF").read_text() == "card_a"
+    assert (tmp_path / "export" / "2019_12_14" / "DSC_0001(1).NEF").read_text() == "taken"
+    assert (tmp_path / "export" / "2019_12_14" / "DSC_0001(3).NEF").read_text() == "card_b"
+    assert (tmp_path / "export" / "2019_12_14" / "DSC_0001(2).NEF").read_text() == "card_c"
+    with open(tmp_path / "export" / "transferred.csv") as report_file:
+        assert "DSC_0001(3).NEF" in report_file.read()
+
+def test_execute_plan_through_a_transfer_scheduler(tmp_path):
+    """ Test for src\\photonomist\\__main__ > execute_plan with a TransferScheduler
+    """
+    export_path = str(tmp_path / "export")
+    os.makedirs(export_path)
+    os.makedirs(tmp_path / "card")
+    photos = []
+    for i in range(5):
+        (tmp_path / "card" / f"DSC_000{i}.NEF").write_text(str(i))
+        photos.append(Photo(str(tmp_path / "card" / f"DSC_000{i}.NEF"), metadata={"DateTimeOriginal": f"2019:12:1{i} 15:04:33"}))
+    plan = plan_photos(photos, export_path, name_pattern="")
+    with TransferScheduler(max_transfers=3) as scheduler:
+        execute_plan(plan, scheduler=scheduler)
+    assert scheduler.transfers == 5
+    assert (tmp_path / "export" / "2019_12_13" / "DSC_0003.NEF").read_text() == "3"
+    assert plan.counts["rename"] == 5
+
+@pytest.mark.parametrize("duplicates, card_left, linked, reported", [
+    ("skip", ["DSC_0042.NEF"], False, False),
+    ("link", [], True, False),
+    ("report", ["DSC_0042.NEF"], False, True),
+])
+def test_tidy_photos_handles_duplicates(tmp_path, duplicates, card_left, linked, reported):
+    """ Test for src\\photonomist\\__main__ > tidy_photos with duplicate detection
+    """
+    export_path = str(tmp_path / "export")
+    os.makedirs(os.path.join(export_path, "2019_12_14"))
+    (tmp_path / "export" / "2019_12_14" / "DSC_0042.NEF").write_text("the same photo")
+    os.makedirs(tmp_path / "card")
+    (tmp_path / "card" / "DSC_0042.NEF").write_text("the same photo")
+    source = str(tmp_path / "card" / "DSC_0042.NEF")
+
+    plan = plan_photos([Photo(source, metadata={"DateTimeOriginal": "2019:12:14 15:04:33"})], export_path, name_pattern="")
+    plan.add_duplicates(DuplicateFinder().find(export_path, plan.pending_moves()), duplicates)
+    events = []
+    progress = ProgressTracker(events.append, total=1)
+    execute_plan(plan, progress=progress)
+    progress.finish()
+
+    assert os.listdir(tmp_path / "card") == card_left
+    destination = tmp_path / "export" / "2019_12_14" / "DSC_0042(1).NEF"
+    assert destination.exists() == (duplicates == "link")
+    if linked:
+        assert os.path.samefile(destination, tmp_path / "export" / "2019_12_14" / "DSC_0042.NEF")
+    # A skipped duplicate is only counted, a reported one is written in the report too
+    assert plan.counts["skip"] == (duplicates == "skip")
+    report_path = tmp_path / "export" / "not_transferred.csv"
+    assert (report_path.exists() and "duplicate" in report_path.read_text()) == reported
+    # The duplicate is counted once, whatever is done with it
+    assert (events[-1].files, events[-1].total) == (1, 1)
+
+def test_executed_plan_can_be_undone(tmp_path):
+    """ Test for src\\photonomist\\__main__ > execute_plan with a MoveManifest
+    """
+    export_path = str(tmp_path / "export")
+    os.makedirs(export_path)
+    os.makedirs(tmp_path / "card")
+    photos = []
+    for i in range(3):
+        (tmp_path / "card" / f"DSC_000{i}.NEF").write_text(str(i))
+        photos.append(Photo(str(tmp_path / "card" / f"DSC_000{i}.NEF"), metadata={"DateTimeOriginal": f"2019:12:1{i} 15:04:33"}))
+    plan = plan_photos(photos, export_path, name_pattern="")
+    with MoveManifest(str(tmp_path / "manifest.csv")) as manifest:
+        execute_plan(plan, jobs=2, manifest=manifest)
+    assert os.listdir(tmp_path / "card") == []
+
+    assert undo_run(str(tmp_path / "manifest.csv"))["undone"] == 3
+    assert sorted(os.listdir(tmp_path / "card")) == ["DSC_0000.NEF", "DSC_0001.NEF", "DSC_0002.NEF"]
+    assert sorted(os.listdir(export_path)) == ["transferred.csv"]
+
+def test_photos_in_the_folder_of_their_cached_date_are_organized(tmp_path):
+    """ Test for src\\photonomist\\__main__ > already_organized
+    """
+    for folder in ("2019_12_14", "2019_12_14_paris", "holidays"):
+        os.makedirs(tmp_path / folder)
+        (tmp_path / folder / "DSC_0001.NEF").write_text("not a photo")
+    with MetadataCache(str(tmp_path / "cache.sqlite")) as cache:
+        for folder in ("2019_12_14", "2019_12_14_paris", "holidays"):
+            cache.put(str(tmp_path / folder / "DSC_0001.NEF"), {"DateTimeOriginal": "2019:12:14 15:04:33"})
+        assert already_organized(str(tmp_path / "2019_12_14" / "DSC_0001.NEF"), cache, name_pattern="")
+        assert not already_organized(str(tmp_path / "2019_12_14_paris" / "DSC_0001.NEF"), cache, name_pattern="")
+        assert not already_organized(str(tmp_path / "holidays" / "DSC_0001.NEF"), cache, name_pattern="")
+        (tmp_path / "2019_12_14" / "DSC_0001.NEF").write_text("changed")
+        # Not cached anymore, it has to be opened
+        assert not already_organized(str(tmp_path / "2019_12_14" / "DSC_0001.NEF"), cache, name_pattern="")
+        # The folder of the same date, which was created with another name pattern
+        shutil.rmtree(tmp_path / "2019_12_14")
+        assert already_organized(str(tmp_path / "2019_12_14_paris" / "DSC_0001.NEF"), cache, name_pattern="", export_index=ExportIndex(str(tmp_path)))
+
+def test_tidy_photos_records_the_metrics_of_the_run(tmp_path):
+    """ Test for src\\photonomist\\__main__ > input_path_validation, export_path_validation, tidy_photos with RunMetrics
+    """
+    export_path = str(tmp_path / "export")
+    os.makedirs(export_path)
+    cache_path = str(tmp_path / "cache.sqlite")
+    with MetadataCache(cache_path) as cache:
+        for card in ("card_a", "card_b"):
+            os.makedirs(tmp_path / "photos" / card)
+            (tmp_path / "photos" / card / "DSC_0001.NEF").write_text(card)
+            cache.put(str(tmp_path / "photos" / card / "DSC_0001.NEF"), {"DateTimeOriginal": "2019:12:14 15:04:33"})
+    (tmp_path / "photos" / "card_b" / "no_date.jpg").write_text("no exif")
+
+    metrics = RunMetrics()
+    photos_roots = input_path_validation(str(tmp_path / "photos"), metrics)
+    export_path_validation(export_path, str(tmp_path / "photos"), photos_roots, metrics)
+    tidy_photos(export_path, photos_roots, name_pattern="", cache_path=cache_path, metrics=metrics)
+
+    report = metrics.to_dict()
+    assert {"input_path", "traversal", "export_path", "exif", "planning", "execution"} <= set(report["stages"])
+    assert report["latencies"]["exif"]["count"] == report["latencies"]["planning"]["count"] == 3
+    assert report["latencies"]["rename"]["count"] == 2
+    assert report["counters"]["traversed_photos"] == report["counters"]["photos"] == 3
+    assert (report["counters"]["moves"], report["counters"]["unplaced"], report["counters"]["name_collisions"]) == (2, 1, 1)
+    assert (report["counters"]["cache_hits"], report["counters"]["cache_misses"]) == (2, 1)
+    assert sorted(os.listdir(tmp_path / "export" / "2019_12_14")) == ["DSC_0001(1).NEF", "DSC_0001.NEF"]
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_tidy_photos_sends_its_progress(tmp_path, jobs):
+    """ Test for src\\photonomist\\__main__ > tidy_photos with a progress sink
+    """
+    export_path = str(tmp_path / "export")
+    os.makedirs(export_path)
+    cache_path = str(tmp_path / "cache.sqlite")
+    with MetadataCache(cache_path) as cache:
+        for number in range(5):
+            photo_path = tmp_path / "photos" / f"DSC_000{number}.NEF"
+            os.makedirs(photo_path.parent, exist_ok=True)
+            photo_path.write_text("photo")
+            cache.put(str(photo_path), {"DateTimeOriginal": "2019:12:14 15:04:33"})
+    (tmp_path / "photos" / "no_date.jpg").write_text("no exif")
+
+    events = []
+    tidy_photos(export_path, traverse_photos_path(str(tmp_path / "photos")), name_pattern="", jobs=jobs, cache_path=cache_path,
+                batch_size=2, progress=events.append)
+    assert events[-1].done
+    assert (events[-1].files, events[-1].total, events[-1].bytes, events[-1].failures) == (6, 6, 25, 1)
+    assert events[-1].last_failure[0] == str(tmp_path / "photos" / "no_date.jpg")
+    assert not any(event.done for event in events[:-1])
+
+def test_progress_of_an_already_organized_tree_is_complete(tmp_path):
+    """ Test for src\\photonomist\\__main__ > tidy_photos with a progress sink (the photos are already in their folders)
+    """
+    export_path = str(tmp_path / "export")
+    cache_path = str(tmp_path / "cache.sqlite")
+    with MetadataCache(cache_path) as cache:
+        for number in range(3):
+            photo_path = tmp_path / "export" / "2019_12_14" / f"DSC_000{number}.NEF"
+            os.makedirs(photo_path.parent, exist_ok=True)
+            photo_path.write_text("photo")
+            cache.put(str(photo_path), {"DateTimeOriginal": "2019:12:14 15:04:33"})
+
+    events = []
+    plan = tidy_photos(export_path, traverse_photos_path(export_path), name_pattern="", cache_path=cache_path, progress=events.append)
+    assert plan.counts["organized"] == 3
+    assert (events[-1].files, events[-1].total) == (3, 3)
+
+@pytest.mark.parametrize("transfers", [1, 3])
+def test_watch_moves_the_photos_of_a_hot_folder(tmp_path, transfers):
+    """ Test for src\\photonomist\\__main__ > watch_photos
+    """
+    export_path = str(tmp_path / "export")
+    os.makedirs(export_path)
+    os.makedirs(tmp_path / "drop")
+    cache_path = str(tmp_path / "cache.sqlite")
+    with MetadataCache(cache_path) as cache:
+        for i in range(3):
+            (tmp_path / "drop" / f"DSC_000{i}.NEF").write_text(str(i))
+            cache.put(str(tmp_path / "drop" / f"DSC_000{i}.NEF"), {"DateTimeOriginal": f"2019:12:1{i} 15:04:33"})
+    (tmp_path / "drop" / "no_date.jpg").write_text("no exif")
+
+    with TransferScheduler(max_transfers=transfers) if transfers > 1 else contextlib.nullcontext() as scheduler:
+        counts = watch_photos(str(tmp_path / "drop"), export_path, name_pattern="", cache_path=cache_path, settle=0, interval=0.05,
+                              scheduler=scheduler, polls=3)
+    assert (counts["rename"], counts["unplaced"], counts["polls"]) == (3, 1, 3)
+    assert os.listdir(tmp_path / "drop") == ["no_date.jpg"]
+    assert (tmp_path / "export" / "2019_12_12" / "DSC_0002.NEF").read_text() == "2"
+
+def test_watch_never_overwrites_and_reports_missing_photos(tmp_path, monkeypatch):
+    """ Test for src\\photonomist\\__main__ > watch_photos (a file added to a photo folder, a photo removed from the hot folder)
+    """
+    import photonomist.__main__ as main_module
+    export_path = str(tmp_path / "export")
+    os.makedirs(tmp_path / "export" / "2019_12_10")
+    os.makedirs(tmp_path / "drop")
+    cache_path = str(tmp_path / "cache.sqlite")
+    with MetadataCache(cache_path) as cache:
+        for name in ("DSC_0000.NEF", "DSC_0001.NEF", "gone.NEF"):
+            (tmp_path / "drop" / name).write_text(name)
+            cache.put(str(tmp_path / "drop" / name), {"DateTimeOriginal": "2019:12:10 15:04:33"})
+
+    original_transfer_photo = main_module.transfer_photo
+    moved = []
+    def transfer_photo(photo_path, *args, **kwargs):
+        if os.path.basename(photo_path) == "gone.NEF":
+            os.remove(photo_path)
+        result = original_transfer_photo(photo_path, *args, **kwargs)
+        if result is not None and not moved:
+            # The registry listed the folder, then a file with the name of the other photo is added to it
+            moved.append({"DSC_0000.NEF": "DSC_0001.NEF", "DSC_0001.NEF": "DSC_0000.NEF"}[os.path.basename(photo_path)])
+            (tmp_path / "export" / "2019_12_10" / moved[0]).write_text("added from outside")
+        return result
+    monkeypatch.setattr(main_module, "transfer_photo", transfer_photo)
+    counts = watch_photos(str(tmp_path / "drop"), export_path, name_pattern="", cache_path=cache_path, settle=0, interval=0.05, polls=2)
+
+    assert counts["rename"] == 2
+    assert (tmp_path / "export" / "2019_12_10" / moved[0]).read_text() == "added from outside"
+    assert (tmp_path / "export" / "2019_12_10" / moved[0].replace(".NEF", "(1).NEF")).read_text() == moved[0]
+    assert [row["reason"] for row in read_report(str(tmp_path / "export" / "not_transferred.csv"))] == ["missing"]
+
+def test_resumed_run_skips_the_finished_photos(tmp_path):
+    """ Test for src\\photonomist\\__main__ > execute_plan, recover_journal, tidy_photos with a TransferJournal
+    """
+    export_path = str(tmp_path / "export")
+    os.makedirs(export_path)
+    os.makedirs(tmp_path / "card")
+    photos = []
+    for i in range(3):
+        (tmp_path / "card" / f"DSC_000{i}.NEF").write_text(str(i))
+        photos.append(Photo(str(tmp_path / "card" / f"DSC_000{i}.NEF"), metadata={"DateTimeOriginal": "2019:12:14 15:04:33"}))
+    (tmp_path / "card" / "no_date.jpg").write_text("no exif")
+    journal_path = str(tmp_path / "journal.jsonl")
+
+    # The first run places a photo and reports another, then it is interrupted after journaling a move
+    with TransferJournal(journal_path) as journal:
+        plan = plan_photos(photos[:1], export_path, name_pattern="")
+        plan.add_unplaced(str(tmp_path / "card" / "no_date.jpg"), "no_exif")
+        execute_plan(plan, journal=journal)
+        journal.plan(plan_photos(photos[1:2], export_path, name_pattern=""))
+
+    with TransferJournal(journal_path) as journal:
+        with UnplacedReport(str(tmp_path / "report.csv")) as report, TransferReport(str(tmp_path / "transferred.csv")) as transfer_report:
+            recover_journal(journal, report, transfer_report)
+        assert os.path.exists(tmp_path / "export" / "2019_12_14" / "DSC_0001.NEF")
+        plan = tidy_photos(export_path, traverse_photos_path(str(tmp_path / "card")), name_pattern="", journal=journal)
+    assert plan.counts["unplaced"] == 1
+    assert [row["source"] for row in read_report(os.path.join(export_path, "not_transferred.csv"))] == [
+        str(tmp_path / "card" / "no_date.jpg"), str(tmp_path / "card" / "DSC_0002.NEF")]
+    assert not os.path.exists(journal_path)
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_tidy_photos_cancelled_between_two_moves(tmp_path, jobs):
+    """ Test for src\\photonomist\\__main__ > tidy_photos with a JobControl which is cancelled
+    """
+    export_path = str(tmp_path / "export")
+    os.makedirs(export_path)
+    cache_path = str(tmp_path / "cache.sqlite")
+    with MetadataCache(cache_path) as cache:
+        for number in range(6):
+            photo_path = tmp_path / "card" / f"DSC_000{number}.NEF"
+            os.makedirs(photo_path.parent, exist_ok=True)
+            photo_path.write_text(str(number))
+            cache.put(str(photo_path), {"DateTimeOriginal": "2019:12:14 15:04:33"})
+    journal_path = str(tmp_path / "journal.jsonl")
+    manifest_path = str(tmp_path / "manifest.csv")
+
+    control = JobControl()
+    # It's cancelled as soon as the second move is counted (every move is an event)
+    progress = ProgressTracker(lambda event: control.cancel() if event.files >= 2 else None, interval=0)
+    with TransferJournal(journal_path) as journal:
+        plan = tidy_photos(export_path, traverse_photos_path(str(tmp_path / "card")), name_pattern="", jobs=jobs, cache_path=cache_path,
+                           batch_size=3, journal=journal, manifest_path=manifest_path, progress=progress, control=control)
+    moved = sorted(os.listdir(tmp_path / "export" / "2019_12_14"))
+    left = sorted(os.listdir(tmp_path / "card"))
+    # No photo is lost or half moved, the second batch never started
+    assert sorted(moved + left) == [f"DSC_000{number}.NEF" for number in range(6)]
+    assert plan.counts["rename"] == len(moved) >= 2
+    assert plan.counts["cancelled"] == 3 - len(moved)
+    # The moves which were done are recorded
+    assert sorted(os.path.basename(destination) for batch in read_manifest(manifest_path) for _, destination, _, _ in batch) == moved
+    # The journal is kept for a resume
+    assert os.path.exists(journal_path)
+
+@pytest.mark.parametrize("argv, expected", [
+    ([], 1),
+    (["--jobs", "4"], 4),
+    (["-j", "8"], 8),
+])
+def test_jobs_argument(argv, expected):
+    """ Test for src\\photonomist\\__main__ > main_args
+    """
+    assert main_args(argv).jobs == expected
+
 @pytest.mark.parametrize("random_slashes_path, expected", [
     ("this/is/a/random/path/with/backslashes", "this\\is\\a\\random\\path\\with\\backslashes"),
     ("this/is\\a\\random/path/with/backslashes", "this\\is\\a\\random\\path\\with\\backslashes"),
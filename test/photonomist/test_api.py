@@ -7,8 +7,13 @@ precedence over the version in this project directory. Use a virtualenv test
 environment or setuptools develop mode to test against the development version.
 
 """
+import logging
+
 import pytest
 from photonomist.api import *  # tests __all__
+from photonomist.core.config import config
+from photonomist.core.logger import logger
+from photonomist.metadata_cache import MetadataCache, default_cache_path
 
 
 def test_hello():
@@ -27,6 +32,92 @@ def test_hello_name():
     return
 
 
+@pytest.mark.parametrize("settings, folder", [
+    ({}, "2019_12_14"),
+    ({"group": "month", "name_pattern": "_paris"}, "2019_12_paris"),
+])
+def test_organize(tmp_path, monkeypatch, settings, folder):
+    """ Test the organize() function (with the settings of the config file).
+
+    """
+    monkeypatch.setitem(config, "organize", settings)
+    (tmp_path / "card").mkdir()
+    (tmp_path / "export").mkdir()
+    with MetadataCache(default_cache_path(str(tmp_path / "export"))) as cache:
+        for name in ("DSC_0001.NEF", "DSC_0002.NEF"):
+            (tmp_path / "card" / name).write_bytes(name.encode())
+            cache.put(str(tmp_path / "card" / name), {"DateTimeOriginal": "2019:12:14 15:04:33"})
+    (tmp_path / "card" / "no_date.jpg").write_bytes(b"no exif")
+
+    counts = organize(str(tmp_path / "card"), str(tmp_path / "export"), dry_run=True)
+    assert (counts["moves"], counts["unplaced"]) == (2, 1)
+    assert len(list((tmp_path / "card").iterdir())) == 3
+    counts = organize(str(tmp_path / "card"), str(tmp_path / "export"), metrics=str(tmp_path / "metrics.json"))
+    assert (counts["rename"], counts["unplaced"]) == (2, 1)
+    assert sorted(path.name for path in (tmp_path / "export" / folder).iterdir()) == ["DSC_0001.NEF", "DSC_0002.NEF"]
+    assert (tmp_path / "metrics.json").exists()
+    with pytest.raises(RuntimeError):
+        organize(str(tmp_path / "missing"), str(tmp_path / "export"))
+    return
+
+
+def test_organize_reports_duplicates(tmp_path, monkeypatch):
+    """ Test the organize() function with reported duplicates (left in place).
+
+    """
+    monkeypatch.setitem(config, "organize", {})
+    (tmp_path / "card").mkdir()
+    (tmp_path / "export" / "2019_12_14").mkdir(parents=True)
+    (tmp_path / "export" / "2019_12_14" / "DSC_0001.NEF").write_bytes(b"DSC_0001.NEF")
+    with MetadataCache(default_cache_path(str(tmp_path / "export"))) as cache:
+        for name in ("DSC_0001.NEF", "DSC_0002.NEF"):
+            (tmp_path / "card" / name).write_bytes(name.encode())
+            cache.put(str(tmp_path / "card" / name), {"DateTimeOriginal": "2019:12:14 15:04:33"})
+    messages = []
+    handler = logging.Handler()
+    handler.emit = lambda record: messages.append(record.getMessage())
+    logger.addHandler(handler)
+    try:
+        counts = organize(str(tmp_path / "card"), str(tmp_path / "export"), duplicates="report", progress=0)
+    finally:
+        logger.removeHandler(handler)
+    assert (counts["rename"], counts["duplicates"]) == (1, 1)
+    assert [path.name for path in (tmp_path / "card").iterdir()] == ["DSC_0001.NEF"]
+    assert any(message.endswith("1 photos moved, 1 not moved") for message in messages)
+    return
+
+
+def test_rebuild_index(tmp_path):
+    """ Test the rebuild_index() function.
+
+    """
+    (tmp_path / "2019_12_14").mkdir()
+    (tmp_path / "2019_12_14" / "DSC_0042.NEF").write_bytes(b"raw")
+    assert rebuild_index(str(tmp_path)) == {"added": 1, "updated": 0, "removed": 0, "unchanged": 0}
+    assert rebuild_index(str(tmp_path))["unchanged"] == 1
+    return
+
+
+def test_undo(tmp_path):
+    """ Test the undo() function.
+
+    """
+    (tmp_path / "card").mkdir()
+    (tmp_path / "export" / "2019_12_14").mkdir(parents=True)
+    (tmp_path / "export" / "2019_12_14" / "DSC_0042.NEF").write_bytes(b"raw")
+    manifest = tmp_path / "export" / ".photonomist_manifests" / "run.csv"
+    manifest.parent.mkdir()
+    manifest.write_text("source,destination,size,mtime_ns\n{:s},{:s},3,{:d}\n".format(
+        str(tmp_path / "card" / "DSC_0042.NEF"), str(tmp_path / "export" / "2019_12_14" / "DSC_0042.NEF"),
+        (tmp_path / "export" / "2019_12_14" / "DSC_0042.NEF").stat().st_mtime_ns))
+    assert undo(export_path=str(tmp_path / "export")) == {"undone": 1, "folders": 1}
+    assert (tmp_path / "card" / "DSC_0042.NEF").read_bytes() == b"raw"
+    assert not manifest.exists()
+    with pytest.raises(RuntimeError):
+        undo(export_path=str(tmp_path / "export"))
+    return
+
+
 # Make the script executable.
 
 if __name__ == "__main__":
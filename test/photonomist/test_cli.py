@@ -43,6 +43,31 @@ def test_main_none():
     assert exinfo.value.code == 1
 
 
+def test_main_organize(tmp_path):
+    """ Test the main() function with the organize command.
+
+    """
+    (tmp_path / "card").mkdir()
+    (tmp_path / "export").mkdir()
+    (tmp_path / "card" / "no_date.jpg").write_bytes(b"no exif")
+    report = tmp_path / "report.csv"
+    argv = ["organize", str(tmp_path / "card"), str(tmp_path / "export"), "--no-cache", "--jobs", "2", "--report", str(report)]
+    assert main(argv) == 0
+    assert "no_date.jpg" in report.read_text()
+    # The input path doesn't exist
+    assert main(["organize", str(tmp_path / "missing"), str(tmp_path / "export")]) == 1
+    return
+
+
+def test_main_rebuild_index(tmp_path):
+    """ Test the main() function with the rebuild-index command.
+
+    """
+    assert main(["rebuild-index", str(tmp_path)]) == 0
+    assert (tmp_path / ".photonomist_library.sqlite").exists()
+    return
+
+
 def test_script(command):
     """ Test command line execution.
 
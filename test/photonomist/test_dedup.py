@@ -0,0 +1,65 @@
+"""Test suite for the DuplicateFinder Class.
+
+This test suite aims to test that byte-identical photos are found by size, partial hash and full hash,
+both against the files of the destination folder and against each other.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import os
+
+import pytest
+from photonomist.dedup import DuplicateFinder
+from photonomist.transfer_plan import Move
+
+RAW = bytes(range(256)) * 1024
+
+@pytest.fixture
+def export_path(tmp_path):
+    os.makedirs(tmp_path / "export" / "2019_12_14")
+    (tmp_path / "export" / "2019_12_14" / "DSC_0042.NEF").write_bytes(RAW)
+    os.makedirs(tmp_path / "card")
+    return str(tmp_path / "export")
+
+def card_move(tmp_path, file_name, data, folder="2019_12_14"):
+    (tmp_path / "card" / file_name).write_bytes(data)
+    return Move(str(tmp_path / "card" / file_name), folder, file_name)
+
+def test_photo_which_already_exists_in_its_folder(tmp_path, export_path):
+    """Test src\\photonomist\\dedup.DuplicateFinder> find
+    """
+    duplicate = card_move(tmp_path, "DSC_0042.NEF", RAW)
+    other = card_move(tmp_path, "DSC_0043.NEF", RAW[:-1] + b"x")
+    originals = DuplicateFinder(jobs=2).find(export_path, [duplicate, other])
+    assert originals == {duplicate: os.path.join(export_path, "2019_12_14", "DSC_0042.NEF")}
+
+def test_only_partial_matches_are_fully_hashed(tmp_path, export_path):
+    """Test src\\photonomist\\dedup.DuplicateFinder> find (partial hash)
+    """
+    # Same size, same beginning and end, different middle
+    middle = bytearray(RAW)
+    middle[len(RAW) // 2] ^= 0xFF
+    finder = DuplicateFinder(partial_size=1024)
+    assert finder.find(export_path, [card_move(tmp_path, "DSC_0044.NEF", bytes(middle))]) == {}
+    assert finder.hashed == {"partial": 2, "full": 2}
+    # Same size, different beginning: no full hash
+    finder = DuplicateFinder(partial_size=1024)
+    assert finder.find(export_path, [card_move(tmp_path, "DSC_0045.NEF", b"y" + RAW[1:])]) == {}
+    assert finder.hashed == {"partial": 2}
+
+def test_duplicates_within_the_moves_and_across_batches(tmp_path, export_path):
+    """Test src\\photonomist\\dedup.DuplicateFinder> find (incoming photos)
+    """
+    finder = DuplicateFinder()
+    first = card_move(tmp_path, "IMG_1.JPG", b"jpeg", folder="2020_10_25")
+    second = card_move(tmp_path, "IMG_2.JPG", b"jpeg", folder="2020_10_25")
+    assert finder.find(export_path, [first, second]) == {second: os.path.join(export_path, "2020_10_25", "IMG_1.JPG")}
+    third = card_move(tmp_path, "IMG_3.JPG", b"jpeg", folder="2020_10_25")
+    assert finder.find(export_path, [third]) == {third: os.path.join(export_path, "2020_10_25", "IMG_1.JPG")}
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
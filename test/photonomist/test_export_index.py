@@ -0,0 +1,68 @@
+"""Test suite for the ExportIndex Class.
+
+This test suite aims to test that the folders of the export path are indexed once,
+by name and by date prefix, and that the index follows the folders which are created.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import os
+
+import pytest
+from photonomist.export_index import ExportIndex, date_key
+from photonomist.__main__ import photo_dir
+
+@pytest.mark.parametrize("dir_name, expected", [
+    ("2019_12_14_place_reason_people", "2019_12_14"),
+    ("2019_12_14", "2019_12_14"),
+    ("2019_12_people", "2019_12"),
+    ("2019_place", "2019"),
+    ("holidays_2019", None),
+    ("20191214", None),
+])
+def test_date_key(dir_name, expected):
+    """Test src\\photonomist\\export_index > date_key
+    """
+    assert date_key(dir_name) == expected
+
+@pytest.fixture
+def export_path(tmp_path):
+    for dir_name in ("2019_12_14_place_reason_people", "2019_12_14_work", "holidays"):
+        os.makedirs(tmp_path / dir_name)
+    (tmp_path / "2020_01_01_not_a_folder.txt").write_text("")
+    return str(tmp_path)
+
+def test_index_contains_only_folders(export_path):
+    """Test src\\photonomist\\export_index.ExportIndex> __contains__
+    """
+    export_index = ExportIndex(export_path)
+    assert len(export_index) == 3
+    assert "holidays" in export_index
+    assert "2020_01_01_not_a_folder.txt" not in export_index
+
+@pytest.mark.parametrize("dir_name, expected", [
+    ("2019_12_14_work", "2019_12_14_work"),
+    ("2019_12_14_place", "2019_12_14_place_reason_people"),
+    ("2019_12_place", None),
+    ("2019_12_15_place", None),
+])
+def test_folder_for_finds_folders_of_earlier_name_patterns(export_path, dir_name, expected):
+    """Test src\\photonomist\\export_index.ExportIndex> folder_for
+    """
+    assert ExportIndex(export_path).folder_for(dir_name) == expected
+
+def test_photo_dir_reuses_and_registers_folders(export_path):
+    """Test src\\photonomist\\__main__ > photo_dir
+    """
+    export_index = ExportIndex(export_path)
+    assert photo_dir("2019:12:14", export_path, name_pattern="_place", export_index=export_index) == "2019_12_14_place_reason_people"
+    assert photo_dir("2019:12:15", export_path, name_pattern="_place", export_index=export_index) == "2019_12_15_place"
+    assert os.path.isdir(os.path.join(export_path, "2019_12_15_place"))
+    assert "2019_12_15_place" in export_index
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
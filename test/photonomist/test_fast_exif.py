@@ -0,0 +1,87 @@
+"""Test suite for the fast_exif module.
+
+This test suite aims to test the bounded-read EXIF reader on tiny, hand-made JPEG and TIFF files.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import struct
+
+import pytest
+from photonomist.fast_exif import read_exif_tags, ExifError, NoExifError
+from photonomist import photo as photo_module
+from photonomist.photo import Photo
+
+
+def tiff_bytes(date:str, endian:str="<")->bytes:
+    """Builds a TIFF structure: header --> IFD0 (Exif pointer) --> Exif IFD (DateTimeOriginal)
+    """
+    date_bytes = date.encode("ascii") + b"\x00"
+    header = (b"II*\x00" if endian == "<" else b"MM\x00*") + struct.pack(endian + "I", 8)
+    ifd0 = struct.pack(endian + "H", 1) + struct.pack(endian + "HHII", 0x8769, 4, 1, 26) + struct.pack(endian + "I", 0)
+    exif_ifd = struct.pack(endian + "H", 1) + struct.pack(endian + "HHII", 0x9003, 2, len(date_bytes), 44) + struct.pack(endian + "I", 0)
+    return header + ifd0 + exif_ifd + date_bytes
+
+def jpeg_bytes(date:str)->bytes:
+    """Builds a JPEG with an APP0 (JFIF) segment followed by the Exif APP1 segment
+    """
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    exif = b"Exif\x00\x00" + tiff_bytes(date)
+    app1 = b"\xff\xe1" + struct.pack(">H", len(exif) + 2) + exif
+    return b"\xff\xd8" + app0 + app1 + b"\xff\xda\x00\x02" + b"\x00" * 64 + b"\xff\xd9"
+
+@pytest.mark.parametrize("endian", ["<", ">"])
+def test_read_date_from_tiff(tmp_path, endian):
+    """Test src\\photonomist\\fast_exif > read_exif_tags (NEF/CR2 are TIFF based)
+    """
+    photo_path = tmp_path / "DSC_0262.NEF"
+    photo_path.write_bytes(tiff_bytes("2019:12:14 15:04:33", endian))
+    assert read_exif_tags(str(photo_path)) == {"DateTimeOriginal": "2019:12:14 15:04:33"}
+
+def test_read_date_from_jpeg(tmp_path):
+    """Test src\\photonomist\\fast_exif > read_exif_tags
+    """
+    photo_path = tmp_path / "DSC_1402.JPG"
+    photo_path.write_bytes(jpeg_bytes("2020:04:24 10:00:00"))
+    assert read_exif_tags(str(photo_path)) == {"DateTimeOriginal": "2020:04:24 10:00:00"}
+
+@pytest.mark.parametrize("content", [
+    b"",
+    b"not a photo at all",
+    b"\xff\xd8\xff\xda\x00\x02",
+    tiff_bytes("2019:12:14 15:04:33")[:30],
+])
+def test_invalid_photos_raise_exif_error(tmp_path, content):
+    """Test src\\photonomist\\fast_exif > read_exif_tags
+    Parametrized to test empty, unknown, EXIF-less and truncated files
+    """
+    photo_path = tmp_path / "photo.jpg"
+    photo_path.write_bytes(content)
+    with pytest.raises(ExifError):
+        read_exif_tags(str(photo_path))
+
+def test_jpeg_without_exif_is_read_once(tmp_path, monkeypatch):
+    """Test src\\photonomist\\fast_exif > read_exif_tags and Photo (no exifread pass for a JPEG without EXIF)
+    Only a JPEG which was parsed up to its image data raises NoExifError, a corrupt one raises ExifError.
+    """
+    photo_path = tmp_path / "screenshot.jpg"
+    photo_path.write_bytes(b"\xff\xd8" + b"\xff\xe0" + struct.pack(">H", 4) + b"\x00\x00" + b"\xff\xda\x00\x02")
+    with pytest.raises(NoExifError):
+        read_exif_tags(str(photo_path))
+    (tmp_path / "corrupt.jpg").write_bytes(b"\xff\xd8" + b"\x00" * 8)
+    with pytest.raises(ExifError) as error:
+        read_exif_tags(str(tmp_path / "corrupt.jpg"))
+    assert not isinstance(error.value, NoExifError)
+
+    def process_file(*args, **kwargs):
+        raise AssertionError("exifread shouldn't read a JPEG without EXIF")
+    monkeypatch.setattr(photo_module.exifread, "process_file", process_file)
+    photo = Photo(str(photo_path))
+    assert (photo.metadata, photo.read_error) == ({}, None)
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
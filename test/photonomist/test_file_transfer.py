@@ -0,0 +1,108 @@
+"""Test suite for the file_transfer module.
+
+This test suite aims to test that photos are renamed on the same file system
+and copied (contents and timestamps) across file systems, by the kernel or through a buffer.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import errno
+import os
+
+import pytest
+from photonomist import file_transfer
+from photonomist.file_transfer import move_file, copy_file, resume_copy, device, RENAME, COPY
+from photonomist.traversal import PhotoEntry
+
+@pytest.fixture
+def source(tmp_path):
+    source = tmp_path / "DSC_0262.NEF"
+    source.write_bytes(b"raw data" * 1000)
+    os.utime(source, ns=(1576335873000000000, 1576335873000000000))
+    return str(source)
+
+def test_same_device_is_renamed(tmp_path, source):
+    """Test src\\photonomist\\file_transfer> move_file (same file system)
+    """
+    inode = os.stat(source).st_ino
+    destination = str(tmp_path / "DSC_0262(1).NEF")
+    assert move_file(source, destination).strategy == RENAME
+    assert os.stat(destination).st_ino == inode
+    assert not os.path.exists(source)
+
+def test_no_clobber_rename(tmp_path, source, monkeypatch):
+    """Test src\\photonomist\\file_transfer> move_file (the destination is taken, with and without hard links)
+    """
+    destination = tmp_path / "DSC_0262(1).NEF"
+    destination.write_bytes(b"another photo")
+    with pytest.raises(FileExistsError):
+        move_file(source, str(destination), no_clobber=True)
+    def unsupported(*args):
+        raise OSError(errno.EPERM, "Operation not permitted")
+    monkeypatch.setattr(os, "link", unsupported)
+    with pytest.raises(FileExistsError):
+        move_file(source, str(destination), no_clobber=True)
+    assert destination.read_bytes() == b"another photo" and os.path.exists(source)
+    assert move_file(source, str(tmp_path / "DSC_0262(2).NEF"), no_clobber=True).strategy == RENAME
+    assert not os.path.exists(source)
+
+def test_other_device_is_copied(tmp_path, source):
+    """Test src\\photonomist\\file_transfer> move_file (other file system)
+    """
+    destination = str(tmp_path / "DSC_0262(1).NEF")
+    transfer = move_file(source, destination, same_device=False)
+    assert transfer.strategy == COPY and transfer.size == 8000
+    assert open(destination, "rb").read() == b"raw data" * 1000
+    assert os.stat(destination).st_mtime_ns == 1576335873000000000
+    assert not os.path.exists(source)
+
+def test_failed_copy_keeps_the_source(tmp_path, source):
+    """Test src\\photonomist\\file_transfer> move_file (the destination folder is missing)
+    """
+    with pytest.raises(FileNotFoundError):
+        move_file(source, str(tmp_path / "missing" / "DSC_0262.NEF"), same_device=False)
+    assert os.path.exists(source)
+
+def test_buffered_copy_when_the_kernel_can_not_copy(tmp_path, source, monkeypatch):
+    """Test src\\photonomist\\file_transfer> copy_file (fallback)
+    """
+    def unsupported(*args):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+    monkeypatch.setattr(file_transfer, "ZERO_COPY_FUNCTIONS", [unsupported])
+    destination = str(tmp_path / "DSC_0262(1).NEF")
+    assert copy_file(source, destination, buffer_size=1000).size == 8000
+    assert open(destination, "rb").read() == open(source, "rb").read()
+
+def test_copy_does_not_overwrite(tmp_path, source):
+    """Test src\\photonomist\\file_transfer> copy_file (existing destination)
+    """
+    destination = tmp_path / "DSC_0262(1).NEF"
+    destination.write_bytes(b"another photo")
+    with pytest.raises(FileExistsError):
+        copy_file(source, str(destination))
+    assert destination.read_bytes() == b"another photo"
+
+def test_device_of_a_photo_entry_is_not_stated_again(source, monkeypatch):
+    """Test src\\photonomist\\file_transfer> device
+    """
+    entry = PhotoEntry(source, os.stat(source))
+    monkeypatch.setattr(os, "stat", lambda *args: pytest.fail("the photo was stat'ed again"))
+    assert device(entry) == entry.stat.st_dev
+
+def test_interrupted_copy_is_finished(tmp_path, source):
+    """Test src\\photonomist\\file_transfer> resume_copy
+    """
+    destination = tmp_path / "DSC_0262(1).NEF"
+    destination.write_bytes(b"raw data" * 400)
+    transfer = resume_copy(source, str(destination))
+    assert transfer.strategy == COPY and transfer.size == 4800
+    assert destination.read_bytes() == b"raw data" * 1000
+    assert os.stat(destination).st_mtime_ns == 1576335873000000000
+    assert resume_copy(source, str(destination)).size == 0
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
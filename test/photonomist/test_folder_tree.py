@@ -0,0 +1,71 @@
+"""Test suite for the FolderTree Class.
+
+This test suite aims to test the hierarchy of the found photo folders, with the counts
+and the sizes of each subtree, the exclusion of whole subtrees and the incremental search.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import os
+
+import pytest
+from photonomist.folder_tree import FolderTree
+from photonomist.__main__ import traverse_photos_path
+
+@pytest.fixture
+def photos_roots(tmp_path):
+    for folder, photos in (("2019/beach", 2), ("2019/beach/sunset", 1), ("2019/Mountains", 3), ("2020", 1)):
+        os.makedirs(tmp_path / "photos" / folder)
+        for number in range(photos):
+            (tmp_path / "photos" / folder / f"DSC_000{number}.jpg").write_bytes(b"x" * 100)
+    return traverse_photos_path(str(tmp_path / "photos"))
+
+def test_folder_tree_hierarchy(tmp_path, photos_roots):
+    """Test src\\photonomist\\folder_tree.FolderTree> __init__, children
+    """
+    photos_path = str(tmp_path / "photos")
+    tree = FolderTree(photos_roots)
+    assert tree.root.path == photos_path
+    assert tree.children(photos_path) == [os.path.join(photos_path, "2019"), os.path.join(photos_path, "2020")]
+    assert tree.children(os.path.join(photos_path, "2019")) == [os.path.join(photos_path, "2019", "beach"), os.path.join(photos_path, "2019", "Mountains")]
+    year = tree.nodes[os.path.join(photos_path, "2019")]
+    # A folder without photos of its own still counts its subfolders
+    assert (year.photos, year.total_photos, year.total_size) == (0, 6, 600)
+    assert (tree.root.total_photos, tree.root.total_size) == (7, 700)
+
+def test_folder_tree_excludes_subtrees(tmp_path, photos_roots):
+    """Test src\\photonomist\\folder_tree.FolderTree> set_included, toggle, state, included_roots
+    """
+    photos_path = str(tmp_path / "photos")
+    beach = os.path.join(photos_path, "2019", "beach")
+    tree = FolderTree(photos_roots)
+    tree.set_included(beach, False)
+    assert tree.state(beach) == tree.state(os.path.join(beach, "sunset")) == "excluded"
+    assert tree.state(os.path.join(photos_path, "2019")) == tree.state(photos_path) == "partial"
+    assert tree.root.excluded_photos == 3
+    assert sorted(tree.included_roots()) == [os.path.join(photos_path, "2019", "Mountains"), os.path.join(photos_path, "2020")]
+
+    tree.set_included(os.path.join(beach, "sunset"), True)
+    assert tree.state(beach) == "partial" and tree.root.excluded_photos == 2
+    tree.toggle(photos_path)
+    assert tree.state(photos_path) == "excluded" and tree.included_roots() == {}
+    tree.toggle(photos_path)
+    assert tree.state(photos_path) == "included" and tree.included_roots() == photos_roots
+
+def test_folder_tree_incremental_search(tmp_path, photos_roots):
+    """Test src\\photonomist\\folder_tree.FolderTree> search
+    """
+    photos_path = str(tmp_path / "photos")
+    tree = FolderTree(photos_roots)
+    assert tree.search("BEACH") == [os.path.join(photos_path, "2019", "beach"), os.path.join(photos_path, "2019", "beach", "sunset")]
+    assert tree.search("beach/sun".replace("/", os.sep)) == [os.path.join(photos_path, "2019", "beach", "sunset")]
+    # A shorter text searches all the folders again
+    assert len(tree.search("20")) == 4
+    assert len(tree.search("20", limit=2)) == 2
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
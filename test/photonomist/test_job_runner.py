@@ -0,0 +1,81 @@
+"""Test suite for the JobRunner Class.
+
+This test suite aims to test that a job runs on a worker thread, that its events
+(progress and end) reach the caller only through the queue and that it can be
+paused, resumed and cancelled at its file boundaries.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import threading
+
+import pytest
+from photonomist.job_runner import JobRunner, JobControl, PROGRESS, DONE, CANCELLED, FAILED
+
+def files_job(files, started=None, gate=None, control=None, progress=None):
+    done = []
+    for number in range(files):
+        if started is not None and number == 1:
+            # The caller acts while the job is between two files
+            started.set()
+            gate.wait(5)
+        if not control.proceed():
+            break
+        done.append(number)
+        progress(len(done))
+    return done
+
+def test_job_runner_done():
+    """Test src\\photonomist\\job_runner.JobRunner> start, poll
+    """
+    job = JobRunner(files_job, 3)
+    job.start()
+    job.join(5)
+    assert not job.running
+    assert job.poll() == [(PROGRESS, 1), (PROGRESS, 2), (PROGRESS, 3), (DONE, [0, 1, 2])]
+    assert job.poll() == []
+
+def test_job_runner_failed():
+    """Test src\\photonomist\\job_runner.JobRunner> start, poll
+    """
+    def failing_job(control=None, progress=None):
+        raise OSError("disk full")
+
+    job = JobRunner(failing_job)
+    job.start()
+    job.join(5)
+    (kind, error), = job.poll()
+    assert kind == FAILED and str(error) == "disk full"
+
+def test_job_runner_paused_and_cancelled():
+    """Test src\\photonomist\\job_runner.JobRunner> pause, cancel
+    """
+    started = threading.Event()
+    gate = threading.Event()
+    job = JobRunner(files_job, 1000, started, gate)
+    job.pause()
+    job.start()
+    # The job waits at its first file boundary
+    job.join(0.2)
+    assert job.running and job.control.paused and job.poll() == []
+    job.resume()
+    started.wait(5)
+    job.cancel()
+    gate.set()
+    job.join(5)
+    assert job.poll() == [(PROGRESS, 1), (CANCELLED, [0])]
+
+def test_job_control_cancel_wakes_up_a_paused_job():
+    """Test src\\photonomist\\job_runner.JobControl> proceed
+    """
+    control = JobControl()
+    control.pause()
+    control.cancel()
+    assert control.proceed() is False and not control.paused
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,100 @@
+"""Test suite for the TransferJournal Class.
+
+This test suite aims to test that the moves of a run are journaled before they start
+and that the moves which an interrupted run left in progress are finished.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import os
+
+import pytest
+from photonomist.journal import TransferJournal, read_journal
+from photonomist.transfer_plan import TransferPlan
+
+RAW = b"raw data" * 1000
+
+@pytest.fixture
+def paths(tmp_path):
+    os.makedirs(tmp_path / "card")
+    os.makedirs(tmp_path / "export" / "2019_12_14")
+    return tmp_path / "card", tmp_path / "export"
+
+def interrupted_run(paths, file_names):
+    """Journals the moves of a plan, as a run which is interrupted before they are done.
+    """
+    card, export = paths
+    plan = TransferPlan(str(export))
+    for file_name in file_names:
+        (card / file_name).write_bytes(RAW)
+        plan.add_move(str(card / file_name), "2019_12_14")
+    with TransferJournal(str(export / "journal.jsonl")) as journal:
+        journal.begin(photos_path=str(card))
+        journal.plan(plan)
+    return str(export / "journal.jsonl")
+
+def test_journal_keeps_the_run(paths):
+    """Test src\\photonomist\\journal.TransferJournal> begin, plan, done
+    """
+    journal_path = interrupted_run(paths, ["DSC_0001.NEF", "DSC_0002.NEF"])
+    with TransferJournal(journal_path) as journal:
+        assert journal.run == {"photos_path": str(paths[0])}
+        assert sorted(journal.started) == [str(paths[0] / "DSC_0001.NEF"), str(paths[0] / "DSC_0002.NEF")]
+        journal.done(str(paths[0] / "DSC_0001.NEF"))
+    assert TransferJournal(journal_path).finished == {str(paths[0] / "DSC_0001.NEF")}
+
+def test_torn_record_is_ignored(paths):
+    """Test src\\photonomist\\journal> read_journal
+    """
+    journal_path = interrupted_run(paths, ["DSC_0001.NEF"])
+    with open(journal_path, "a") as journal_file:
+        journal_file.write('{"kind": "done", "sou')
+    assert [record["kind"] for record in read_journal(journal_path)] == ["run", "move"]
+
+def test_recover(paths):
+    """Test src\\photonomist\\journal.TransferJournal> recover
+    """
+    card, export = paths
+    names = ["moved.NEF", "copied.NEF", "partial.NEF", "waiting.NEF", "foreign.NEF", "lost.NEF", "done.NEF"]
+    journal_path = interrupted_run(paths, names)
+    folder = export / "2019_12_14"
+    os.rename(card / "moved.NEF", folder / "moved.NEF")
+    (folder / "copied.NEF").write_bytes(RAW)
+    (folder / "partial.NEF").write_bytes(RAW[:3000])
+    (folder / "foreign.NEF").write_bytes(b"another photo")
+    os.remove(card / "lost.NEF")
+    os.rename(card / "done.NEF", folder / "done.NEF")
+    with TransferJournal(journal_path) as journal:
+        journal.done(str(card / "done.NEF"))
+
+    with TransferJournal(journal_path) as journal:
+        transfers, missing = journal.recover()
+    recovered = {os.path.basename(source): transfer for source, _, transfer in transfers}
+    assert recovered["moved.NEF"] is None
+    assert recovered["copied.NEF"].size == 0
+    assert recovered["partial.NEF"].size == len(RAW) - 3000
+    assert recovered["waiting.NEF"].strategy == "rename"
+    assert sorted(recovered) == ["copied.NEF", "moved.NEF", "partial.NEF", "waiting.NEF"]
+    assert missing == [str(card / "lost.NEF")]
+    # The destination which was not written by the run is left alone, the photo is processed again
+    assert os.listdir(card) == ["foreign.NEF"]
+    assert (folder / "foreign.NEF").read_bytes() == b"another photo"
+    for name in ("copied.NEF", "partial.NEF", "waiting.NEF"):
+        assert (folder / name).read_bytes() == RAW
+    assert len(TransferJournal(journal_path).finished) == 5
+
+def test_complete_run_removes_the_journal(paths):
+    """Test src\\photonomist\\journal.TransferJournal> complete
+    """
+    journal_path = interrupted_run(paths, ["DSC_0001.NEF"])
+    with TransferJournal(journal_path) as journal:
+        journal.complete()
+    assert not os.path.exists(journal_path)
+
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
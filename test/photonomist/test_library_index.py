@@ -0,0 +1,124 @@
+"""Test suite for the LibraryIndex Class.
+
+This test suite aims to test that the photos of the library are found by size, partial hash and full hash,
+that they are hashed lazily and that the index is reconciled with the archive by rebuild.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import os
+
+import pytest
+from photonomist.dedup import DuplicateFinder
+from photonomist.library_index import LibraryIndex, default_library_index_path
+from photonomist.transfer_plan import Move
+
+RAW = bytes(range(256)) * 1024
+
+@pytest.fixture
+def export_path(tmp_path):
+    os.makedirs(tmp_path / "export" / "2019_12_14")
+    os.makedirs(tmp_path / "export" / "2020_1_1")
+    (tmp_path / "export" / "2019_12_14" / "DSC_0042.NEF").write_bytes(RAW)
+    (tmp_path / "export" / "2020_1_1" / "DSC_0001.JPG").write_bytes(b"jpg" * 100)
+    (tmp_path / "export" / "2020_1_1" / "notes.txt").write_bytes(RAW)
+    os.makedirs(tmp_path / "card")
+    return str(tmp_path / "export")
+
+@pytest.fixture
+def library(export_path):
+    with LibraryIndex(default_library_index_path(export_path)) as library:
+        library.rebuild(export_path)
+        yield library
+
+def test_rebuild_indexes_photos_only(export_path, library):
+    """Test src\\photonomist\\library_index.LibraryIndex> rebuild
+    """
+    assert len(library) == 2
+    assert library.hashed == 0
+
+def test_find_identical_photo(tmp_path, export_path, library):
+    """Test src\\photonomist\\library_index.LibraryIndex> find
+    """
+    (tmp_path / "card" / "IMG_1.NEF").write_bytes(RAW)
+    (tmp_path / "card" / "IMG_2.NEF").write_bytes(RAW[:-1] + b"x")
+    (tmp_path / "card" / "IMG_3.NEF").write_bytes(b"new size")
+    assert library.find(str(tmp_path / "card" / "IMG_1.NEF")) == os.path.join(export_path, "2019_12_14", "DSC_0042.NEF")
+    assert library.find(str(tmp_path / "card" / "IMG_2.NEF")) is None
+    assert library.find(str(tmp_path / "card" / "IMG_3.NEF")) is None
+    # Only the library photo with the same size was hashed (partial and full), and only once
+    assert library.hashed == 2
+
+def test_find_drops_changed_photo(tmp_path, export_path, library):
+    """Test src\\photonomist\\library_index.LibraryIndex> find (stale entry)
+    """
+    library_photo = os.path.join(export_path, "2019_12_14", "DSC_0042.NEF")
+    os.utime(library_photo, ns=(0, 0))
+    (tmp_path / "card" / "IMG_1.NEF").write_bytes(RAW)
+    assert library.find(str(tmp_path / "card" / "IMG_1.NEF")) is None
+    assert len(library) == 1
+
+def test_find_drops_removed_photo(tmp_path, export_path, library):
+    """Test src\\photonomist\\library_index.LibraryIndex> find (photo removed after it was hashed, e.g. by an undo)
+    """
+    (tmp_path / "card" / "IMG_1.NEF").write_bytes(RAW)
+    assert library.find(str(tmp_path / "card" / "IMG_1.NEF")) is not None
+    os.remove(os.path.join(export_path, "2019_12_14", "DSC_0042.NEF"))
+    assert library.find(str(tmp_path / "card" / "IMG_1.NEF")) is None
+    assert len(library) == 1
+
+def test_find_only_checks_the_photos_with_the_same_partial_hash(tmp_path, export_path, library, monkeypatch):
+    """Test src\\photonomist\\library_index.LibraryIndex> find (many library photos of the same size)
+    """
+    for number in range(20):
+        (tmp_path / "export" / "2020_1_1" / f"DSC_1{number:03d}.NEF").write_bytes(RAW[:-3] + b"%03d" % number)
+    library.rebuild(export_path)
+    (tmp_path / "card" / "IMG_1.NEF").write_bytes(RAW[:-3] + b"999")
+    assert library.find(str(tmp_path / "card" / "IMG_1.NEF")) is None
+    # The library photos of the same size were partially hashed once
+    assert library.hashed == 21
+
+    stats = []
+    stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda path, *args, **kwargs: stats.append(path) or stat(path, *args, **kwargs))
+    (tmp_path / "card" / "IMG_2.NEF").write_bytes(RAW[:-3] + b"007")
+    assert library.find(str(tmp_path / "card" / "IMG_2.NEF")) == os.path.join(export_path, "2020_1_1", "DSC_1007.NEF")
+    # Only the library photo with the same partial hash was checked and fully hashed
+    assert [path for path in stats if "export" in str(path)] == [os.path.join(export_path, "2020_1_1", "DSC_1007.NEF")]
+    assert library.hashed == 22
+
+def test_rebuild_is_incremental(tmp_path, export_path, library):
+    """Test src\\photonomist\\library_index.LibraryIndex> rebuild (added, updated, removed, unchanged)
+    """
+    os.remove(os.path.join(export_path, "2020_1_1", "DSC_0001.JPG"))
+    os.utime(os.path.join(export_path, "2019_12_14", "DSC_0042.NEF"), ns=(0, 0))
+    (tmp_path / "export" / "2020_1_1" / "DSC_0002.JPG").write_bytes(b"new")
+    (tmp_path / "export" / "2020_1_1" / "DSC_0003.JPG").write_bytes(b"newer")
+    assert library.rebuild(export_path) == {"added": 2, "updated": 1, "removed": 1, "unchanged": 0}
+    assert library.rebuild(export_path) == {"added": 0, "updated": 0, "removed": 0, "unchanged": 3}
+
+def test_index_persists(tmp_path, export_path, library):
+    """Test src\\photonomist\\library_index.LibraryIndex> close
+    """
+    library.add(str(tmp_path / "card" / "placed.JPG"), os.stat(export_path))
+    library.close()
+    with LibraryIndex(default_library_index_path(export_path)) as reopened:
+        assert len(reopened) == 3
+
+def test_finder_uses_library(tmp_path, export_path, library):
+    """Test src\\photonomist\\dedup.DuplicateFinder> find (library index)
+    """
+    (tmp_path / "card" / "IMG_1.NEF").write_bytes(RAW)
+    (tmp_path / "card" / "IMG_2.NEF").write_bytes(RAW)
+    first = Move(str(tmp_path / "card" / "IMG_1.NEF"), "2021_5_5", "IMG_1.NEF")
+    second = Move(str(tmp_path / "card" / "IMG_2.NEF"), "2021_5_5", "IMG_2.NEF")
+    original = os.path.join(export_path, "2019_12_14", "DSC_0042.NEF")
+    assert DuplicateFinder(jobs=1, library=library).find(export_path, [first, second]) == {first: original, second: original}
+
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
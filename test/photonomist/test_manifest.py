@@ -0,0 +1,94 @@
+"""Test suite for the manifest module.
+
+This test suite aims to test that the placed photos of a run are written in its manifest
+and that a run is undone from its manifest, unless its photos changed since.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import os
+import shutil
+
+import pytest
+from photonomist.manifest import MoveManifest, read_manifest, undo_run, new_manifest_path, latest_manifest_path
+from photonomist.unplaced_report import UnplacedReport, read_report
+
+@pytest.fixture
+def run(tmp_path):
+    """A run which moved 6 photos of two cards into two folders.
+    """
+    export_path = str(tmp_path / "export")
+    manifest_path = new_manifest_path(export_path)
+    with MoveManifest(manifest_path, buffer_size=4) as manifest:
+        for card in ("card_a", "card_b"):
+            os.makedirs(tmp_path / card)
+            for i in range(3):
+                folder = tmp_path / "export" / f"2019_12_1{i}"
+                os.makedirs(folder, exist_ok=True)
+                (tmp_path / card / f"DSC_000{i}.NEF").write_text(card)
+                os.rename(tmp_path / card / f"DSC_000{i}.NEF", folder / f"{card}_{i}.NEF")
+                manifest.add(str(tmp_path / card / f"DSC_000{i}.NEF"), str(folder / f"{card}_{i}.NEF"))
+    return export_path, manifest_path
+
+def test_manifest_is_read_in_batches(run):
+    """Test src\\photonomist\\manifest> read_manifest
+    """
+    export_path, manifest_path = run
+    assert latest_manifest_path(export_path) == manifest_path
+    assert [len(batch) for batch in read_manifest(manifest_path, batch_size=4)] == [4, 2]
+    source, destination, size, mtime_ns = next(read_manifest(manifest_path))[0]
+    assert os.path.basename(destination) == "card_a_0.NEF"
+    assert (size, mtime_ns) == (6, os.stat(destination).st_mtime_ns)
+
+def test_undo_run(tmp_path, run):
+    """Test src\\photonomist\\manifest> undo_run
+    """
+    export_path, manifest_path = run
+    counts = undo_run(manifest_path, jobs=2, batch_size=4)
+    assert counts["undone"] == 6 and counts["folders"] == 3
+    assert sorted(os.listdir(tmp_path / "card_a")) == ["DSC_0000.NEF", "DSC_0001.NEF", "DSC_0002.NEF"]
+    assert os.listdir(export_path) == [".photonomist_manifests"]
+
+def test_undo_leaves_changed_photos(tmp_path, run):
+    """Test src\\photonomist\\manifest> undo_run (changed, missing, occupied)
+    """
+    export_path, manifest_path = run
+    (tmp_path / "export" / "2019_12_10" / "card_a_0.NEF").write_text("edited")
+    os.remove(tmp_path / "export" / "2019_12_11" / "card_a_1.NEF")
+    (tmp_path / "card_b" / "DSC_0002.NEF").write_text("a new photo")
+    report_path = str(tmp_path / "not_undone.csv")
+    with UnplacedReport(report_path) as report:
+        counts = undo_run(manifest_path, report=report)
+    assert (counts["undone"], counts["changed"], counts["missing"], counts["occupied"]) == (3, 1, 1, 1)
+    assert (tmp_path / "export" / "2019_12_10" / "card_a_0.NEF").read_text() == "edited"
+    assert (tmp_path / "card_b" / "DSC_0002.NEF").read_text() == "a new photo"
+    assert sorted(row["reason"] for row in read_report(report_path)) == ["changed", "missing", "occupied"]
+    # Only the folder which was left empty is removed
+    assert sorted(os.listdir(export_path)) == [".photonomist_manifests", "2019_12_10", "2019_12_12"]
+
+def test_undo_of_a_removed_folder(tmp_path, run):
+    """Test src\\photonomist\\manifest> undo_run (the destination folder is gone)
+    """
+    export_path, manifest_path = run
+    shutil.rmtree(tmp_path / "export" / "2019_12_10")
+    counts = undo_run(manifest_path)
+    assert (counts["undone"], counts["missing"]) == (4, 2)
+
+def test_undo_does_not_recreate_folders_in_vain(tmp_path, run):
+    """Test src\\photonomist\\manifest> undo_run (no photo goes back to a removed card)
+    """
+    export_path, manifest_path = run
+    shutil.rmtree(tmp_path / "card_b")
+    for i in range(3):
+        (tmp_path / "export" / f"2019_12_1{i}" / f"card_b_{i}.NEF").write_text("edited")
+    counts = undo_run(manifest_path)
+    assert (counts["undone"], counts["changed"]) == (3, 3)
+    assert not os.path.exists(tmp_path / "card_b")
+
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
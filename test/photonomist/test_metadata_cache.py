@@ -0,0 +1,77 @@
+"""Test suite for the MetadataCache Class.
+
+This test suite aims to test that projected metadata are persisted, invalidated when a photo changes
+and evicted when the cache grows above its limit.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import os
+
+import pytest
+from photonomist.metadata_cache import MetadataCache, default_cache_path
+from photonomist.photo import Photo
+
+METADATA = {"DateTimeOriginal": "2019:12:14 15:04:33", "Model": "NIKON D5500"}
+
+@pytest.fixture
+def photo_path(tmp_path):
+    photo_path = tmp_path / "DSC_0262.NEF"
+    photo_path.write_bytes(b"not really a photo")
+    return str(photo_path)
+
+def test_cached_metadata_survive_reopening(tmp_path, photo_path):
+    """Test src\\photonomist\\metadata_cache.MetadataCache> put, get
+    """
+    cache_path = default_cache_path(str(tmp_path))
+    with MetadataCache(cache_path) as cache:
+        assert cache.get(photo_path) is None
+        cache.put(photo_path, METADATA)
+    with MetadataCache(cache_path) as cache:
+        assert cache.get(photo_path) == METADATA
+        assert cache.hits == 1
+
+def test_modified_photo_is_a_miss(tmp_path, photo_path):
+    """Test src\\photonomist\\metadata_cache.MetadataCache> get
+    """
+    with MetadataCache(default_cache_path(str(tmp_path))) as cache:
+        cache.put(photo_path, METADATA)
+        with open(photo_path, "ab") as photo_file:
+            photo_file.write(b"edited")
+        assert cache.get(photo_path) is None
+
+def test_entries_follow_a_moved_photo(tmp_path, photo_path):
+    """Test src\\photonomist\\metadata_cache.MetadataCache> get (keyed by inode)
+    """
+    with MetadataCache(default_cache_path(str(tmp_path))) as cache:
+        cache.put(photo_path, METADATA)
+        new_path = os.path.join(str(tmp_path), "DSC_0262(1).NEF")
+        os.rename(photo_path, new_path)
+        assert cache.get(new_path) == METADATA
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    """Test src\\photonomist\\metadata_cache.MetadataCache> evict
+    """
+    cache_path = default_cache_path(str(tmp_path))
+    with MetadataCache(cache_path, max_entries=3) as cache:
+        for i in range(5):
+            photo_path = tmp_path / f"photo_{i}.jpg"
+            photo_path.write_text(str(i))
+            cache.put(str(photo_path), METADATA)
+    with MetadataCache(cache_path, max_entries=3) as cache:
+        found = [cache.get(str(tmp_path / f"photo_{i}.jpg")) is not None for i in range(5)]
+    assert found.count(True) == 3
+
+def test_photo_reads_the_cache_before_the_file(tmp_path, photo_path):
+    """Test src\\photonomist\\photo.Photo> __init__ with a cache
+    """
+    with MetadataCache(default_cache_path(str(tmp_path))) as cache:
+        cache.put(photo_path, METADATA)
+        assert Photo(photo_path, cache=cache).get_date() == "2019:12:14"
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,58 @@
+"""Test suite for the NameRegistry Class.
+
+This test suite aims to test that unique names are handed out, after the existing files
+and the already handed out names, also when several threads ask for names at once.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from photonomist.name_registry import NameRegistry
+
+@pytest.fixture
+def folder_path(tmp_path):
+    for file_name in ("DSC_0001.NEF", "DSC_0001(1).NEF", "DSC_0001(3).NEF"):
+        (tmp_path / file_name).write_text("")
+    return str(tmp_path)
+
+def test_reserve_skips_existing_names(folder_path):
+    """Test src\\photonomist\\name_registry.NameRegistry> reserve
+    """
+    registry = NameRegistry()
+    names = [registry.reserve(folder_path, "DSC_0001.NEF") for _ in range(3)]
+    assert names == ["DSC_0001(2).NEF", "DSC_0001(4).NEF", "DSC_0001(5).NEF"]
+    assert registry.reserve(folder_path, "DSC_0002.NEF") == "DSC_0002.NEF"
+
+def test_folder_is_listed_once(folder_path, monkeypatch):
+    """Test src\\photonomist\\name_registry.NameRegistry> reserve (no file system probing)
+    """
+    registry = NameRegistry()
+    registry.reserve(folder_path, "DSC_0001.NEF")
+    monkeypatch.setattr(os, "listdir", lambda *args: pytest.fail("the folder was listed again"))
+    monkeypatch.setattr(os.path, "exists", lambda *args: pytest.fail("a name was probed"))
+    assert registry.reserve(folder_path, "DSC_0001.NEF") == "DSC_0001(4).NEF"
+
+def test_new_folder_is_not_listed(tmp_path):
+    """Test src\\photonomist\\name_registry.NameRegistry> add_folder
+    """
+    registry = NameRegistry()
+    registry.add_folder(str(tmp_path / "2019_12_14"))
+    assert registry.reserve(str(tmp_path / "2019_12_14"), "DSC_0001.NEF") == "DSC_0001.NEF"
+
+def test_names_are_unique_across_threads(folder_path):
+    """Test src\\photonomist\\name_registry.NameRegistry> reserve (thread safety)
+    """
+    registry = NameRegistry()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        names = list(pool.map(lambda _: registry.reserve(folder_path, "DSC_0001.NEF"), range(200)))
+    assert len(set(names)) == 200
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
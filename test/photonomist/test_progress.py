@@ -0,0 +1,81 @@
+"""Test suite for the ProgressTracker Class.
+
+This test suite aims to test the throttling of the progress events, the moving
+average of the rate, the ETA and the sinks (callables and queues).
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import queue
+
+import pytest
+from photonomist import progress as progress_module
+from photonomist.progress import ProgressTracker, ProgressEvent
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(progress_module.time, "monotonic", fake_clock)
+    return fake_clock
+
+def test_progress_tracker_throttles_the_events(clock):
+    """Test src\\photonomist\\progress.ProgressTracker> advance, finish
+    """
+    events = []
+    tracker = ProgressTracker(events.append, total=1000, interval=1.0)
+    for _ in range(500):
+        tracker.advance(1, 10)
+    # No time went by
+    assert events == []
+    clock.now += 1.0
+    tracker.advance(1, 10)
+    assert len(events) == 1
+    assert (events[0].files, events[0].bytes, events[0].total, events[0].done) == (501, 5010, 1000, False)
+    assert events[0].rate == pytest.approx(501)
+    assert events[0].eta == pytest.approx(499 / 501)
+    tracker.finish()
+    assert len(events) == 2 and events[1].done
+
+def test_progress_tracker_moving_average(clock):
+    """Test src\\photonomist\\progress.ProgressTracker> advance
+    """
+    events = []
+    tracker = ProgressTracker(events.append, total=10000, interval=1.0)
+    clock.now += 1.0
+    tracker.advance(100)
+    clock.now += 1.0
+    tracker.advance(1100)
+    # The new throughput (1100/s) only weighs SMOOTHING in the rate
+    assert events[1].rate == pytest.approx(progress_module.SMOOTHING * 1100 + (1 - progress_module.SMOOTHING) * 100)
+    assert events[1].eta == pytest.approx((10000 - 1200) / events[1].rate)
+
+def test_progress_tracker_failures_and_queue(clock):
+    """Test src\\photonomist\\progress.ProgressTracker> fail, add_transfer
+    """
+    class Transfer:
+        size = 0
+
+    events = queue.Queue()
+    tracker = ProgressTracker(events)
+    tracker.fail("a.jpg", "no_exif")
+    tracker.add_transfer("b.jpg", Transfer())
+    tracker.finish()
+    event = events.get_nowait()
+    assert isinstance(event, ProgressEvent)
+    assert (event.files, event.failures, event.last_failure, event.total, event.eta) == (2, 1, ("a.jpg", "no_exif"), None, None)
+    assert event.describe().startswith("2 photos") and "1 not placed" in event.describe()
+    assert events.empty()
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
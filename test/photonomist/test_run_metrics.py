@@ -0,0 +1,72 @@
+"""Test suite for the RunMetrics Class.
+
+This test suite aims to test the timings, the latency histograms and the counters
+of a run, together with its JSON report and its summary.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import json
+import logging
+
+import pytest
+from photonomist.run_metrics import RunMetrics, LatencyHistogram
+
+def test_latency_histogram_percentiles():
+    """Test src\\photonomist\\run_metrics.LatencyHistogram> add, percentile
+    """
+    histogram = LatencyHistogram()
+    for _ in range(98):
+        histogram.add(0.000003)
+    histogram.add(0.0009)
+    histogram.add(0.5)
+    # 3us is counted in the bucket of 4us
+    assert histogram.percentile(50) == pytest.approx(4e-6)
+    assert histogram.percentile(99) == pytest.approx(1024e-6)
+    assert histogram.percentile(100) == 0.5
+    assert histogram.to_dict()["buckets_us"] == {"4": 98, "1024": 1, "524288": 1}
+    assert LatencyHistogram().percentile(50) == 0.0
+
+def test_stages_are_accumulated():
+    """Test src\\photonomist\\run_metrics.RunMetrics> stage, add_stage
+    """
+    metrics = RunMetrics()
+    for _ in range(3):
+        with metrics.stage("exif"):
+            pass
+    metrics.add_stage("exif", 1.0, calls=2)
+    with pytest.raises(ValueError):
+        with metrics.stage("planning"):
+            raise ValueError()
+    stages = metrics.to_dict()["stages"]
+    assert stages["exif"]["calls"] == 5
+    assert stages["exif"]["seconds"] >= 1.0
+    # A stage which failed is timed too
+    assert stages["planning"]["calls"] == 1
+
+def test_report_is_written_and_summarized(tmp_path, caplog):
+    """Test src\\photonomist\\run_metrics.RunMetrics> write, summary, log_summary
+    """
+    metrics = RunMetrics()
+    metrics.observe("rename", 0.002)
+    metrics.count("photos", 10)
+    metrics.count("avoided_stat", 10)
+    metrics.count("avoided_open", 4)
+    metrics.write(str(tmp_path / "reports" / "metrics.json"))
+    with open(tmp_path / "reports" / "metrics.json") as report_file:
+        report = json.load(report_file)
+    assert report["counters"] == {"avoided_open": 4, "avoided_stat": 10, "photos": 10}
+    assert report["latencies"]["rename"]["count"] == 1
+
+    logger = logging.getLogger("test_run_metrics")
+    with caplog.at_level(logging.INFO, logger="test_run_metrics"):
+        metrics.log_summary(logger)
+    assert "file system calls avoided: 14" in caplog.text
+    assert "latency rename: 1 photos" in caplog.text
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
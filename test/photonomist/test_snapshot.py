@@ -0,0 +1,76 @@
+"""Test suite for the TreeSnapshot Class.
+
+This test suite aims to test that an incremental traversal only lists the directories
+which changed since the last (complete) run.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import os
+
+import pytest
+from photonomist.snapshot import TreeSnapshot
+from photonomist.traversal import iter_photos
+
+@pytest.fixture
+def photos_path(tmp_path):
+    for folder in ("card_a/DCIM/100", "card_a/DCIM/101", "card_b"):
+        os.makedirs(tmp_path / "photos" / folder)
+    for photo in ("card_a/DCIM/100/DSC_0001.NEF", "card_a/DCIM/101/DSC_0002.NEF", "card_b/IMG_0001.CR2"):
+        (tmp_path / "photos" / photo).write_bytes(b"photo")
+    return str(tmp_path / "photos")
+
+def incremental_run(snapshot_path, photos_path, save=True):
+    with TreeSnapshot(snapshot_path) as snapshot:
+        photos = [os.path.relpath(photo, photos_path) for photo in iter_photos(photos_path, snapshot)]
+        if save:
+            snapshot.save()
+    return photos, snapshot.listed, snapshot.skipped
+
+def test_unchanged_tree_is_not_listed(tmp_path, photos_path):
+    """Test src\\photonomist\\traversal> iter_photos with a TreeSnapshot
+    """
+    snapshot_path = str(tmp_path / "snapshot.sqlite")
+    photos, listed, skipped = incremental_run(snapshot_path, photos_path)
+    assert len(photos) == 3 and (listed, skipped) == (6, 0)
+    assert incremental_run(snapshot_path, photos_path) == ([], 0, 6)
+
+def test_only_changed_directories_are_listed(tmp_path, photos_path):
+    """Test src\\photonomist\\snapshot.TreeSnapshot> unchanged
+    """
+    snapshot_path = str(tmp_path / "snapshot.sqlite")
+    incremental_run(snapshot_path, photos_path)
+    (tmp_path / "photos" / "card_a" / "DCIM" / "101" / "DSC_0003.NEF").write_bytes(b"photo")
+    os.makedirs(tmp_path / "photos" / "card_b" / "new")
+    (tmp_path / "photos" / "card_b" / "new" / "IMG_0002.CR2").write_bytes(b"photo")
+    photos, listed, skipped = incremental_run(snapshot_path, photos_path)
+    # The photos of a changed directory are all found again, the ones of the unchanged directories are not
+    assert photos == [os.path.join("card_a", "DCIM", "101", "DSC_0002.NEF"), os.path.join("card_a", "DCIM", "101", "DSC_0003.NEF"),
+                      os.path.join("card_b", "IMG_0001.CR2"), os.path.join("card_b", "new", "IMG_0002.CR2")]
+    assert (listed, skipped) == (3, 4)
+    assert incremental_run(snapshot_path, photos_path) == ([], 0, 7)
+
+def test_unsaved_run_is_listed_again(tmp_path, photos_path):
+    """Test src\\photonomist\\snapshot.TreeSnapshot> save
+    """
+    snapshot_path = str(tmp_path / "snapshot.sqlite")
+    incremental_run(snapshot_path, photos_path, save=False)
+    assert len(incremental_run(snapshot_path, photos_path)[0]) == 3
+
+def test_removed_directories_are_dropped(tmp_path, photos_path):
+    """Test src\\photonomist\\snapshot.TreeSnapshot> save (removed directory)
+    """
+    snapshot_path = str(tmp_path / "snapshot.sqlite")
+    incremental_run(snapshot_path, photos_path)
+    os.remove(tmp_path / "photos" / "card_b" / "IMG_0001.CR2")
+    os.rmdir(tmp_path / "photos" / "card_b")
+    assert incremental_run(snapshot_path, photos_path) == ([], 1, 4)
+    assert incremental_run(snapshot_path, photos_path) == ([], 0, 5)
+
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
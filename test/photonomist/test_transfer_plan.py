@@ -0,0 +1,76 @@
+"""Test suite for the TransferPlan Class.
+
+This test suite aims to test the collision free naming of the planned moves
+and the JSON/CSV export of a plan.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import csv
+import os
+
+import pytest
+from photonomist.transfer_plan import TransferPlan
+
+@pytest.fixture
+def plan(tmp_path):
+    os.makedirs(tmp_path / "export" / "2019_12_14_place")
+    (tmp_path / "export" / "2019_12_14_place" / "DSC_0262.NEF").write_text("")
+    plan = TransferPlan(str(tmp_path / "export"))
+    plan.add_folder("2020_10_25_place")
+    plan.add_move(os.path.join("card_a", "DSC_0262.NEF"), "2019_12_14_place")
+    plan.add_move(os.path.join("card_b", "DSC_0262.NEF"), "2019_12_14_place")
+    plan.add_move(os.path.join("card_a", "IMG_5494.CR2"), "2020_10_25_place")
+    plan.add_unplaced(os.path.join("card_a", "screenshot.jpg"), "no_exif")
+    return plan
+
+def test_planned_names_avoid_existing_and_planned_files(plan):
+    """Test src\\photonomist\\transfer_plan.TransferPlan> add_move
+    """
+    assert [move.file_name for move in plan.moves] == ["DSC_0262(1).NEF", "DSC_0262(2).NEF", "IMG_5494.CR2"]
+    assert len(plan) == 4
+
+def test_photo_already_in_its_folder_is_not_moved(plan):
+    """Test src\\photonomist\\transfer_plan.TransferPlan> add_move
+    """
+    source = os.path.join(plan.export_path, "2019_12_14_place", "DSC_0262.NEF")
+    assert plan.add_move(source, "2019_12_14_place") is None
+
+def test_json_plan_round_trip(plan, tmp_path):
+    """Test src\\photonomist\\transfer_plan.TransferPlan> write, load
+    """
+    plan_path = str(tmp_path / "plan.json")
+    plan.write(plan_path)
+    loaded = TransferPlan.load(plan_path)
+    assert loaded.moves == plan.moves
+    assert loaded.folders == plan.folders
+    assert loaded.unplaced == plan.unplaced
+
+def test_csv_plan(plan, tmp_path):
+    """Test src\\photonomist\\transfer_plan.TransferPlan> write
+    """
+    plan_path = str(tmp_path / "plan.csv")
+    plan.write(plan_path)
+    with open(plan_path, newline="") as plan_file:
+        rows = list(csv.reader(plan_file))
+    assert [row[0] for row in rows[1:]] == ["mkdir", "move", "move", "move", "unplaced"]
+    # Every row has the columns of the header
+    assert {len(row) for row in rows} == {len(rows[0])}
+
+def test_drain_returns_only_the_new_part(plan):
+    """Test src\\photonomist\\transfer_plan.TransferPlan> drain
+    """
+    first = plan.drain(keep=False)
+    assert len(first) == 4 and len(plan) == 0
+    plan.add_move(os.path.join("card_c", "DSC_0262.NEF"), "2019_12_14_place")
+    second = plan.drain(keep=False)
+    # The names handed out by the first batch are still taken
+    assert [move.file_name for move in second.moves] == ["DSC_0262(3).NEF"]
+    assert plan.counts["moves"] == 4
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,90 @@
+"""Test suite for the TransferScheduler Class.
+
+This test suite aims to test that the transfers are run concurrently within the limits
+of the workers, the bytes in flight and the busy devices.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import collections
+import threading
+import time
+
+import pytest
+from photonomist.transfer_scheduler import TransferScheduler
+
+class Tracker:
+    """Records the peak number of concurrent transfers per device and the peak bytes in flight
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.devices = collections.Counter()
+        self.peaks = collections.Counter()
+        self.bytes = 0
+        self.peak_bytes = 0
+
+    def transfer(self, source_device, size):
+        with self.lock:
+            self.devices[source_device] += 1
+            self.peaks[source_device] = max(self.peaks[source_device], self.devices[source_device])
+            self.bytes += size
+            self.peak_bytes = max(self.peak_bytes, self.bytes)
+        time.sleep(0.01)
+        with self.lock:
+            self.devices[source_device] -= 1
+            self.bytes -= size
+        return source_device
+
+def test_device_limits_are_respected():
+    """Test src\\photonomist\\transfer_scheduler.TransferScheduler> submit
+    """
+    tracker = Tracker()
+    with TransferScheduler(max_transfers=6, device_transfers=2) as scheduler:
+        futures = [scheduler.submit(tracker.transfer, device, 10, size=10, source_device=device, destination_device=99)
+                   for device in (1, 2, 3) * 5]
+        assert [future.result() for future in futures] == [1, 2, 3] * 5
+    assert max(tracker.peaks.values()) <= 2
+    assert scheduler.transfers == 15
+
+def test_bytes_in_flight_are_capped():
+    """Test src\\photonomist\\transfer_scheduler.TransferScheduler> submit (bytes in flight)
+    """
+    tracker = Tracker()
+    with TransferScheduler(max_transfers=8, max_bytes_in_flight=300, device_transfers=8) as scheduler:
+        for device in range(8):
+            scheduler.submit(tracker.transfer, device, 100, size=100, source_device=device, destination_device=99)
+        # Bigger than the cap, it is copied alone
+        scheduler.submit(tracker.transfer, 8, 1000, size=1000, source_device=8, destination_device=99)
+    assert tracker.peak_bytes == 1000
+    assert scheduler.transferred_bytes == 1800
+
+def test_a_slow_device_does_not_hold_back_the_others():
+    """Test src\\photonomist\\transfer_scheduler.TransferScheduler> submit (round robin)
+    """
+    release = threading.Event()
+    done = []
+    with TransferScheduler(max_transfers=2, device_transfers=1) as scheduler:
+        for _ in range(3):
+            scheduler.submit(release.wait, 5, size=1, source_device="card reader", destination_device="raid")
+        fast = [scheduler.submit(done.append, i, size=1, source_device="nvme", destination_device="ssd") for i in range(3)]
+        for future in fast:
+            future.result(timeout=5)
+        release.set()
+    assert done == [0, 1, 2]
+
+def test_failed_transfer_is_reported_by_its_future():
+    """Test src\\photonomist\\transfer_scheduler.TransferScheduler> submit (exceptions)
+    """
+    with TransferScheduler(max_transfers=2) as scheduler:
+        future = scheduler.submit(open, "this/photo/does/not/exist.jpg")
+        with pytest.raises(FileNotFoundError):
+            future.result()
+    assert scheduler.samples[-1].queued == 0
+    assert scheduler.summary().startswith("1 transfers")
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,82 @@
+"""Test suite for the traversal module.
+
+This test suite aims to test that the photos of the input path are found in a deterministic order,
+with their stat data, and that they can be streamed through a bounded queue.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import os
+import pickle
+
+import pytest
+from photonomist.traversal import iter_photos, stream_photos, PhotoEntry, TraversalCache
+from photonomist.__main__ import traverse_photos_path
+
+@pytest.fixture
+def photos_path(tmp_path):
+    for folder in ("card_b", os.path.join("card_a", "DCIM"), "card_a"):
+        os.makedirs(tmp_path / folder, exist_ok=True)
+    for photo in ("card_b/IMG_5494.CR2", "card_a/DCIM/DSC_0262.NEF", "card_a/DCIM/DSC_0261.jpg",
+                  "card_a/notes.txt", "card_a/a.JPEG"):
+        (tmp_path / photo).write_bytes(b"photo")
+    return str(tmp_path)
+
+def test_iter_photos_order_and_extensions(photos_path):
+    """Test src\\photonomist\\traversal> iter_photos
+    """
+    photos = [os.path.relpath(photo, photos_path) for photo in iter_photos(photos_path)]
+    assert photos == [os.path.join("card_a", "a.JPEG"), os.path.join("card_a", "DCIM", "DSC_0261.jpg"),
+                      os.path.join("card_a", "DCIM", "DSC_0262.NEF"), os.path.join("card_b", "IMG_5494.CR2")]
+
+def test_photo_entries_carry_their_stat(photos_path):
+    """Test src\\photonomist\\traversal.PhotoEntry> size
+    """
+    photo = next(iter_photos(photos_path))
+    assert photo.size == os.stat(photo).st_size == 5
+    copy = pickle.loads(pickle.dumps(photo))
+    assert copy == photo and copy.size == photo.size
+
+def test_stream_photos_with_a_small_queue(photos_path):
+    """Test src\\photonomist\\traversal> stream_photos
+    """
+    assert list(stream_photos(photos_path, maxsize=1)) == list(iter_photos(photos_path))
+
+def test_stream_photos_stops_early(photos_path):
+    """Test src\\photonomist\\traversal> stream_photos (the consumer stops)
+    """
+    stream = stream_photos(photos_path, maxsize=1)
+    assert isinstance(next(stream), PhotoEntry)
+    stream.close()
+
+def test_traversal_cache_lists_only_the_changed_directories(photos_path):
+    """Test src\\photonomist\\traversal.TraversalCache> photos_roots
+    """
+    cache = TraversalCache()
+    photos_roots = cache.photos_roots(photos_path)
+    assert photos_roots == traverse_photos_path(photos_path)
+    assert list(photos_roots) == list(traverse_photos_path(photos_path))
+    assert (cache.listed, cache.skipped) == (4, 0)
+    # Nothing changed: one stat per directory and the same photos_roots
+    assert cache.photos_roots(photos_path) is photos_roots
+    assert (cache.listed, cache.skipped) == (4, 4)
+
+    card_b = os.path.join(photos_path, "card_b")
+    (open(os.path.join(card_b, "IMG_5495.CR2"), "wb")).close()
+    os.utime(card_b, ns=(0, os.stat(card_b).st_mtime_ns + 10**9))
+    assert cache.photos_roots(photos_path) == traverse_photos_path(photos_path)
+    assert os.path.join(card_b, "IMG_5495.CR2") in cache.photos_roots(photos_path)[card_b]
+    assert cache.listed == 5
+
+    # A removed directory is dropped
+    for photo in os.listdir(card_b):
+        os.remove(os.path.join(card_b, photo))
+    os.rmdir(card_b)
+    assert card_b not in cache.photos_roots(photos_path)
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
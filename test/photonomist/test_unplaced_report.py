@@ -0,0 +1,79 @@
+"""Test suite for the UnplacedReport Class.
+
+This test suite aims to test that the report of the photos that were not transferred
+is buffered, flushed at the end or on interruption, and machine-readable.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import os
+
+import pytest
+from photonomist.unplaced_report import UnplacedReport, read_report, NO_EXIF, CORRUPT
+from photonomist.photo import Photo
+
+@pytest.mark.parametrize("file_name", ["not_transferred.csv", "not_transferred.jsonl"])
+def test_report_is_written_once_at_the_end(tmp_path, file_name):
+    """Test src\\photonomist\\unplaced_report.UnplacedReport> add, close
+    """
+    report_path = str(tmp_path / file_name)
+    with UnplacedReport(report_path) as report:
+        report.add("screenshot.jpg", NO_EXIF)
+        report.add("broken.nef", CORRUPT, "Invalid TIFF header!")
+        assert not os.path.exists(report_path)
+    assert read_report(report_path) == [
+        {"source": "screenshot.jpg", "reason": NO_EXIF, "detail": ""},
+        {"source": "broken.nef", "reason": CORRUPT, "detail": "Invalid TIFF header!"},
+    ]
+
+def test_report_is_flushed_on_interruption(tmp_path):
+    """Test src\\photonomist\\unplaced_report.UnplacedReport> __exit__
+    """
+    report_path = str(tmp_path / "not_transferred.csv")
+    with pytest.raises(KeyboardInterrupt):
+        with UnplacedReport(report_path) as report:
+            report.add("screenshot.jpg")
+            raise KeyboardInterrupt
+    assert [entry["source"] for entry in read_report(report_path)] == ["screenshot.jpg"]
+
+def test_empty_report_creates_no_file(tmp_path):
+    """Test src\\photonomist\\unplaced_report.UnplacedReport> flush
+    """
+    report_path = str(tmp_path / "not_transferred.csv")
+    with UnplacedReport(report_path):
+        pass
+    assert not os.path.exists(report_path)
+
+def test_buffer_is_flushed_when_full(tmp_path):
+    """Test src\\photonomist\\unplaced_report.UnplacedReport> add
+    """
+    report_path = str(tmp_path / "not_transferred.csv")
+    with UnplacedReport(report_path, buffer_size=2) as report:
+        for i in range(3):
+            report.add(f"photo_{i}.jpg")
+        assert len(read_report(report_path)) == 2
+    assert len(read_report(report_path)) == 3
+
+@pytest.mark.parametrize("content, expected", [
+    (b"", CORRUPT),
+    (b"\xff\xd8\xff\xda\x00\x02", None),
+])
+def test_photo_read_error(tmp_path, content, expected):
+    """Test src\\photonomist\\photo.Photo> read_error
+    Parametrized to test a corrupt file and a valid JPEG without EXIF
+    """
+    photo_path = tmp_path / "photo.jpg"
+    photo_path.write_bytes(content)
+    assert Photo(str(photo_path)).read_error == expected
+
+def test_photo_read_error_of_missing_photo(tmp_path):
+    """Test src\\photonomist\\photo.Photo> read_error
+    """
+    assert Photo(str(tmp_path / "missing.jpg")).read_error == "unreadable"
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
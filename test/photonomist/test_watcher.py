@@ -0,0 +1,66 @@
+"""Test suite for the FolderWatcher Class.
+
+This test suite aims to test that the photos of a hot folder are handed out once,
+when they have stopped changing.
+
+The script can be executed on its own or incorporated into a larger test suite.
+However the tests are run, be aware of which version of the module is actually
+being tested. If the library is installed in site-packages, that version takes
+precedence over the version in this project directory. Use a virtualenv test
+environment or setuptools develop mode to test against the development version.
+"""
+import os
+import time
+
+import pytest
+from photonomist.watcher import FolderWatcher
+
+@pytest.fixture(params=(False, True), ids=("polling", "inotify"))
+def watcher(request, tmp_path):
+    with FolderWatcher(str(tmp_path), settle=5, interval=0.1, use_inotify=request.param) as watcher:
+        yield watcher
+
+def test_photo_is_handed_out_when_it_stops_changing(tmp_path, watcher):
+    """Test src\\photonomist\\watcher.FolderWatcher> poll
+    """
+    photo = tmp_path / "DSC_0001.NEF"
+    photo.write_bytes(b"half")
+    assert watcher.poll(now=0) == []
+    photo.write_bytes(b"half of a photo")
+    assert watcher.poll(now=4) == []
+    assert watcher.poll(now=8) == []
+    assert watcher.poll(now=9) == [str(photo)]
+    assert watcher.waiting == 0
+    # It is handed out once
+    assert watcher.poll(now=20) == []
+
+def test_photo_which_stays_is_handed_out_again_if_it_changes(tmp_path, watcher):
+    """Test src\\photonomist\\watcher.FolderWatcher> poll (changed and removed photos)
+    """
+    (tmp_path / "sub").mkdir()
+    photo = tmp_path / "sub" / "no_date.jpg"
+    photo.write_bytes(b"photo")
+    (tmp_path / "notes.txt").write_bytes(b"not a photo")
+    watcher.poll(now=0)
+    assert watcher.poll(now=5) == [str(photo)]
+    photo.write_bytes(b"edited photo")
+    watcher.poll(now=6)
+    assert watcher.poll(now=11) == [str(photo)]
+    os.remove(photo)
+    assert watcher.poll(now=12) == []
+    photo.write_bytes(b"edited photo")
+    watcher.poll(now=13)
+    assert watcher.poll(now=18) == [str(photo)]
+
+def test_wait_is_bounded_by_the_interval(watcher):
+    """Test src\\photonomist\\watcher.FolderWatcher> wait
+    """
+    started = time.monotonic()
+    watcher.poll()
+    watcher.wait()
+    assert time.monotonic() - started < 2
+
+
+# Make the script executable.
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))